@@ -0,0 +1,2 @@
+from .analytics_exporter import AnalyticsExporter, EXPORT_TABLES, possessionSegments
+from .table_writers import TableWriter, TABLE_FORMATS, checkFormats, openTableWriter
\ No newline at end of file
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from pass_and_interception_detector import (
+    INTERCEPTION,
+    PASS,
+    POSSESSION_END,
+    POSSESSION_START,
+    TURNOVER,
+    PossessionEvent,
+)
+from team_stats import teamControlArray
+from track_store import trackBoxes
+from .table_writers import Schema, TableWriter, checkFormats, openTableWriter
+
+#: Tables written by :class:`AnalyticsExporter` and their columns.
+EXPORT_TABLES: Dict[str, Schema] = {
+    "frames": (
+        ("frame", "int"),
+        ("time_s", "float"),
+        ("ball_x", "float"),
+        ("ball_y", "float"),
+        ("ball_holder", "int"),
+        ("control_team", "int"),
+        ("team1_passes", "int"),
+        ("team2_passes", "int"),
+        ("team1_interceptions", "int"),
+        ("team2_interceptions", "int"),
+    ),
+    "possessions": (
+        ("start_frame", "int"),
+        ("end_frame", "int"),
+        ("start_s", "float"),
+        ("duration_s", "float"),
+        ("player_id", "int"),
+        ("team", "int"),
+    ),
+    "events": (
+        ("kind", "str"),
+        ("frame", "int"),
+        ("time_s", "float"),
+        ("from_player", "int"),
+        ("to_player", "int"),
+        ("team", "int"),
+    ),
+    "player_motion": (
+        ("frame", "int"),
+        ("time_s", "float"),
+        ("player_id", "int"),
+        ("team", "int"),
+        ("distance_m", "float"),
+        ("total_distance_m", "float"),
+        ("speed_kmh", "float"),
+    ),
+    "tactical_positions": (
+        ("frame", "int"),
+        ("time_s", "float"),
+        ("player_id", "int"),
+        ("team", "int"),
+        ("x", "float"),
+        ("y", "float"),
+        ("x_m", "float"),
+        ("y_m", "float"),
+        ("has_ball", "int"),
+    ),
+}
+
+EXPORTED_EVENT_KINDS = (PASS, INTERCEPTION, TURNOVER)
+
+
+def possessionSegments(events: Sequence[PossessionEvent]) -> List[Tuple[int, int, int, int]]:
+    """``(start, end, player, team)`` of every possession, from start/end event pairs."""
+    segments = []
+    start = None
+    for ev in events:
+        if ev.kind == POSSESSION_START:
+            start = ev
+        elif ev.kind == POSSESSION_END and start is not None:
+            segments.append((start.frame, ev.frame, start.toPlayer, start.team))
+            start = None
+    return segments
+
+
+class AnalyticsExporter:
+    """Write the analytics of one video as tables under ``exportDir``.
+
+    Per-frame tables are produced and written ``chunkSize`` frames at a
+    time, each table to one file per format (``<table>.csv``,
+    ``.jsonl`` or ``.parquet``). Team ids are 1 or 2 and ``-1`` marks an
+    unknown team or player; tactical ``x``/``y`` are court-image pixels.
+    """
+
+    def __init__(self, exportDir: str, formats: Sequence[str] = ("csv",)) -> None:
+        checkFormats(formats)
+        self.exportDir = exportDir
+        self.formats = list(dict.fromkeys(formats))
+        self.rows: Dict[str, int] = {}
+
+    def export(self, data: Mapping[str, Any], fps: float, chunkSize: int = 0) -> Dict[str, int]:
+        """Write every table of ``data`` (as filled in by ``main.runAnalytics``); returns rows per table."""
+        nFrames = len(data["ballAquisition"])
+        chunkSize = chunkSize if chunkSize > 0 else max(nFrames, 1)
+        writers = {
+            name: [openTableWriter(os.path.join(self.exportDir, name), fmt, schema) for fmt in self.formats]
+            for name, schema in EXPORT_TABLES.items()
+        }
+        try:
+            events = data["events"]
+            segments = possessionSegments(events)
+            self._write(writers["possessions"], self._possessions(segments, fps))
+            self._write(
+                writers["events"], self._events([ev for ev in events if ev.kind in EXPORTED_EVENT_KINDS], fps)
+            )
+            totals: Dict[int, float] = {}
+            for start in range(0, nFrames, chunkSize):
+                stop = min(start + chunkSize, nFrames)
+                self._write(writers["frames"], self._frames(data, start, stop, fps))
+                self._write(writers["player_motion"], self._playerMotion(data, start, stop, fps, totals))
+                self._write(writers["tactical_positions"], self._tacticalPositions(data, start, stop, fps))
+        finally:
+            for tableWriters in writers.values():
+                for writer in tableWriters:
+                    writer.close()
+        self.rows = {name: tableWriters[0].rows for name, tableWriters in writers.items()}
+        return self.rows
+
+    def summary(self) -> str:
+        total = sum(self.rows.values())
+        return "exported %d tables (%d rows, %s) to %s" % (
+            len(self.rows),
+            total,
+            "/".join(self.formats),
+            self.exportDir,
+        )
+
+    @staticmethod
+    def _write(writers: List[TableWriter], columns: Dict[str, Any]) -> None:
+        for writer in writers:
+            writer.writeColumns(columns)
+
+    # ────────────────────────────────────────────────────────────────
+    # Tables
+    # ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _possessions(segments: List[Tuple[int, int, int, int]], fps: float) -> Dict[str, Any]:
+        start, end, player, team = np.array(segments, dtype=np.int64).reshape(-1, 4).T
+        return {
+            "start_frame": start,
+            "end_frame": end,
+            "start_s": start / fps,
+            "duration_s": (end - start + 1) / fps,
+            "player_id": player,
+            "team": team,
+        }
+
+    @staticmethod
+    def _events(events: List[PossessionEvent], fps: float) -> Dict[str, Any]:
+        frames = np.array([ev.frame for ev in events], dtype=np.int64)
+        return {
+            "kind": [ev.kind for ev in events],
+            "frame": frames,
+            "time_s": frames / fps,
+            "from_player": [ev.fromPlayer for ev in events],
+            "to_player": [ev.toPlayer for ev in events],
+            "team": [ev.team for ev in events],
+        }
+
+    @staticmethod
+    def _frames(data: Mapping[str, Any], start: int, stop: int, fps: float) -> Dict[str, Any]:
+        frames = np.arange(start, stop)
+        ballX: List[Any] = []
+        ballY: List[Any] = []
+        for idx in range(start, stop):
+            box = next((bbox for _, bbox in trackBoxes(data["ballTracks"][idx])), None)
+            ballX.append(None if box is None else (box[0] + box[2]) / 2)
+            ballY.append(None if box is None else (box[1] + box[3]) / 2)
+        stats = data["teamStats"]
+        holders = data["ballAquisition"][start:stop]
+        return {
+            "frame": frames,
+            "time_s": frames / fps,
+            "ball_x": ballX,
+            "ball_y": ballY,
+            "ball_holder": holders,
+            "control_team": teamControlArray(data["playerAssignment"][start:stop], holders),
+            "team1_passes": stats.passCounts[start:stop, 0],
+            "team2_passes": stats.passCounts[start:stop, 1],
+            "team1_interceptions": stats.interceptionCounts[start:stop, 0],
+            "team2_interceptions": stats.interceptionCounts[start:stop, 1],
+        }
+
+    @staticmethod
+    def _playerMotion(
+        data: Mapping[str, Any],
+        start: int,
+        stop: int,
+        fps: float,
+        totals: Dict[int, float],
+    ) -> Dict[str, Any]:
+        """One row per player step; ``totals`` carries the running distances across chunks."""
+        cols: Dict[str, List[Any]] = {name: [] for name, _ in EXPORT_TABLES["player_motion"]}
+        for idx in range(start, stop):
+            speeds = data["speeds"][idx]
+            teams = data["playerAssignment"][idx]
+            for pid, dist in data["distances"][idx].items():
+                totals[pid] = totals.get(pid, 0.0) + dist
+                cols["frame"].append(idx)
+                cols["player_id"].append(pid)
+                cols["team"].append(teams.get(pid, -1))
+                cols["distance_m"].append(dist)
+                cols["total_distance_m"].append(totals[pid])
+                cols["speed_kmh"].append(speeds.get(pid, 0.0))
+        cols["time_s"] = (np.asarray(cols["frame"], dtype=np.int64) / fps).tolist()
+        return cols
+
+    @staticmethod
+    def _tacticalPositions(data: Mapping[str, Any], start: int, stop: int, fps: float) -> Dict[str, Any]:
+        tactical = data["tacticalPos"][start:stop]
+        if hasattr(tactical, "frameOffsets"):
+            rows = tactical.frame.astype(np.int64) - tactical.startFrame
+            pids = tactical.playerId.astype(np.int64)
+            xy = tactical.positions.astype(np.float64)
+        else:  # per-frame ``{player_id: [x, y]}`` dicts
+            pairs = [(row, pid, pos) for row, frame in enumerate(tactical) for pid, pos in frame.items()]
+            rows = np.array([r for r, _, _ in pairs], dtype=np.int64)
+            pids = np.array([p for _, p, _ in pairs], dtype=np.int64)
+            xy = np.array([pos for _, _, pos in pairs], dtype=np.float64).reshape(-1, 2)
+        frames = rows + start
+        holders = np.asarray(data["ballAquisition"][start:stop], dtype=np.int64)
+        assignment = data["playerAssignment"]
+        _, courtWidth, courtHeight, _ = data["court"]
+        widthM, heightM = data["courtMeters"]
+        return {
+            "frame": frames,
+            "time_s": frames / fps,
+            "player_id": pids,
+            "team": [assignment[f].get(p, -1) for f, p in zip(frames.tolist(), pids.tolist())],
+            "x": xy[:, 0],
+            "y": xy[:, 1],
+            "x_m": xy[:, 0] * widthM / courtWidth,
+            "y_m": xy[:, 1] * heightM / courtHeight,
+            "has_ball": (holders[rows] == pids).astype(np.int64),
+        }
+
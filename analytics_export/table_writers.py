@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import abc
+import csv
+import json
+import os
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+#: ``(column name, "int" | "float" | "str")`` pairs, in file order.
+Schema = Sequence[Tuple[str, str]]
+
+TABLE_FORMATS = ("csv", "jsonl", "parquet")
+
+
+class TableWriter(abc.ABC):
+    """Append-only table file written one block of rows at a time.
+
+    :meth:`writeColumns` takes a ``{column: values}`` block whose columns
+    may be NumPy arrays or lists (``None`` is a missing value), so a caller
+    never holds more than one block of a table in memory.
+    """
+
+    extension = ""
+
+    def __init__(self, path: str, schema: Schema) -> None:
+        self.path = path
+        self.schema = list(schema)
+        self.names = [name for name, _ in self.schema]
+        self.rows = 0
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+    def writeColumns(self, columns: Mapping[str, Any]) -> None:
+        values = [_pyList(columns[name]) for name in self.names]
+        n = len(values[0]) if values else 0
+        if n:
+            self._write(values)
+            self.rows += n
+
+    @abc.abstractmethod
+    def _write(self, values: List[List[Any]]) -> None:
+        """Append one block of rows, given column by column."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _pyList(values: Any) -> List[Any]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class CsvTableWriter(TableWriter):
+    extension = ".csv"
+
+    def __init__(self, path: str, schema: Schema) -> None:
+        super().__init__(path, schema)
+        self._file = open(path, "w", newline="")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(self.names)
+
+    def _write(self, values: List[List[Any]]) -> None:
+        self._csv.writerows(zip(*values))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlTableWriter(TableWriter):
+    extension = ".jsonl"
+
+    def __init__(self, path: str, schema: Schema) -> None:
+        super().__init__(path, schema)
+        self._file = open(path, "w")
+
+    def _write(self, values: List[List[Any]]) -> None:
+        self._file.writelines(json.dumps(dict(zip(self.names, row))) + "\n" for row in zip(*values))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _requirePyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+class ParquetTableWriter(TableWriter):
+    """One Parquet row group per block; pyarrow is only imported when used."""
+
+    extension = ".parquet"
+
+    def __init__(self, path: str, schema: Schema) -> None:
+        super().__init__(path, schema)
+        pa = _requirePyarrow()
+        types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+        self._schema = pa.schema([(name, types[kind]) for name, kind in self.schema])
+        self._writer = pa.parquet.ParquetWriter(path, self._schema)
+        self._pa = pa
+
+    def _write(self, values: List[List[Any]]) -> None:
+        arrays = [self._pa.array(col, type=field.type) for col, field in zip(values, self._schema)]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+TABLE_WRITERS: Dict[str, type] = {
+    "csv": CsvTableWriter,
+    "jsonl": JsonlTableWriter,
+    "parquet": ParquetTableWriter,
+}
+
+
+def checkFormats(formats: Sequence[str]) -> None:
+    """Fail before any work is done if a format is unknown or its dependency is missing."""
+    for fmt in formats:
+        if fmt not in TABLE_WRITERS:
+            raise ValueError(f"unknown table format {fmt!r} (expected one of {', '.join(TABLE_FORMATS)})")
+        if fmt == "parquet":
+            _requirePyarrow()
+
+
+def openTableWriter(basePath: str, fmt: str, schema: Schema) -> TableWriter:
+    """A writer for ``basePath`` plus the format's extension."""
+    cls = TABLE_WRITERS[fmt]
+    return cls(basePath + cls.extension, schema)
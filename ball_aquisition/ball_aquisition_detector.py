@@ -3,8 +3,11 @@ from __future__ import annotations
 import sys
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
+
 sys.path.append("../")  # keep relative import workable when run as a script
 from utils.bbox_utils import get_center_of_bbox, measure_distance  # noqa: E402
+from track_store import TrackStore  # noqa: E402
 
 # ────────────────────────────────────────────────────────────────
 # Type aliases
@@ -29,6 +32,11 @@ class BallAquisitionDetector:
     A player must satisfy either a high containment ratio or be the closest
     within a configurable distance threshold for **``minFrames``** consecutive
     frames to be awarded possession.
+
+    :meth:`detectBallPossession` evaluates the whole video as flat
+    ``(rows, 4)`` arrays of player boxes, ``blockRows`` rows at a time;
+    the per-player helpers below are the reference implementation used by
+    :meth:`detectBallPossessionSequential`.
     """
 
     # ------------------------------------------------------------------
@@ -37,10 +45,13 @@ class BallAquisitionDetector:
     def __init__(self,
                  possessionThreshold: int = 50,
                  minFrames: int = 11,
-                 containmentThreshold: float = 0.8) -> None:
+                 containmentThreshold: float = 0.8,
+                 blockRows: int = 1 << 18) -> None:
         self.possessionThreshold: int = possessionThreshold
         self.minFrames: int = minFrames
         self.containmentThreshold: float = containmentThreshold
+        self.blockRows: int = blockRows
+        self.resetOnline()
 
     # ------------------------------------------------------------------
     # Geometry helpers (private)
@@ -128,17 +139,182 @@ class BallAquisitionDetector:
                 return pid
         return -1
 
+    # ------------------------------------------------------------------
+    # Vectorised engine
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _flatten(playerTracks: TracksOverTime | np.ndarray,
+                 frameIdx: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(frame, player_id, bbox)`` rows of the given frames, frame-major.
+
+        ``playerTracks`` is per-frame dicts, a :class:`TrackStore` or
+        frame-sorted columnar track rows (see ``track_store``); players
+        without a bbox are skipped.
+        """
+        if isinstance(playerTracks, TrackStore):
+            rows = playerTracks.rowsOfFrames(frameIdx)
+            frames = playerTracks.frame[rows].astype(np.int64) - playerTracks.startFrame
+            return frames, playerTracks.trackId[rows].astype(np.int64), playerTracks.boxes[rows].astype(np.float64)
+        if isinstance(playerTracks, np.ndarray):
+            rows = playerTracks[np.isin(playerTracks["frame"], frameIdx)]
+            boxes = np.stack([rows["x1"], rows["y1"], rows["x2"], rows["y2"]], axis=1).astype(np.float64)
+            return rows["frame"].astype(np.int64), rows["track_id"].astype(np.int64), boxes
+        counts: List[int] = []
+        pids: List[int] = []
+        boxes: List[Any] = []
+        for f in frameIdx.tolist():
+            frame = playerTracks[f]
+            counts.append(len(frame))
+            pids.extend(frame)
+            boxes.extend([info.get("bbox") for info in frame.values()])
+        frames = np.repeat(frameIdx.astype(np.int64), counts)
+        pidArr = np.array(pids, dtype=np.int64)
+        if not all(boxes):
+            hasBox = np.array([bool(b) for b in boxes], dtype=bool)
+            frames, pidArr = frames[hasBox], pidArr[hasBox]
+            boxes = [b for b in boxes if b]
+        return frames, pidArr, np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+    @staticmethod
+    def _ballArrays(ballTracks: TracksOverTime) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Ball boxes, integer centres and the mask of frames with a ball."""
+        nFrames = len(ballTracks)
+        ballBoxes = np.zeros((nFrames, 4), dtype=np.float64)
+        hasBall = np.zeros(nFrames, dtype=bool)
+        for f, frame in enumerate(ballTracks):
+            info = frame.get(1)
+            if info and "bbox" in info:
+                ballBoxes[f] = info["bbox"]
+                hasBall[f] = True
+        # ``int()`` truncation of the midpoints, as in ``get_center_of_bbox``
+        centres = np.trunc(np.stack([(ballBoxes[:, 0] + ballBoxes[:, 2]) / 2,
+                                     (ballBoxes[:, 1] + ballBoxes[:, 3]) / 2], axis=1))
+        return ballBoxes, centres, hasBall
+
+    def _rowScores(self, boxes: np.ndarray, ballBoxes: np.ndarray,
+                   centres: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Containment ratio and key-point distance per row (``inf`` if pruned)."""
+        x1, y1, x2, y2 = boxes.T
+        bx1, by1, bx2, by2 = ballBoxes.T
+        cx, cy = centres.T
+        iw = np.minimum(x2, bx2) - np.maximum(x1, bx1)
+        ih = np.minimum(y2, by2) - np.maximum(y1, by1)
+        ballArea = (bx2 - bx1) * (by2 - by1)
+        overlap = (iw > 0) & (ih > 0) & (ballArea != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(overlap, iw * ih / ballArea, 0.0)
+        contained = ratio > self.containmentThreshold
+
+        # Distance from the ball centre to the box is a lower bound on the
+        # key-point distance, so far-away rows cannot win on proximity.
+        gx = np.maximum(np.maximum(x1 - cx, cx - x2), 0.0)
+        gy = np.maximum(np.maximum(y1 - cy, cy - y2), 0.0)
+        # (One pixel of slack keeps the bound safe against rounding.)
+        keep = np.flatnonzero(contained | (gx * gx + gy * gy < (self.possessionThreshold + 1) ** 2))
+
+        dist = np.full(len(boxes), np.inf)
+        if keep.size:
+            kx1, ky1, kx2, ky2 = x1[keep], y1[keep], x2[keep], y2[keep]
+            kcx, kcy = cx[keep], cy[keep]
+            w, h = kx2 - kx1, ky2 - ky1
+            mx, my, ty = kx1 + w // 2, ky1 + h // 2, ky1 + h // 3
+            px = np.stack([kx1, kx2, kcx, kcx, mx, kx2, kx1, kx2, kx1, mx, kx2, kx1, mx, mx], axis=1)
+            py = np.stack([kcy, kcy, ky1, ky2, ky1, ky1, ky1, my, my, my, ky2, ky2, ky2, ty], axis=1)
+            d = np.sqrt((kcx[:, None] - px) ** 2 + (kcy[:, None] - py) ** 2)
+            inY = (ky1 < kcy) & (kcy < ky2)
+            inX = (kx1 < kcx) & (kcx < kx2)
+            d[:, 0:2] = np.where(inY[:, None], d[:, 0:2], np.inf)
+            d[:, 2:4] = np.where(inX[:, None], d[:, 2:4], np.inf)
+            dist[keep] = d.min(axis=1)
+        return ratio, dist
+
+    @staticmethod
+    def _nearestPerFrame(frames: np.ndarray, pids: np.ndarray, dist: np.ndarray,
+                         nFrames: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Player id and distance of each frame's nearest row (first row on ties)."""
+        bestPid = np.full(nFrames, -1, dtype=np.int64)
+        bestDist = np.full(nFrames, np.inf)
+        if len(frames) == 0:
+            return bestPid, bestDist
+        order = np.lexsort((np.arange(len(frames)), dist, frames))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = frames[order][1:] != frames[order][:-1]
+        rows = order[first]
+        bestPid[frames[rows]] = pids[rows]
+        bestDist[frames[rows]] = dist[rows]
+        return bestPid, bestDist
+
+    def bestCandidates(self, playerTracks: TracksOverTime | np.ndarray,
+                       ballTracks: TracksOverTime) -> np.ndarray:
+        """Per-frame :meth:`_bestCandidate` for the whole video (``-1`` when none)."""
+        nFrames = len(ballTracks)
+        ballBoxes, centres, hasBall = self._ballArrays(ballTracks)
+        frames, pids, boxes = self._flatten(playerTracks, np.flatnonzero(hasBall))
+
+        ratio = np.empty(len(frames))
+        dist = np.empty(len(frames))
+        for start in range(0, len(frames), self.blockRows):
+            blk = slice(start, start + self.blockRows)
+            f = frames[blk]
+            ratio[blk], dist[blk] = self._rowScores(boxes[blk], ballBoxes[f], centres[f])
+
+        # Contained candidates win outright (nearest first); otherwise the
+        # nearest remaining player within the possession threshold.
+        c = ratio > self.containmentThreshold
+        containedPid, _ = self._nearestPerFrame(frames[c], pids[c], dist[c], nFrames)
+        nearPid, nearDist = self._nearestPerFrame(frames[~c], pids[~c], dist[~c], nFrames)
+        nearPid[~(nearDist < self.possessionThreshold)] = -1
+        return np.where(containedPid != -1, containedPid, nearPid)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def detectBallPossession(self,
-                             playerTracks: TracksOverTime,
+                             playerTracks: TracksOverTime | np.ndarray,
                              ballTracks: TracksOverTime) -> List[int]:
         """Return list *(possessionList)[frame] = playerId | ‑1*.
 
         The logic enforces that a player must satisfy the possession rules for
         *``minFrames``* consecutive frames before being recorded.
+        ``playerTracks`` may also be columnar track rows.
+        """
+        best = self.bestCandidates(playerTracks, ballTracks)
+        nFrames = len(best)
+        if nFrames == 0:
+            return []
+        # Length of the current run of the same candidate, reset by -1.
+        newRun = np.ones(nFrames, dtype=bool)
+        newRun[1:] = best[1:] != best[:-1]
+        runStart = np.maximum.accumulate(np.where(newRun, np.arange(nFrames), 0))
+        runLength = np.arange(nFrames) - runStart + 1
+        possession = np.where((best != -1) & (runLength >= self.minFrames), best, -1)
+        return possession.tolist()
+
+    def resetOnline(self) -> None:
+        """Forget the candidate run carried between :meth:`feedFrame` calls."""
+        self._runPid: int = -1
+        self._runLength: int = 0
+
+    def feedFrame(self,
+                  playerTracksFrame: FrameTracks,
+                  ballTracksFrame: FrameTracks) -> int:
+        """Online :meth:`detectBallPossession` for the next processed frame.
+
+        Returns the holder of this frame or ``-1``; the ``minFrames`` run
+        counts frames fed, so skipped frames do not break a run.
         """
+        best = int(self.bestCandidates([playerTracksFrame], [ballTracksFrame])[0])
+        if best == -1:
+            self._runPid, self._runLength = -1, 0
+            return -1
+        self._runLength = self._runLength + 1 if best == self._runPid else 1
+        self._runPid = best
+        return best if self._runLength >= self.minFrames else -1
+
+    def detectBallPossessionSequential(self,
+                                       playerTracks: TracksOverTime,
+                                       ballTracks: TracksOverTime) -> List[int]:
+        """Frame-by-frame reference implementation of :meth:`detectBallPossession`."""
         nFrames = len(ballTracks)
         possessionList: List[int] = [-1] * nFrames
         consecutive: Dict[int, int] = {}
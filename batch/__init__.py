@@ -0,0 +1 @@
+from .batch_runner import BatchJob, BatchResult, BatchRunner, collectJobs, completedInputs, formatSummary, VIDEO_EXTENSIONS
\ No newline at end of file
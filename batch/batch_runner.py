@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../"))
+from utils import CONTAINER_CODECS  # type: ignore  # noqa: E402
+
+VIDEO_EXTENSIONS = tuple(CONTAINER_CODECS)
+
+
+class BatchJob(NamedTuple):
+    inputVideo: str
+    outputVideo: str
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one video; ``outputVideo`` is its tables folder with ``--no-render``."""
+
+    inputVideo: str
+    outputVideo: str
+    ok: bool
+    frames: int = 0
+    seconds: float = 0.0
+    fps: float = 0.0
+    cacheHits: int = 0
+    cacheMisses: int = 0
+    worker: int = 0
+    attempts: int = 1
+    error: Optional[str] = None
+
+
+def collectJobs(source: str, outputDir: str, outputExt: str = ".avi") -> List[BatchJob]:
+    """Jobs for every video in a directory, or listed in a manifest.
+
+    A manifest is a text file with one video path per line (``#`` starts a
+    comment) or a JSON list of paths or ``{"input": ..., "output": ...}``
+    objects. Relative paths are resolved against the manifest's folder;
+    outputs default to ``outputDir/<video stem><outputExt>``.
+    """
+
+    def defaultOutput(path: str) -> str:
+        return os.path.join(outputDir, Path(path).stem + outputExt)
+
+    if os.path.isdir(source):
+        videos = sorted(str(p) for p in Path(source).iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+        return [BatchJob(v, defaultOutput(v)) for v in videos]
+    base = os.path.dirname(os.path.abspath(source))
+
+    def resolve(path: str) -> str:
+        return path if os.path.isabs(path) else os.path.join(base, path)
+
+    with open(source) as f:
+        text = f.read()
+    if source.lower().endswith(".json"):
+        jobs = []
+        for entry in json.loads(text):
+            if isinstance(entry, str):
+                entry = {"input": entry}
+            video = resolve(entry["input"])
+            jobs.append(BatchJob(video, entry.get("output") or defaultOutput(video)))
+        return jobs
+    lines = (line.split("#", 1)[0].strip() for line in text.splitlines())
+    return [BatchJob(resolve(line), defaultOutput(resolve(line))) for line in lines if line]
+
+
+def completedInputs(summaryPath: str) -> Set[str]:
+    """Inputs a previous run of the same summary finished successfully (and whose output still exists)."""
+    done: Set[str] = set()
+    if not os.path.exists(summaryPath):
+        return done
+    with open(summaryPath) as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if rec.get("ok") and os.path.exists(rec.get("outputVideo", "")):
+                done.add(rec["inputVideo"])
+    return done
+
+
+# ────────────────────────────────────────────────────────────────
+# Worker side
+# ────────────────────────────────────────────────────────────────
+_WORKER: Dict[str, Any] = {}
+
+
+def _initWorker(options: argparse.Namespace) -> None:
+    """Build the detection models once per worker process; they are reused for every video it runs."""
+    from main import buildModels  # type: ignore
+
+    _WORKER["options"] = options
+    _WORKER["models"] = buildModels(options)
+
+
+def _runJob(job: BatchJob, attempt: int = 1) -> BatchResult:
+    from main import processVideo  # type: ignore
+
+    if not _WORKER:
+        raise RuntimeError("batch worker used before _initWorker")
+    a = argparse.Namespace(**vars(_WORKER["options"]))
+    a.input_video, a.output_video = job
+    start = time.perf_counter()
+    try:
+        stats = processVideo(a, _WORKER["models"], verbose=False)
+    except Exception:
+        return BatchResult(
+            *job,
+            ok=False,
+            seconds=time.perf_counter() - start,
+            worker=os.getpid(),
+            attempts=attempt,
+            error=traceback.format_exc(),
+        )
+    return BatchResult(
+        job.inputVideo,
+        stats["exportDir"] if a.no_render else job.outputVideo,  # what a resumed run checks for
+        ok=True,
+        frames=stats["frames"],
+        seconds=stats["seconds"],
+        fps=stats["fps"],
+        cacheHits=stats["cacheHits"],
+        cacheMisses=stats["cacheMisses"],
+        worker=os.getpid(),
+        attempts=attempt,
+    )
+
+
+# ────────────────────────────────────────────────────────────────
+# Scheduling
+# ────────────────────────────────────────────────────────────────
+class BatchRunner:
+    """Process many videos on a pool of worker processes.
+
+    Each worker builds the detection models once (:func:`_initWorker`) and
+    keeps them loaded for every video it is given. A video that raises is
+    recorded as failed without affecting the others. At most ``workers``
+    videos are in flight, so if a worker process dies outright the videos
+    still queued go on in a fresh pool, and the ones that were running are
+    retried one at a time; only a video that dies while running alone is
+    charged an attempt, up to ``maxAttempts`` each. Every finished video
+    is appended to the JSON Lines ``summaryPath`` straight away, so after
+    a crash the next run skips finished videos and the stage cache serves
+    whatever the interrupted ones had already computed.
+    """
+
+    def __init__(
+        self,
+        options: argparse.Namespace,
+        *,
+        workers: int = 2,
+        summaryPath: Optional[str] = None,
+        maxAttempts: int = 2,
+    ) -> None:
+        self.options = options
+        self.workers = workers
+        self.summaryPath = summaryPath
+        self.maxAttempts = maxAttempts
+
+    def _record(self, result: BatchResult) -> None:
+        if self.summaryPath is None:
+            return
+        dir_name = os.path.dirname(self.summaryPath)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        with open(self.summaryPath, "a") as f:
+            f.write(json.dumps(result._asdict()) + "\n")
+
+    def run(self, jobs: Iterable[BatchJob], *, force: bool = False) -> List[BatchResult]:
+        jobs = list(jobs)
+        if not force and self.summaryPath:
+            done = completedInputs(self.summaryPath)
+            skipped = [j for j in jobs if j.inputVideo in done]
+            jobs = [j for j in jobs if j.inputVideo not in done]
+            if skipped:
+                print(f"skipping {len(skipped)} video(s) already finished in {self.summaryPath}")
+        if self.workers <= 1:
+            return self._runInProcess(jobs)
+        return self._runPool(jobs)
+
+    def _runInProcess(self, jobs: List[BatchJob]) -> List[BatchResult]:
+        _initWorker(self.options)
+        results = []
+        for job in jobs:
+            results.append(_runJob(job))
+            self._record(results[-1])
+        return results
+
+    def _runPool(self, jobs: List[BatchJob]) -> List[BatchResult]:
+        results: List[BatchResult] = []
+        attempts = {job: 0 for job in jobs}
+        fresh = list(jobs)
+        isolated: List[BatchJob] = []  # were running when their worker died; retried one at a time
+        context = multiprocessing.get_context("spawn")  # no forked model or thread state
+        while fresh or isolated:
+            queue, workers = (fresh, min(self.workers, len(fresh))) if fresh else (isolated, 1)
+            lost = self._drain(queue, workers, attempts, results, context)
+            for job in lost:
+                if len(lost) > 1:
+                    # Died alongside other videos, so not necessarily its
+                    # fault: retry it alone without charging the attempt.
+                    attempts[job] -= 1
+                    isolated.append(job)
+                elif attempts[job] < self.maxAttempts:
+                    isolated.append(job)
+                else:
+                    result = BatchResult(*job, ok=False, attempts=attempts[job], error="worker process died")
+                    results.append(result)
+                    self._record(result)
+        return results
+
+    def _drain(
+        self,
+        queue: List[BatchJob],
+        workers: int,
+        attempts: Dict[BatchJob, int],
+        results: List[BatchResult],
+        context: Any,
+    ) -> List[BatchJob]:
+        """Run ``queue`` on one pool until it is empty or the pool dies.
+
+        At most ``workers`` jobs are submitted at a time, so every submitted
+        job is running. Returns the jobs that were running when the pool
+        died; jobs never submitted stay in ``queue`` uncharged.
+        """
+        lost: List[BatchJob] = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_initWorker,
+            initargs=(self.options,),
+        ) as pool:
+            running: Dict[Future, BatchJob] = {}
+            broken = False
+            while running or (queue and not broken):
+                while queue and not broken and len(running) < workers:
+                    try:
+                        future = pool.submit(_runJob, queue[0], attempts[queue[0]] + 1)
+                    except BrokenProcessPool:
+                        broken = True
+                        break
+                    job = queue.pop(0)
+                    attempts[job] += 1
+                    running[future] = job
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        lost.append(job)
+                        continue
+                    results.append(result)
+                    self._record(result)
+        return lost
+
+
+def formatSummary(results: List[BatchResult], wallSeconds: float) -> str:
+    lines = ["batch: %d video(s) in %.1fs" % (len(results), wallSeconds)]
+    for r in results:
+        name = os.path.basename(r.inputVideo)
+        if r.ok:
+            lines.append(
+                "  %-32s ok     %7d frames %8.1fs %7.1f fps  cache %d/%d"
+                % (name, r.frames, r.seconds, r.fps, r.cacheHits, r.cacheHits + r.cacheMisses)
+            )
+        else:
+            reason = (r.error or "").strip().splitlines()[-1:] or ["unknown error"]
+            lines.append("  %-32s FAILED after %d attempt(s): %s" % (name, r.attempts, reason[0]))
+    frames = sum(r.frames for r in results if r.ok)
+    failed = sum(not r.ok for r in results)
+    fps = frames / wallSeconds if wallSeconds > 0 else 0.0
+    lines.append("  total: %d frames, %.1f fps overall, %d failed" % (frames, fps, failed))
+    return "\n".join(lines)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from batch import BatchRunner, collectJobs, formatSummary
+from main import addPipelineArgs, checkExportArgs
+from configs import BATCH_OUTPUT_DIR, BATCH_WORKERS
+
+
+def parseArgs() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Analyse many videos with a pool of worker processes.")
+    p.add_argument("source", type=str, help="folder of videos, or a manifest (.txt with one path per line, or .json)")
+    p.add_argument("--output_dir", type=str, default=BATCH_OUTPUT_DIR)
+    p.add_argument("--output_ext", type=str, default=".avi", help="container of the output videos")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_WORKERS,
+        help="worker processes; each loads the models once and runs videos one after another",
+    )
+    p.add_argument(
+        "--summary",
+        type=str,
+        default=None,
+        help="JSON Lines summary, one record per finished video (default: OUTPUT_DIR/batch_summary.jsonl)",
+    )
+    p.add_argument("--force", action="store_true", help="re-run videos the summary already lists as finished")
+    p.add_argument("--max_attempts", type=int, default=2, help="tries per video when a worker process dies")
+    addPipelineArgs(p)
+    a = p.parse_args()
+    checkExportArgs(p, a)
+    return a
+
+
+def main() -> None:
+    a = parseArgs()
+    jobs = collectJobs(a.source, a.output_dir, a.output_ext)
+    if not jobs:
+        raise SystemExit(f"No videos found in {a.source!r}.")
+    summaryPath = a.summary or os.path.join(a.output_dir, "batch_summary.jsonl")
+    runner = BatchRunner(a, workers=a.workers, summaryPath=summaryPath, maxAttempts=a.max_attempts)
+    start = time.perf_counter()
+    results = runner.run(jobs, force=a.force)
+    print(formatSummary(results, time.perf_counter() - start))
+    if any(not r.ok for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
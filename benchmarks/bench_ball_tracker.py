@@ -0,0 +1,66 @@
+"""Post-detection cost of BallTracker outlier removal and interpolation.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_ball_tracker --frames 50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from trackers import BallTracker
+
+
+def makeBallTracks(
+    nFrames: int,
+    *,
+    missRate: float = 0.3,
+    outlierRate: float = 0.05,
+    seed: int = 0,
+) -> List[Dict[int, Dict[str, Any]]]:
+    """A random-walk ball with missed frames and far-off false detections."""
+    rng = np.random.default_rng(seed)
+    path = np.cumsum(rng.normal(0, 8, size=(nFrames, 2)), axis=0) + 500
+    jumps = rng.uniform(-400, 400, size=(nFrames, 2)) * (rng.random(nFrames) < outlierRate)[:, None]
+    boxes = np.concatenate([path + jumps, path + jumps + 12], axis=1).tolist()
+    missed = (rng.random(nFrames) < missRate).tolist()
+    return [{} if miss else {1: {"bbox": box}} for box, miss in zip(boxes, missed)]
+
+
+def timeIt(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=50_000)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    tracks = makeBallTracks(a.frames)
+    tracker = BallTracker("unused.pt")
+    results = {
+        "frames": a.frames,
+        "removeWrongDetections": timeIt(tracker.removeWrongDetections, tracks),
+        "interpolateBallPositions": timeIt(tracker.interpolateBallPositions, tracks),
+        "cleanBallPositions": timeIt(tracker.cleanBallPositions, tracks),
+    }
+    for name, seconds in results.items():
+        if name != "frames":
+            print(f"{name:>26}: {seconds * 1000:.1f} ms")
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
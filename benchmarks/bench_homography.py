@@ -0,0 +1,154 @@
+"""Compute saved, jitter removed and accuracy of the temporal homography tracker.
+
+Two scenes with known camera geometry:
+
+* ``panning``: a slowly panning camera watches standing players; court
+  keypoints are detected with pixel noise. Every true tactical position is
+  constant, so any frame-to-frame movement of a projected player is fake
+  speed.
+* ``game``: the benchmark fixture game (moving players, dropped and
+  far-off outlier keypoints), validated like ``main.py`` does.
+
+In both, every projected player is compared with its ground-truth court
+position. The run exits with status 1 when tracking is clearly less
+accurate than the per-frame estimate (95th-percentile error or frames
+whose median error exceeds ``--bad_frame_px``).
+
+Run from the repository root::
+
+    python -m benchmarks.bench_homography --frames 3000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.fixtures import courtToImage, makeGame
+from tactical_view_converter import TacticalViewConverter, TacticalPositions, projectPoints
+
+Scene = Tuple[np.ndarray, List[Dict[int, Dict[str, Any]]], np.ndarray]
+
+
+def makePanningScene(
+    nFrames: int,
+    *,
+    nPlayers: int = 10,
+    noisePx: float = 0.7,
+    panPxPerFrame: float = 0.2,
+    dropRate: float = 0.1,
+    seed: int = 0,
+) -> Scene:
+    """Noisy ``(frames, 18, 2)`` keypoints, tracks of players standing still and the court-to-image matrices."""
+    rng = np.random.default_rng(seed)
+    tvc = TacticalViewConverter("unused.png")
+    court = np.array(tvc.keyPoints, dtype=np.float64)
+    players = rng.uniform([20, 20], [tvc.width - 20, tvc.height - 20], size=(nPlayers, 2))
+    scale = np.diag([4.0, 4.0, 1.0])
+    keypoints = np.zeros((nFrames, len(court), 2), dtype=np.float32)
+    cameras = np.zeros((nFrames, 3, 3), dtype=np.float64)
+    tracks: List[Dict[int, Dict[str, Any]]] = []
+    for idx in range(nFrames):
+        shift = np.array([[1, 0, 40 + panPxPerFrame * idx], [0, 1, 30], [0, 0, 1]])
+        cameras[idx] = shift @ scale
+        kp = projectPoints(cameras[idx], court.astype(np.float32)).astype(np.float64)
+        kp += rng.normal(0, noisePx, size=kp.shape)
+        kp[rng.random(len(court)) < dropRate] = 0
+        keypoints[idx] = kp
+        feet = projectPoints(cameras[idx], players.astype(np.float32))
+        tracks.append(
+            {pid: {"bbox": [float(x - 20), float(y - 100), float(x + 20), float(y)]} for pid, (x, y) in enumerate(feet)}
+        )
+    return keypoints, tracks, cameras
+
+
+def makeGameScene(nFrames: int, seed: int = 0) -> Scene:
+    """The fixture game with its keypoints validated, plus the court-to-image matrices."""
+    game = makeGame(nFrames, seed=seed)
+    keypoints = TacticalViewConverter("unused.png").validateKeypoints(game["courtKeypoints"]).xy
+    cameras = np.stack([courtToImage(idx) for idx in range(nFrames)])
+    return keypoints, game["playerTracks"], cameras
+
+
+def groundTruthErrors(tvc: TacticalViewConverter, pos: TacticalPositions, tracks, cameras: np.ndarray) -> np.ndarray:
+    """Court-pixel distance of every projected player from its true position."""
+    frames, pids, feet = tvc._footRows(tracks, len(cameras))
+    stride = int(pids.max()) + 1 if len(pids) else 1
+    rows = np.searchsorted(
+        frames.astype(np.int64) * stride + pids,
+        pos.frame.astype(np.int64) * stride + pos.playerId,
+    )
+    truth = projectPoints(np.linalg.inv(cameras)[pos.frame], feet[rows][:, None])[:, 0]
+    return np.linalg.norm(pos.positions - truth, axis=1)
+
+
+def benchConfig(name: str, scene: Scene, badFramePx: float, **options: Any) -> Dict[str, Any]:
+    keypoints, tracks, cameras = scene
+    tvc = TacticalViewConverter("unused.png", **options)
+    start = time.perf_counter()
+    pos = tvc.transformPlayersArray(keypoints, tracks)
+    elapsed = time.perf_counter() - start
+    order = np.lexsort((pos.frame, pos.playerId))
+    frames, pids, xy = pos.frame[order], pos.playerId[order], pos.positions[order]
+    both = (pids[1:] == pids[:-1]) & (frames[1:] == frames[:-1] + 1)
+    steps = np.linalg.norm(xy[1:] - xy[:-1], axis=-1)[both]
+    errors = groundTruthErrors(tvc, pos, tracks, cameras)
+    frameMedian = np.array(
+        [np.median(errors[pos.frameRows(idx)]) if len(errors[pos.frameRows(idx)]) else 0.0 for idx in range(len(pos))]
+    )
+    bad = frameMedian > badFramePx
+    longest = run = 0
+    for isBad in bad.tolist():
+        run = run + 1 if isBad else 0
+        longest = max(longest, run)
+    return {
+        "config": name,
+        "seconds": elapsed,
+        **tvc.homographyStats,
+        "meanFakeStepPx": float(steps.mean()) if steps.size else 0.0,
+        "p95FakeStepPx": float(np.percentile(steps, 95)) if steps.size else 0.0,
+        "p50ErrorPx": float(np.median(errors)) if errors.size else 0.0,
+        "p95ErrorPx": float(np.percentile(errors, 95)) if errors.size else 0.0,
+        "badFrames": int(bad.sum()),
+        "longestBadRun": longest,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=3000)
+    p.add_argument("--bad_frame_px", type=float, default=20.0, help="a frame is bad above this median error")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed p95-error / bad-frame excess over per-frame")
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    results = []
+    failed = False
+    for sceneName, scene in (("panning", makePanningScene(a.frames)), ("game", makeGameScene(a.frames))):
+        exact = benchConfig("per-frame", scene, a.bad_frame_px, homographyDriftPx=-1, homographySmoothing=1.0)
+        tracked = benchConfig("tracked", scene, a.bad_frame_px)
+        for r in (exact, tracked):
+            r["scene"] = sceneName
+            results.append(r)
+            print(
+                f"{sceneName:>7} {r['config']:>9}: {r['seconds']:.3f}s  recomputed={r['recomputed']} "
+                f"reused={r['reused']}  fake step mean={r['meanFakeStepPx']:.3f}px p95={r['p95FakeStepPx']:.3f}px  "
+                f"error p50={r['p50ErrorPx']:.2f}px p95={r['p95ErrorPx']:.2f}px  "
+                f"bad frames={r['badFrames']} (longest run {r['longestBadRun']})"
+            )
+        slack = 1.0 + a.tolerance
+        if tracked["p95ErrorPx"] > exact["p95ErrorPx"] * slack + 0.5 or tracked["badFrames"] > exact["badFrames"] * slack:
+            print(f"{sceneName}: tracking is less accurate than the per-frame estimate")
+            failed = True
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Vectorised vs. frame-by-frame ball possession detection.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_possession --frames 20000 --players 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ball_aquisition import BallAquisitionDetector
+from track_store import tracksToColumns
+
+Tracks = List[Dict[int, Dict[str, Any]]]
+
+
+def makePossessionGame(nFrames: int, nPlayers: int, *, seed: int = 0) -> Tuple[Tracks, Tracks]:
+    """Random-walk players and a ball that keeps jumping to a nearby player."""
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(0, 1200, size=(nPlayers, 2))
+    ball = pos[0].copy()
+    players: Tracks = []
+    balls: Tracks = []
+    for _ in range(nFrames):
+        pos += rng.normal(0, 5, size=pos.shape)
+        size = rng.uniform([30, 80], [60, 160], size=(nPlayers, 2))
+        boxes = np.concatenate([pos, pos + size], axis=1).tolist()
+        players.append({pid + 1: {"bbox": box} for pid, box in enumerate(boxes)})
+        if rng.random() < 0.05:
+            ball = pos[rng.integers(nPlayers)] + rng.uniform(-20, 70, size=2)
+        ball += rng.normal(0, 6, size=2)
+        if rng.random() < 0.1:
+            balls.append({})
+        else:
+            balls.append({1: {"bbox": [*ball.tolist(), *(ball + 18).tolist()]}})
+    return players, balls
+
+
+def timeIt(fn, *args, repeat: int = 3) -> Tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=20_000)
+    p.add_argument("--players", type=int, default=10)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    players, balls = makePossessionGame(a.frames, a.players)
+    detector = BallAquisitionDetector()
+    seqTime, seq = timeIt(detector.detectBallPossessionSequential, players, balls)
+    vecTime, vec = timeIt(detector.detectBallPossession, players, balls)
+    colTime, col = timeIt(detector.detectBallPossession, tracksToColumns(players), balls)
+    results = {
+        "frames": a.frames,
+        "players": a.players,
+        "sequentialSeconds": seqTime,
+        "vectorizedSeconds": vecTime,
+        "columnarSeconds": colTime,
+        "speedup": seqTime / vecTime if vecTime else float("inf"),
+        "identical": seq == vec == col,
+    }
+    print(
+        f"sequential {seqTime * 1000:.1f} ms  vectorized {vecTime * 1000:.1f} ms  "
+        f"columnar input {colTime * 1000:.1f} ms  "
+        f"speedup {results['speedup']:.1f}x  identical={results['identical']}"
+    )
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
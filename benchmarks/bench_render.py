@@ -0,0 +1,99 @@
+"""Overlay rendering throughput, in-process vs. a pool of render workers.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_render --frames 600 --workers 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ball_aquisition import BallAquisitionDetector
+from benchmarks.bench_possession import makePossessionGame
+from drawers import (
+    BallTracksDrawer,
+    FrameCompositor,
+    FrameNumberDrawer,
+    FrameWindow,
+    OverlayLayer,
+    ParallelRenderer,
+    PlayerTracksDrawer,
+    TeamBallControlDrawer,
+)
+from team_stats import CumulativeTeamStats, teamControlArray
+
+
+def benchCompositor(data: Dict[str, Any]) -> FrameCompositor:
+    return FrameCompositor(
+        [
+            OverlayLayer(PlayerTracksDrawer(), data["players"], data["assignment"], data["possession"]),
+            OverlayLayer(BallTracksDrawer(), data["balls"]),
+            OverlayLayer(FrameNumberDrawer()),
+            OverlayLayer(TeamBallControlDrawer(), data["stats"]),
+        ]
+    )
+
+
+def benchAnnotations(data: Dict[str, Any], start: int, stop: int) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        name: FrameWindow(data[name][start:stop], start) for name in ("players", "balls", "assignment", "possession")
+    }
+    out["stats"] = data["stats"].window(start, stop)
+    return out
+
+
+def makeAnnotations(nFrames: int) -> Dict[str, Any]:
+    players, balls = makePossessionGame(nFrames, 10)
+    assignment = [{pid: 1 + pid % 2 for pid in frame} for frame in players]
+    possession = BallAquisitionDetector().detectBallPossession(players, balls)
+    stats = CumulativeTeamStats(control=teamControlArray(assignment, possession))
+    return {"players": players, "balls": balls, "assignment": assignment, "possession": possession, "stats": stats}
+
+
+def makeFrameChunks(nFrames: int, chunkSize: int, height: int, width: int) -> List[List[np.ndarray]]:
+    base = np.random.default_rng(0).integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    return [[base.copy() for _ in range(min(chunkSize, nFrames - s))] for s in range(0, nFrames, chunkSize)]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--chunk_size", type=int, default=64)
+    p.add_argument("--height", type=int, default=720)
+    p.add_argument("--width", type=int, default=1280)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    data = makeAnnotations(a.frames)
+    results: List[Dict[str, Any]] = []
+    reference = None
+    for workers in a.workers:
+        chunks = makeFrameChunks(a.frames, a.chunk_size, a.height, a.width)
+        renderer = ParallelRenderer(benchCompositor, functools.partial(benchAnnotations, data), workers=workers)
+        start = time.perf_counter()
+        frames = [f for chunk in renderer.render(chunks) for f in chunk]
+        elapsed = time.perf_counter() - start
+        digest = [hash(f.tobytes()) for f in frames]
+        reference = digest if reference is None else reference
+        results.append(
+            {"workers": workers, "seconds": elapsed, "fps": len(frames) / elapsed, "identical": digest == reference}
+        )
+    base = results[0]["seconds"]
+    for r in results:
+        print(
+            f"workers={r['workers']:>2}: {r['seconds']:.2f}s  {r['fps']:.0f} fps  "
+            f"speedup {base / r['seconds']:.2f}x  identical={r['identical']}"
+        )
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Batch vs. online (live) speed and distance on the fixture game.
+
+The batch speeds must equal the original per-frame loop (kept here as
+:func:`referenceSpeeds`), and the online path must produce the same
+per-frame distances and speeds as the batch one; the run exits with
+status 1 if either differs.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_speed --frames 1500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.fixtures import makeGame
+from benchmarks.suite import speedCalculator
+from tactical_view_converter import TacticalViewConverter
+
+
+def referenceSpeeds(
+    distances: List[Dict[int, float]], fps: float, window: int, minFrames: int
+) -> List[Dict[int, float]]:
+    """The pre-vectorization ``calculate_speed``: km/h over the counted steps of the last ``window`` frames."""
+    speeds: List[Dict[int, float]] = []
+    for idx in range(len(distances)):
+        speeds.append({})
+        for pid in distances[idx]:
+            total = 0.0
+            present = 0
+            lastIdx = None
+            for i in range(max(0, idx - window + 1), idx + 1):
+                if pid in distances[i]:
+                    if lastIdx is not None:
+                        total += distances[i][pid]
+                        present += 1
+                    lastIdx = i
+            if present >= minFrames:
+                speeds[idx][pid] = (total / 1000.0) / (present / fps / 3600.0)
+            else:
+                speeds[idx][pid] = 0.0
+    return speeds
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=1500)
+    p.add_argument("--players", type=int, default=10)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    game = makeGame(a.frames, nPlayers=a.players)
+    tvc = TacticalViewConverter("unused.png")
+    positions = tvc.transformPlayersArray(tvc.validateKeypoints(game["courtKeypoints"]), game["playerTracks"])
+
+    sdc = speedCalculator(tvc)
+    start = time.perf_counter()
+    distances = sdc.calculate_distance(positions)
+    speeds = sdc.calculate_speed(distances)
+    batchSeconds = time.perf_counter() - start
+
+    online = speedCalculator(tvc)
+    start = time.perf_counter()
+    steps = [online.update_frame(idx, positions[idx]) for idx in range(len(positions))]
+    onlineSeconds = time.perf_counter() - start
+
+    reference = referenceSpeeds(distances, sdc.fps, sdc.speed_window, sdc.min_speed_frames)
+    baselineMismatched = sum(s != r for s, r in zip(speeds, reference))
+    mismatched = sum(
+        d != od or s != os_ for d, s, (od, os_) in zip(distances, speeds, steps)
+    )
+    results = {
+        "frames": a.frames,
+        "batchSeconds": batchSeconds,
+        "onlineSeconds": onlineSeconds,
+        "mismatchedFrames": mismatched,
+        "baselineMismatchedFrames": baselineMismatched,
+    }
+    print(
+        f"batch {batchSeconds * 1000:.1f} ms  online {onlineSeconds * 1000:.1f} ms  "
+        f"identical={mismatched == 0} ({mismatched} mismatched frames)  "
+        f"batch matches baseline={baselineMismatched == 0} ({baselineMismatched} mismatched frames)"
+    )
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if mismatched or baselineMismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""CLI startup cost: importing ``main`` and building the detection stages.
+
+Each sample runs in a fresh interpreter. Building the trackers, the court
+keypoint detector and the team assigner (what a fully cached run does)
+must not import any of the heavy model dependencies.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_startup --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+HEAVY_MODULES = ("ultralytics", "supervision", "torch", "transformers")
+
+IMPORT_MAIN = "import main"
+BUILD_STAGES = """
+import json, sys, tempfile
+import main
+from utils import StageCache
+cache = StageCache(tempfile.mkdtemp())
+player = main.PlayerTracker(main.PLAYER_DETECTOR_PATH)
+key = player.cacheKey(cache, "README.md")
+main.BallTracker(main.BALL_DETECTOR_PATH).cacheKey(cache, "README.md")
+main.CourtKeypointDetector(main.COURT_KEYPOINT_DETECTOR_PATH).cacheKey(cache, "README.md")
+main.TeamAssigner(backend="clip").cacheKey(cache, "README.md", key)
+print(json.dumps(sorted(m for m in %r if m in sys.modules)))
+""" % (HEAVY_MODULES,)
+
+SCRIPTS = {"importMain": IMPORT_MAIN, "buildStages": BUILD_STAGES}
+
+
+def runScript(script: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+
+def timeScript(script: str, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        runScript(script)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def heavyImports() -> List[str]:
+    """Heavy modules imported by building every detection stage."""
+    return json.loads(runScript(BUILD_STAGES).stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    baseline = timeScript("pass", a.repeat)
+    results: Dict[str, Any] = {"interpreterSeconds": baseline}
+    for name, script in SCRIPTS.items():
+        results[name + "Seconds"] = timeScript(script, a.repeat)
+    results["heavyImports"] = heavyImports()
+    print(f"      interpreter: {baseline * 1000:7.1f} ms")
+    for name in SCRIPTS:
+        seconds = results[name + "Seconds"]
+        print(f"{name:>17}: {seconds * 1000:7.1f} ms  (+{(seconds - baseline) * 1000:.1f} ms)")
+    print("heavy imports when building the stages:", ", ".join(results["heavyImports"]) or "none")
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if results["heavyImports"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Accuracy vs. throughput of the TeamAssigner backends on synthetic jerseys.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_team_assigner --frames 300 --players 10
+
+Backends whose dependencies are missing (e.g. CLIP without torch) are
+reported as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from team_assigner import TEAM_BACKENDS, TeamAssigner
+
+TEAM_COLORS_BGR = {1: (235, 235, 235), 2: (110, 35, 20)}
+SKIN_BGR = (90, 140, 200)
+FLOOR_BGR = (80, 150, 200)
+
+
+def makeJerseyVideo(
+    nFrames: int,
+    nPlayers: int,
+    *,
+    size: Tuple[int, int] = (720, 1280),
+    seed: int = 0,
+) -> Tuple[List[np.ndarray], List[Dict[int, Dict[str, Any]]], Dict[int, int]]:
+    """Frames of drifting player sprites, their tracks and the true team of each id."""
+    rng = np.random.default_rng(seed)
+    h, w = size
+    truth = {pid: 1 + pid % 2 for pid in range(1, nPlayers + 1)}
+    pos = rng.uniform([60, 60], [w - 120, h - 220], size=(nPlayers, 2))
+    light = rng.uniform(0.65, 1.15, size=nPlayers)
+    frames: List[np.ndarray] = []
+    tracks: List[Dict[int, Dict[str, Any]]] = []
+    for _ in range(nFrames):
+        frame = np.empty((h, w, 3), dtype=np.uint8)
+        frame[:] = FLOOR_BGR
+        frameTracks: Dict[int, Dict[str, Any]] = {}
+        pos += rng.normal(0, 3, size=pos.shape)
+        np.clip(pos, [0, 0], [w - 60, h - 160], out=pos)
+        for i, (pid, team) in enumerate(truth.items()):
+            x1, y1 = int(pos[i, 0]), int(pos[i, 1])
+            x2, y2 = x1 + 50, y1 + 150
+            jersey = np.clip(np.array(TEAM_COLORS_BGR[team]) * light[i], 0, 255)
+            frame[y1 : y1 + 25, x1 + 15 : x2 - 15] = SKIN_BGR
+            frame[y1 + 25 : y1 + 95, x1 : x2] = jersey
+            frame[y1 + 95 : y2, x1 + 8 : x2 - 8] = SKIN_BGR
+            noise = rng.integers(-20, 21, size=(y2 - y1, x2 - x1, 3))
+            frame[y1:y2, x1:x2] = np.clip(frame[y1:y2, x1:x2].astype(np.int16) + noise, 0, 255).astype(np.uint8)
+            frameTracks[pid] = {"bbox": [float(x1), float(y1), float(x2), float(y2)]}
+        frames.append(frame)
+        tracks.append(frameTracks)
+    return frames, tracks, truth
+
+
+def benchBackend(
+    backend: str,
+    frames: List[np.ndarray],
+    tracks: List[Dict[int, Dict[str, Any]]],
+    truth: Dict[int, int],
+) -> Dict[str, Any]:
+    try:
+        assigner = TeamAssigner(backend=backend)
+        start = time.perf_counter()
+        assignment = assigner.assignTeams(frames, tracks)
+        elapsed = time.perf_counter() - start
+    except ImportError as exc:
+        return {"backend": backend, "skipped": str(exc)}
+    total = sum(len(t) for t in tracks)
+    correct = sum(1 for frameAssign in assignment for pid, team in frameAssign.items() if truth[pid] == team)
+    return {
+        "backend": backend,
+        "seconds": elapsed,
+        "framesPerSecond": len(frames) / elapsed if elapsed else float("inf"),
+        "accuracy": correct / total if total else 0.0,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--players", type=int, default=10)
+    p.add_argument("--backends", nargs="+", default=list(TEAM_BACKENDS), choices=TEAM_BACKENDS)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    frames, tracks, truth = makeJerseyVideo(a.frames, a.players)
+    results = [benchBackend(b, frames, tracks, truth) for b in a.backends]
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['backend']:>6}: skipped ({r['skipped']})")
+        else:
+            print(
+                f"{r['backend']:>6}: {r['seconds']:.3f}s  {r['framesPerSecond']:.1f} frames/s  "
+                f"accuracy {r['accuracy'] * 100:.1f}%"
+            )
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Per-frame track dicts vs. the columnar TrackStore: memory and hot paths.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_track_store --frames 20000 --players 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from ball_aquisition import BallAquisitionDetector
+from benchmarks.fixtures import makeBlankFrames, makeGame
+from drawers import PlayerTracksDrawer
+from tactical_view_converter import TacticalViewConverter
+from track_store import TrackStore, columnsToTracks, tracksToColumns
+
+
+def allocatedBytes(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        obj = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size
+
+
+def timeIt(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=20_000)
+    p.add_argument("--players", type=int, default=10)
+    p.add_argument("--draw_frames", type=int, default=200)
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    game = makeGame(a.frames, nPlayers=a.players)
+    columns = tracksToColumns(game["playerTracks"])
+    layouts = {
+        "dicts": lambda: columnsToTracks(columns, a.frames),
+        "store": lambda: TrackStore.fromColumns(columns, a.frames),
+    }
+    tvc = TacticalViewConverter("unused.png")
+    frames = makeBlankFrames(a.draw_frames)
+    drawer = PlayerTracksDrawer()
+    results: Dict[str, Dict[str, float]] = {}
+    for name, build in layouts.items():
+        tracks = build()
+
+        def draw() -> None:
+            for idx, frame in enumerate(frames):
+                drawer.drawFrame(frame, idx, tracks, game["playerAssignment"], [-1] * a.frames)
+
+        results[name] = {
+            "megabytes": allocatedBytes(build) / (1 << 20),
+            "buildSeconds": timeIt(build),
+            "possessionSeconds": timeIt(
+                lambda: BallAquisitionDetector().detectBallPossession(tracks, game["ballTracks"])
+            ),
+            "transformSeconds": timeIt(lambda: tvc.transformPlayersArray(game["courtKeypoints"], tracks)),
+            "drawSeconds": timeIt(draw),
+        }
+    for name, r in results.items():
+        print(
+            f"{name:>6}: {r['megabytes']:7.1f} MB  build {r['buildSeconds'] * 1000:7.1f} ms  "
+            f"possession {r['possessionSeconds'] * 1000:7.1f} ms  transform {r['transformSeconds'] * 1000:7.1f} ms  "
+            f"draw {r['drawSeconds'] * 1000:7.1f} ms"
+        )
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
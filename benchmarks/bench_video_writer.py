@@ -0,0 +1,78 @@
+"""Render-then-encode wall time with an inline vs. a background video writer.
+
+Frames are drawn with a few overlay layers and encoded either on the
+rendering thread (the old ``save_video`` behaviour) or through
+:class:`AsyncVideoWriter`, whose encoding overlaps the drawing.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_video_writer --frames 300 --output /tmp/bench.avi
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import cv2
+
+from benchmarks.bench_render import benchCompositor, makeAnnotations, makeFrameChunks
+from utils import AsyncVideoWriter, codec_for
+
+
+def runInline(chunks, data, output: str, fps: float) -> Dict[str, Any]:
+    compositor = benchCompositor(data)
+    h, w = chunks[0][0].shape[:2]
+    start = time.perf_counter()
+    out = cv2.VideoWriter(output, cv2.VideoWriter_fourcc(*codec_for(output)), fps, (w, h))
+    idx = 0
+    for chunk in chunks:
+        compositor.render(chunk, startIdx=idx)
+        idx += len(chunk)
+        for frame in chunk:
+            out.write(frame)
+    out.release()
+    return {"writer": "inline", "seconds": time.perf_counter() - start}
+
+
+def runAsync(chunks, data, output: str, fps: float) -> Dict[str, Any]:
+    compositor = benchCompositor(data)
+    start = time.perf_counter()
+    with AsyncVideoWriter(output, fps) as writer:
+        idx = 0
+        for chunk in chunks:
+            compositor.render(chunk, startIdx=idx)
+            idx += len(chunk)
+            writer.writeAll(chunk)
+    stats = writer.stats
+    return {
+        "writer": "async",
+        "seconds": time.perf_counter() - start,
+        "encodeFps": stats.encodeFps,
+        "blockedSeconds": stats.blockedSeconds,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--fps", type=float, default=25.0)
+    p.add_argument("--output", type=str, default="output_videos/bench_writer.avi")
+    p.add_argument("--json", type=str, default=None, help="also write results to this file")
+    a = p.parse_args()
+    data = makeAnnotations(a.frames)
+    results: List[Dict[str, Any]] = []
+    for run in (runInline, runAsync):
+        chunks = makeFrameChunks(a.frames, 64, 720, 1280)
+        results.append(run(chunks, data, a.output, a.fps))
+    for r in results:
+        extra = f"  encode {r['encodeFps']:.0f} fps, blocked {r['blockedSeconds']:.2f}s" if "encodeFps" in r else ""
+        print(f"{r['writer']:>6}: {r['seconds']:.2f}s  {a.frames / r['seconds']:.0f} fps{extra}")
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
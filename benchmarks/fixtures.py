@@ -0,0 +1,114 @@
+"""Synthetic game fixtures shared by the benchmarks.
+
+Everything is generated from a seed, so two runs at the same scale time
+exactly the same inputs.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from tactical_view_converter import TacticalViewConverter, projectPoints
+
+Tracks = List[Dict[int, Dict[str, Any]]]
+Assignment = List[Dict[int, int]]
+
+
+def courtToImage(idx: int, *, panPxPerFrame: float = 0.3) -> np.ndarray:
+    """A camera 4x zoomed on the tactical court, panning slowly to the right."""
+    shift = np.array([[1, 0, 40 - panPxPerFrame * idx], [0, 1, 30], [0, 0, 1]], dtype=np.float64)
+    return shift @ np.diag([4.0, 4.0, 1.0])
+
+
+def makeGame(
+    nFrames: int,
+    *,
+    nPlayers: int = 10,
+    noisePx: float = 0.7,
+    keypointDropRate: float = 0.1,
+    keypointOutlierRate: float = 0.01,
+    detectionMissRate: float = 0.03,
+    idSwitchRate: float = 0.002,
+    ballDropoutRate: float = 0.02,
+    passRate: float = 0.03,
+    interceptionShare: float = 0.2,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Player and ball tracks, team assignment and court keypoints of one synthetic game.
+
+    Players random-walk on the court and are seen through a panning camera.
+    Like ByteTrack output, detections are occasionally missed and a lost
+    player comes back under a fresh track id. The ball sits at a holder's
+    feet, moves on with passes (some to the other team) and drops out for
+    bursts of frames. Keypoints carry pixel noise, missing points and the
+    odd far-off outlier. Returns ``playerTracks``, ``ballTracks``,
+    ``playerAssignment`` and ``courtKeypoints`` (a ``(frames, 18, 2)``
+    array).
+    """
+    rng = np.random.default_rng(seed)
+    tvc = TacticalViewConverter("unused.png")
+    court = np.array(tvc.keyPoints, dtype=np.float32)
+    lo, hi = np.array([10.0, 10.0]), np.array([tvc.width - 10.0, tvc.height - 10.0])
+    pos = rng.uniform(lo, hi, size=(nPlayers, 2))
+    teams = np.arange(nPlayers) % 2 + 1
+    trackIds = np.arange(1, nPlayers + 1)
+    nextId = nPlayers + 1
+    holder = 0
+    dropout = 0
+
+    playerTracks: Tracks = []
+    ballTracks: Tracks = []
+    assignment: Assignment = []
+    keypoints = np.zeros((nFrames, len(court), 2), dtype=np.float32)
+    for idx in range(nFrames):
+        m = courtToImage(idx)
+        pos = np.clip(pos + rng.normal(0, 0.4, size=pos.shape), lo, hi)
+
+        kp = projectPoints(m, court).astype(np.float64)
+        kp += rng.normal(0, noisePx, size=kp.shape)
+        kp[rng.random(len(court)) < keypointOutlierRate] += rng.uniform(60, 120, size=2)
+        kp[rng.random(len(court)) < keypointDropRate] = 0
+        keypoints[idx] = kp
+
+        switched = rng.random(nPlayers) < idSwitchRate
+        trackIds[switched] = np.arange(nextId, nextId + int(switched.sum()))
+        nextId += int(switched.sum())
+        seen = rng.random(nPlayers) >= detectionMissRate
+        feet = projectPoints(m, pos.astype(np.float32))
+        size = rng.uniform([70, 190], [110, 250], size=(nPlayers, 2))
+        tracks: Dict[int, Dict[str, Any]] = {}
+        teamFrame: Dict[int, int] = {}
+        for i in np.flatnonzero(seen):
+            (x, y), (w, h) = feet[i], size[i]
+            pid = int(trackIds[i])
+            tracks[pid] = {"bbox": [float(x - w / 2), float(y - h), float(x + w / 2), float(y)]}
+            teamFrame[pid] = int(teams[i])
+        playerTracks.append(tracks)
+        assignment.append(teamFrame)
+
+        if rng.random() < passRate:
+            sameTeam = np.flatnonzero((teams == teams[holder]) & (np.arange(nPlayers) != holder))
+            otherTeam = np.flatnonzero(teams != teams[holder])
+            pool = otherTeam if rng.random() < interceptionShare else sameTeam
+            holder = int(rng.choice(pool))
+        if dropout == 0 and rng.random() < ballDropoutRate:
+            dropout = int(rng.integers(1, 15))
+        if dropout:
+            dropout -= 1
+            ballTracks.append({})
+        else:
+            bx, by = feet[holder] + rng.normal([0, -40], 4, size=2)
+            ballTracks.append({1: {"bbox": [float(bx - 9), float(by - 9), float(bx + 9), float(by + 9)]}})
+    return {
+        "playerTracks": playerTracks,
+        "ballTracks": ballTracks,
+        "playerAssignment": assignment,
+        "courtKeypoints": keypoints,
+    }
+
+
+def makeBlankFrames(nFrames: int, size: Tuple[int, int] = (1280, 720)) -> List[np.ndarray]:
+    """``nFrames`` black BGR frames of ``size`` ``(w, h)``."""
+    w, h = size
+    return [np.zeros((h, w, 3), dtype=np.uint8) for _ in range(nFrames)]
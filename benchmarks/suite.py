@@ -0,0 +1,330 @@
+"""Benchmark suite: every analytics stage and drawer on a synthetic game.
+
+Inputs come from :func:`benchmarks.fixtures.makeGame`, so runs at the same
+scale are comparable across commits and machines' own baselines. Save a
+baseline, then compare later runs against it; the comparison exits with
+status 1 when a case got slower than the tolerance allows.
+
+Run from the repository root::
+
+    python -m benchmarks.suite --frames 5000 --save benchmarks/baselines/local.json
+    python -m benchmarks.suite --frames 5000 --compare benchmarks/baselines/local.json
+
+Startup cases time ``import main`` and building every detection stage in
+a fresh interpreter.
+
+The ``bench_*`` scripts next to this one are focused before/after
+comparisons of single optimisations (possession, homography, ball
+cleaning, team assignment, rendering workers, the async writer).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analytics_export import AnalyticsExporter
+from ball_aquisition import BallAquisitionDetector
+from benchmarks.bench_startup import SCRIPTS, runScript
+from benchmarks.fixtures import makeBlankFrames, makeGame
+from drawers import (
+    BallTracksDrawer,
+    CourtKeypointDrawer,
+    FrameNumberDrawer,
+    OverlayLayer,
+    PassInterceptionDrawer,
+    PlayerTracksDrawer,
+    RunningDistances,
+    SpeedAndDistanceDrawer,
+    TacticalViewDrawer,
+    TeamBallControlDrawer,
+)
+from pass_and_interception_detector import INTERCEPTION, PASS, PassAndInterceptionDetector
+from speed_and_distance_calculator import SpeedAndDistanceCalculator
+from tactical_view_converter import TacticalViewConverter
+from team_stats import CumulativeTeamStats
+
+COURT_IMAGE_PATH = "./images/basketball_court.png"
+#: ``setup(data) -> (run, frames)`` or ``(run, frames, cleanup)``; ``run`` is
+#: what gets timed and ``cleanup`` runs once timing is done.
+CaseSetup = Callable[[Dict[str, Any]], Tuple[Any, ...]]
+
+
+def prepareGame(nFrames: int, nPlayers: int, seed: int = 0) -> Dict[str, Any]:
+    """The fixture game plus every derived annotation, computed once like ``main.py`` does."""
+    data = makeGame(nFrames, nPlayers=nPlayers, seed=seed)
+    data["ballAquisition"] = BallAquisitionDetector().detectBallPossession(data["playerTracks"], data["ballTracks"])
+    piDetector = PassAndInterceptionDetector()
+    data["events"] = events = piDetector.detectEvents(data["ballAquisition"], data["playerAssignment"])
+    data["passes"] = piDetector.extractor.dense(events, PASS, nFrames)
+    data["interceptions"] = piDetector.extractor.dense(events, INTERCEPTION, nFrames)
+    data["teamStats"] = CumulativeTeamStats.fromPossession(
+        data["passes"], data["interceptions"], data["playerAssignment"], data["ballAquisition"]
+    )
+    tvc = TacticalViewConverter(COURT_IMAGE_PATH)
+    data["tvc"] = tvc
+    data["court"] = (tvc.courtImagePath, tvc.width, tvc.height, tvc.keyPoints)
+    data["courtMeters"] = (tvc.actualWidthM, tvc.actualHeightM)
+    data["validatedKeypoints"] = tvc.validateKeypoints(data["courtKeypoints"])
+    data["tacticalPos"] = tvc.transformPlayersArray(data["validatedKeypoints"], data["playerTracks"])
+    sdc = speedCalculator(tvc)
+    data["distances"] = sdc.calculate_distance(data["tacticalPos"])
+    data["speeds"] = sdc.calculate_speed(data["distances"])
+    data["runningDistances"] = RunningDistances(data["distances"])
+    return data
+
+
+def speedCalculator(tvc: TacticalViewConverter) -> SpeedAndDistanceCalculator:
+    return SpeedAndDistanceCalculator(tvc.width, tvc.height, tvc.actualWidthM, tvc.actualHeightM, fps=30.0)
+
+
+# ────────────────────────────────────────────────────────────────
+# Cases
+# ────────────────────────────────────────────────────────────────
+def _analytics(fn: Callable[[Dict[str, Any]], Callable[[], Any]]) -> CaseSetup:
+    return lambda data: (fn(data), len(data["playerTracks"]))
+
+
+def _cleanBallPositions(data: Dict[str, Any]) -> Callable[[], Any]:
+    from trackers import BallTracker  # the detection models' dependencies are optional here
+
+    tracker = BallTracker("unused.pt")
+    return lambda: tracker.cleanBallPositions(data["ballTracks"])
+
+
+def _speedAndDistance(data: Dict[str, Any]) -> Callable[[], Any]:
+    sdc = speedCalculator(data["tvc"])
+    return lambda: sdc.calculate_speed(sdc.calculate_distance(data["tacticalPos"]))
+
+
+def _export(fmt: str) -> CaseSetup:
+    def setup(data: Dict[str, Any]) -> Tuple[Callable[[], Any], int, Callable[[], None]]:
+        outDir = tempfile.TemporaryDirectory(prefix="bench_export_")
+        try:
+            exporter = AnalyticsExporter(outDir.name, [fmt])
+        except ImportError:
+            outDir.cleanup()
+            raise
+        return lambda: exporter.export(data, 30.0, chunkSize=64), len(data["playerTracks"]), outDir.cleanup
+
+    return setup
+
+
+ANALYTICS_CASES: Dict[str, CaseSetup] = {
+    "cleanBallPositions": _analytics(_cleanBallPositions),
+    "possession": _analytics(
+        lambda d: lambda: BallAquisitionDetector().detectBallPossession(d["playerTracks"], d["ballTracks"])
+    ),
+    "passesAndInterceptions": _analytics(
+        lambda d: lambda: PassAndInterceptionDetector().detectEvents(d["ballAquisition"], d["playerAssignment"])
+    ),
+    "teamStats": _analytics(
+        lambda d: lambda: CumulativeTeamStats.fromPossession(
+            d["passes"], d["interceptions"], d["playerAssignment"], d["ballAquisition"]
+        )
+    ),
+    "validateKeypoints": _analytics(lambda d: lambda: d["tvc"].validateKeypoints(d["courtKeypoints"])),
+    "transformPlayers": _analytics(
+        lambda d: lambda: d["tvc"].transformPlayersArray(d["validatedKeypoints"], d["playerTracks"])
+    ),
+    "speedAndDistance": _analytics(_speedAndDistance),
+    "exportCsv": _export("csv"),
+    "exportJsonl": _export("jsonl"),
+    "exportParquet": _export("parquet"),
+}
+
+
+DRAWERS = (
+    "PlayerTracksDrawer",
+    "BallTracksDrawer",
+    "CourtKeypointDrawer",
+    "FrameNumberDrawer",
+    "TeamBallControlDrawer",
+    "PassInterceptionDrawer",
+    "SpeedAndDistanceDrawer",
+    "TacticalViewDrawer",
+)
+
+
+def drawerLayers(data: Dict[str, Any]) -> Dict[str, OverlayLayer]:
+    """Each drawer bound to its annotations, as ``main.buildCompositor`` binds them."""
+    stats = data["teamStats"]
+    layers = [
+        OverlayLayer(PlayerTracksDrawer(), data["playerTracks"], data["playerAssignment"], data["ballAquisition"]),
+        OverlayLayer(BallTracksDrawer(), data["ballTracks"]),
+        OverlayLayer(CourtKeypointDrawer(), data["validatedKeypoints"]),
+        OverlayLayer(FrameNumberDrawer()),
+        OverlayLayer(TeamBallControlDrawer(), stats),
+        OverlayLayer(PassInterceptionDrawer(), stats),
+        OverlayLayer(SpeedAndDistanceDrawer(), data["playerTracks"], data["runningDistances"], data["speeds"]),
+        OverlayLayer(
+            TacticalViewDrawer(),
+            *data["court"],
+            data["tacticalPos"],
+            data["playerAssignment"],
+            data["ballAquisition"],
+        ),
+    ]
+    return {type(layer.drawer).__name__: layer for layer in layers}
+
+
+def drawerCases(drawFrames: int, frameSize: Tuple[int, int]) -> Dict[str, CaseSetup]:
+    def setup(name: str) -> CaseSetup:
+        def make(data: Dict[str, Any]) -> Tuple[Callable[[], Any], int]:
+            layer = drawerLayers(data)[name]
+            frames = makeBlankFrames(min(drawFrames, len(data["playerTracks"])), frameSize)
+
+            def run() -> None:
+                for idx, frame in enumerate(frames):
+                    layer.apply(frame, idx)
+
+            return run, len(frames)
+
+        return make
+
+    return {"draw/" + name: setup(name) for name in DRAWERS}
+
+
+#: Fresh-interpreter startup, timed per run (``frames`` is 1).
+STARTUP_CASES: Dict[str, CaseSetup] = {
+    "startup/" + name: (lambda script: lambda data: (lambda: runScript(script), 1))(script)
+    for name, script in SCRIPTS.items()
+}
+
+
+# ────────────────────────────────────────────────────────────────
+# Running and comparing
+# ────────────────────────────────────────────────────────────────
+def timeCase(run: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def runSuite(
+    cases: Dict[str, CaseSetup],
+    data: Dict[str, Any],
+    *,
+    repeat: int = 5,
+) -> Dict[str, Dict[str, Any]]:
+    """Best-of-``repeat`` seconds and frames/second per case; cases whose imports fail are skipped."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, setup in cases.items():
+        try:
+            run, frames, *cleanup = setup(data)
+        except ImportError as exc:
+            results[name] = {"skipped": str(exc)}
+            continue
+        try:
+            seconds = timeCase(run, repeat)
+        finally:
+            for fn in cleanup:
+                fn()
+        results[name] = {"seconds": seconds, "frames": frames, "fps": frames / seconds if seconds > 0 else 0.0}
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    *,
+    tolerance: float = 0.25,
+    noiseFloor: float = 1e-3,
+) -> List[str]:
+    """Cases slower than ``baseline * (1 + tolerance)`` by more than ``noiseFloor`` seconds."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base or "seconds" not in base or "seconds" not in r:
+            continue
+        limit = base["seconds"] * (1 + tolerance)
+        if r["seconds"] > limit and r["seconds"] - base["seconds"] > noiseFloor:
+            regressions.append(
+                f"{name}: {r['seconds'] * 1000:.1f} ms vs baseline {base['seconds'] * 1000:.1f} ms "
+                f"(+{(r['seconds'] / base['seconds'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=5000, help="frames of the synthetic game")
+    p.add_argument("--players", type=int, default=10)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--draw_frames", type=int, default=200, help="blank frames each drawer draws")
+    p.add_argument("--width", type=int, default=1280)
+    p.add_argument("--height", type=int, default=720)
+    p.add_argument("--repeat", type=int, default=5, help="each case reports its best of this many runs")
+    p.add_argument("--cases", nargs="+", default=None, help="only run these cases (default: all)")
+    p.add_argument("--save", type=str, default=None, help="write the results as a baseline to this file")
+    p.add_argument("--compare", type=str, default=None, help="fail if slower than this baseline")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a case fails")
+    a = p.parse_args()
+
+    scale = {
+        "frames": a.frames,
+        "players": a.players,
+        "seed": a.seed,
+        "drawFrames": a.draw_frames,
+        "frameSize": [a.width, a.height],
+    }
+    baseline: Optional[Dict[str, Any]] = None
+    if a.compare:
+        with open(a.compare) as f:
+            baseline = json.load(f)
+        if baseline["scale"] != scale:
+            sys.exit(f"baseline {a.compare} was recorded at {baseline['scale']}, this run is {scale}")
+
+    cases = {**STARTUP_CASES, **ANALYTICS_CASES, **drawerCases(a.draw_frames, (a.width, a.height))}
+    if a.cases:
+        unknown = sorted(set(a.cases) - set(cases))
+        if unknown:
+            sys.exit(f"unknown cases {unknown}, expected some of {sorted(cases)}")
+        cases = {name: cases[name] for name in a.cases}
+    data = prepareGame(a.frames, a.players, a.seed)
+    results = runSuite(cases, data, repeat=a.repeat)
+
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"{name:>32}: skipped ({r['skipped']})")
+        else:
+            fps = f"{r['fps']:12.0f} fps" if r["frames"] > 1 else ""
+            print(f"{name:>32}: {r['seconds'] * 1000:9.2f} ms  {fps}")
+    if a.save:
+        dir_name = os.path.dirname(a.save)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        with open(a.save, "w") as f:
+            json.dump({"scale": scale, "environment": environment(), "cases": results}, f, indent=2)
+    if baseline is not None:
+        regressions = compare(results, baseline["cases"], tolerance=a.tolerance)
+        if regressions:
+            print("regressions against %s:" % a.compare)
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("no regressions against %s (tolerance %.0f%%)" % (a.compare, a.tolerance * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-from .configs import STUBS_DEFAULT_PATH,PLAYER_DETECTOR_PATH,BALL_DETECTOR_PATH,COURT_KEYPOINT_DETECTOR_PATH,OUTPUT_VIDEO_PATH
\ No newline at end of file
+from .configs import STUBS_DEFAULT_PATH,PLAYER_DETECTOR_PATH,BALL_DETECTOR_PATH,COURT_KEYPOINT_DETECTOR_PATH,OUTPUT_VIDEO_PATH,CHUNK_SIZE,CACHE_DIR,CACHE_MAX_BYTES,INFERENCE_BATCH_SIZE,INFERENCE_WORKERS,LIVE_LATENCY_BUDGET_MS,RENDER_WORKERS,PROFILE_REPORT_PATH,BATCH_WORKERS,BATCH_OUTPUT_DIR,EXPORT_DIR,EXPORT_FORMATS
\ No newline at end of file
@@ -2,4 +2,16 @@ STUBS_DEFAULT_PATH = 'stubs'
 PLAYER_DETECTOR_PATH = 'models/player_detector.pt'
 BALL_DETECTOR_PATH = 'models/ball_detector_model.pt'
 COURT_KEYPOINT_DETECTOR_PATH = 'models/court_keypoint_detector.pt'
-OUTPUT_VIDEO_PATH = 'output_videos/output_video.avi'
\ No newline at end of file
+OUTPUT_VIDEO_PATH = 'output_videos/output_video.avi'
+CHUNK_SIZE = 64
+CACHE_DIR = 'cache'
+CACHE_MAX_BYTES = 4 << 30
+INFERENCE_BATCH_SIZE = 20
+INFERENCE_WORKERS = 3
+LIVE_LATENCY_BUDGET_MS = 200
+RENDER_WORKERS = 1
+PROFILE_REPORT_PATH = 'output_videos/profile.json'
+BATCH_WORKERS = 2
+BATCH_OUTPUT_DIR = 'output_videos/batch'
+EXPORT_DIR = 'output_videos/analytics'
+EXPORT_FORMATS = ['csv']
\ No newline at end of file
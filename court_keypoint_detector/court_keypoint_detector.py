@@ -2,22 +2,53 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence
 
 import numpy as np
-from ultralytics import YOLO
-import supervision as sv  # retained import for side‑effects/typing
 
 sys.path.append("../")
-from utils import read_stub, save_stub
+from utils import read_stub, save_stub, iter_batches, StageCache
+from track_store import keypointsToArray, KeypointFrames
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
 
 Frame = np.ndarray
 CourtKeypoints = Any
 
 
 class CourtKeypointDetector:
-    def __init__(self, modelPath: str | Path) -> None:
-        self.model = YOLO(str(modelPath))
+    cacheStage = "court_keypoints"
+
+    def __init__(
+        self,
+        modelPath: str | Path,
+        *,
+        conf: float = 0.5,
+        batchSize: int = 20,
+        imgsz: Optional[int] = None,
+    ) -> None:
+        self.modelPath = str(modelPath)
+        self.conf = conf
+        self.batchSize = batchSize
+        self.imgsz = imgsz
+        self._model: Optional[YOLO] = None
+
+    @property
+    def model(self) -> YOLO:
+        if self._model is None:
+            from ultralytics import YOLO  # heavy; imported only when detecting
+
+            self._model = YOLO(self.modelPath)
+        return self._model
+
+    def cacheKey(self, cache: StageCache, videoPath: str | Path) -> str:
+        return cache.makeKey(
+            self.cacheStage,
+            inputs=[str(videoPath), self.modelPath],
+            params={"conf": self.conf, "batch": self.batchSize, "imgsz": self.imgsz},
+            code=[__file__],
+        )
 
     def getCourtKeypoints(
         self,
@@ -25,19 +56,41 @@ class CourtKeypointDetector:
         *,
         readFromStub: bool = False,
         stubPath: Optional[str | Path] = None,
-        batchSize: int = 20,
-        conf: float = 0.5,
+        batchSize: Optional[int] = None,
+        conf: Optional[float] = None,
+        cache: Optional[StageCache] = None,
+        videoPath: Optional[str | Path] = None,
     ) -> List[CourtKeypoints]:
-        maybeCached = read_stub(readFromStub, stubPath)
+        if batchSize is not None or conf is not None:
+            cache = None  # ad-hoc overrides are not part of the cache key
+        key = self.cacheKey(cache, videoPath) if cache is not None and videoPath else None
+        maybeCached = cache.load(self.cacheStage, key) if key else read_stub(readFromStub, stubPath)
+        if key and maybeCached is not None:
+            size = (frames[0].shape[1], frames[0].shape[0]) if len(frames) else None
+            maybeCached = KeypointFrames(maybeCached, size)
         if maybeCached is not None and len(maybeCached) == len(frames):
             return maybeCached
 
+        courtKeypoints = self.detectFrames(frames, batchSize=batchSize, conf=conf)
+        if key:
+            cache.store(self.cacheStage, key, keypointsToArray(courtKeypoints))
+        else:
+            save_stub(stubPath, courtKeypoints)
+        return courtKeypoints
+
+    def detectFrames(
+        self,
+        frames: Iterable[Frame],
+        *,
+        batchSize: Optional[int] = None,
+        conf: Optional[float] = None,
+    ) -> List[CourtKeypoints]:
+        batchSize = self.batchSize if batchSize is None else batchSize
+        conf = self.conf if conf is None else conf
+        extra = {} if self.imgsz is None else {"imgsz": self.imgsz}
         courtKeypoints: List[CourtKeypoints] = []
-        for idx in range(0, len(frames), batchSize):
-            batch = frames[idx : idx + batchSize]
-            detections = self.model.predict(list(batch), conf=conf)
+        for batch in iter_batches(frames, batchSize):
+            detections = self.model.predict(batch, conf=conf, verbose=False, **extra)
             for det in detections:
                 courtKeypoints.append(det.keypoints)
-
-        save_stub(stubPath, courtKeypoints)
         return courtKeypoints
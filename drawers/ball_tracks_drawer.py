@@ -15,14 +15,23 @@ class BallTracksDrawer:
     def __init__(self, pointerColor: Tuple[int, int, int] = (0, 255, 0)) -> None:
         self.pointerColor = pointerColor
 
-    def drawTracks(self, videoFrames: Sequence[Frame], tracks: Sequence[TracksFrame]) -> List[Frame]:
+    def drawTracks(
+        self,
+        videoFrames: Sequence[Frame],
+        tracks: Sequence[TracksFrame],
+        *,
+        startIdx: int = 0,
+    ) -> List[Frame]:
         output: List[Frame] = []
-        for idx, frame in enumerate(videoFrames):
+        for idx, frame in enumerate(videoFrames, start=startIdx):
             f = frame.copy()
-            for ball in tracks[idx].values():
-                bbox = ball.get("bbox")
-                if bbox is None:
-                    continue
-                f = draw_traingle(f, bbox, self.pointerColor)
+            self.drawFrame(f, idx, tracks)
             output.append(f)
         return output
+
+    def drawFrame(self, frame: Frame, idx: int, tracks: Sequence[TracksFrame]) -> None:
+        for ball in tracks[idx].values():
+            bbox = ball.get("bbox")
+            if bbox is None:
+                continue
+            draw_traingle(frame, bbox, self.pointerColor)
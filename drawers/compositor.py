@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, List, Protocol, Sequence
+
+import numpy as np
+
+sys.path.append("../")
+from utils import PROFILER  # noqa: E402
+
+Frame = np.ndarray
+
+
+class FrameDrawer(Protocol):
+    """Shared layer interface: draw frame ``idx`` into ``frame`` in place."""
+
+    def drawFrame(self, frame: Frame, idx: int, *data: Any) -> Any: ...
+
+
+class OverlayLayer:
+    """A drawer bound to the per-video annotation data it renders."""
+
+    def __init__(self, drawer: FrameDrawer, *data: Any, enabled: bool = True, **options: Any) -> None:
+        self.drawer = drawer
+        self.data = data
+        self.options = options
+        self.enabled = enabled
+
+    def apply(self, frame: Frame, idx: int) -> None:
+        self.drawer.drawFrame(frame, idx, *self.data, **self.options)
+
+
+class FrameCompositor:
+    """Apply every enabled overlay layer to one buffer per frame.
+
+    Layers draw in list order directly into the frame, so no intermediate
+    full-frame copies are made; callers that need the source frames intact
+    must copy them first.
+    """
+
+    def __init__(self, layers: Sequence[OverlayLayer]) -> None:
+        self.layers: List[OverlayLayer] = list(layers)
+
+    def renderFrame(self, frame: Frame, idx: int) -> Frame:
+        for layer in self.layers:
+            if layer.enabled:
+                layer.apply(frame, idx)
+        return frame
+
+    def render(self, frames: Sequence[Frame], *, startIdx: int = 0) -> Sequence[Frame]:
+        if PROFILER.enabled:
+            return self._renderProfiled(frames, startIdx)
+        for idx, frame in enumerate(frames, start=startIdx):
+            self.renderFrame(frame, idx)
+        return frames
+
+    def _renderProfiled(self, frames: Sequence[Frame], startIdx: int) -> Sequence[Frame]:
+        """:meth:`render` with one profiler span per drawer, named after its class."""
+        for layer in self.layers:
+            if layer.enabled:
+                with PROFILER.span(type(layer.drawer).__name__, frames=len(frames)):
+                    for idx, frame in enumerate(frames, start=startIdx):
+                        layer.apply(frame, idx)
+        return frames
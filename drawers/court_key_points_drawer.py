@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+Frame = np.ndarray
+CourtKeypoints = Any
+
+
+class CourtKeypointDrawer:
+    def __init__(
+        self,
+        keypointColor: Tuple[int, int, int] = (0, 0, 255),
+        labelColor: Tuple[int, int, int] = (0, 255, 0),
+        radius: int = 5,
+    ) -> None:
+        self.keypointColor = keypointColor
+        self.labelColor = labelColor
+        self.radius = radius
+
+    def draw(
+        self,
+        videoFrames: Sequence[Frame],
+        courtKeypoints: Sequence[CourtKeypoints],
+        *,
+        startIdx: int = 0,
+    ) -> List[Frame]:
+        out: List[Frame] = []
+        for idx, frame in enumerate(videoFrames, start=startIdx):
+            f = frame.copy()
+            self.drawFrame(f, idx, courtKeypoints)
+            out.append(f)
+        return out
+
+    def drawFrame(self, frame: Frame, idx: int, courtKeypoints: Sequence[CourtKeypoints]) -> None:
+        kps = courtKeypoints[idx].xy.tolist()[0]
+        for kpIdx, (x, y) in enumerate(kps):
+            if x <= 0 or y <= 0:
+                continue
+            cv2.circle(frame, (int(x), int(y)), self.radius, self.keypointColor, -1)
+            cv2.putText(
+                frame,
+                str(kpIdx),
+                (int(x), int(y)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                self.labelColor,
+                2,
+            )
@@ -21,18 +21,21 @@ class FrameNumberDrawer:
         self.fontScale = fontScale
         self.thickness = thickness
 
-    def drawNumbers(self, frames: Sequence[Frame]) -> List[Frame]:
+    def drawNumbers(self, frames: Sequence[Frame], *, startIdx: int = 0) -> List[Frame]:
         out: List[Frame] = []
-        for idx, frame in enumerate(frames):
+        for idx, frame in enumerate(frames, start=startIdx):
             f = frame.copy()
-            cv2.putText(
-                f,
-                str(idx),
-                self.position,
-                cv2.FONT_HERSHEY_SIMPLEX,
-                self.fontScale,
-                self.color,
-                self.thickness,
-            )
+            self.drawFrame(f, idx)
             out.append(f)
         return out
+
+    def drawFrame(self, frame: Frame, idx: int) -> None:
+        cv2.putText(
+            frame,
+            str(idx),
+            self.position,
+            cv2.FONT_HERSHEY_SIMPLEX,
+            self.fontScale,
+            self.color,
+            self.thickness,
+        )
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, overload
+
+import cv2
+import numpy as np
+
+from .compositor import FrameCompositor
+
+sys.path.append("../")
+from utils import read_video_chunks  # noqa: E402
+
+Frame = np.ndarray
+T = TypeVar("T")
+#: Builds the compositor for one chunk from that chunk's annotation payload.
+CompositorFactory = Callable[[Any], FrameCompositor]
+#: ``(startIdx, stopIdx) -> payload`` with the annotations of those frames.
+AnnotationSlicer = Callable[[int, int], Any]
+#: Writes the next frames into a ``(n, h, w, 3)`` view and returns how many it wrote.
+ChunkFiller = Callable[[np.ndarray], int]
+
+
+class FrameWindow(Sequence[T]):
+    """Frames ``startIdx..`` of a per-frame sequence, indexed by video frame index.
+
+    Lets a worker receive only its chunk's annotations while the drawers
+    keep indexing with absolute frame numbers; ``len`` is the absolute stop.
+    """
+
+    def __init__(self, items: Sequence[T], startIdx: int) -> None:
+        self.items = items
+        self.startIdx = startIdx
+
+    def __len__(self) -> int:
+        return self.startIdx + len(self.items)
+
+    @overload
+    def __getitem__(self, idx: int) -> T: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            raise TypeError("FrameWindow does not support slicing")
+        pos = idx - self.startIdx
+        if not 0 <= pos < len(self.items):
+            raise IndexError("frame index outside the window")
+        return self.items[pos]
+
+
+def _renderShared(
+    shmName: str,
+    shape: Tuple[int, ...],
+    startIdx: int,
+    factory: CompositorFactory,
+    payload: Any,
+) -> int:
+    """Worker side: draw the chunk living in shared memory in place."""
+    shm = shared_memory.SharedMemory(name=shmName)
+    try:
+        frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        factory(payload).render(frames, startIdx=startIdx)
+        del frames
+    finally:
+        shm.close()
+    return startIdx
+
+
+class ParallelRenderer:
+    """Render overlay chunks in worker processes, yielding them in order.
+
+    Each chunk lives in one of ``2 * workers`` reusable shared-memory slots
+    (:meth:`renderVideo` decodes straight into them) and is drawn in place
+    by a worker, so pixels are never pickled; the worker only receives
+    ``slicer(start, stop)``, the annotations of those frames, and builds its
+    compositor with ``factory``, which must therefore be a module-level
+    function. With ``workers <= 1`` chunks are rendered in-process.
+    """
+
+    def __init__(self, factory: CompositorFactory, slicer: AnnotationSlicer, *, workers: int = 2) -> None:
+        self.factory = factory
+        self.slicer = slicer
+        self.workers = workers
+
+    def render(self, chunks: Iterable[Sequence[Frame]]) -> Iterator[List[Frame]]:
+        """Render already decoded chunks."""
+        if self.workers <= 1:
+            return self._renderLocal(chunks)
+        return self._renderPool(self._copyInto(chunks))
+
+    def renderVideo(self, videoPath: str, chunkSize: int = 64) -> Iterator[List[Frame]]:
+        """Decode ``videoPath`` and render it ``chunkSize`` frames at a time."""
+        if self.workers <= 1:
+            return self._renderLocal(read_video_chunks(videoPath, chunkSize))
+        return self._renderPool(self._decodeInto(videoPath, chunkSize if chunkSize > 0 else 64))
+
+    def _renderLocal(self, chunks: Iterable[Sequence[Frame]]) -> Iterator[List[Frame]]:
+        startIdx = 0
+        for chunk in chunks:
+            stop = startIdx + len(chunk)
+            self.factory(self.slicer(startIdx, stop)).render(chunk, startIdx=startIdx)
+            yield list(chunk)
+            startIdx = stop
+
+    @staticmethod
+    def _copyInto(chunks: Iterable[Sequence[Frame]]) -> Iterator[Tuple[Tuple[int, ...], ChunkFiller]]:
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+
+            def fill(view: np.ndarray, chunk: Sequence[Frame] = chunk) -> int:
+                for i, frame in enumerate(chunk):
+                    view[i] = frame
+                return len(chunk)
+
+            yield (len(chunk), *chunk[0].shape), fill
+
+    @staticmethod
+    def _decodeInto(videoPath: str, chunkSize: int) -> Iterator[Tuple[Tuple[int, ...], ChunkFiller]]:
+        cap = cv2.VideoCapture(videoPath)
+        try:
+            if not cap.isOpened():
+                raise IOError(f"Cannot open video {videoPath!r}.")
+            # Slots are sized from the first decoded frame: the container's
+            # width / height can disagree with it (rotated or odd-sized streams).
+            ok, first = cap.read()
+            if not ok:
+                return
+            shape = (chunkSize, *first.shape)
+            pending = [first]
+            ended = False
+
+            def fill(view: np.ndarray) -> int:
+                nonlocal ended
+                start = 0
+                if pending:
+                    view[0] = pending.pop()
+                    start = 1
+                for i in range(start, len(view)):
+                    ok, frame = cap.read(view[i])
+                    if not ok:
+                        ended = True
+                        return i
+                    if frame.shape != view.shape[1:]:
+                        raise ValueError(f"frame {frame.shape} of {videoPath!r} differs from the first {view.shape[1:]}")
+                    if not np.shares_memory(frame, view):
+                        view[i] = frame
+                return len(view)
+
+            while not ended:
+                yield shape, fill
+        finally:
+            cap.release()
+
+    def _renderPool(self, fillers: Iterator[Tuple[Tuple[int, ...], ChunkFiller]]) -> Iterator[List[Frame]]:
+        slots: List[shared_memory.SharedMemory] = []
+        free: Deque[shared_memory.SharedMemory] = deque()
+        inflight: Deque[Tuple[Future, shared_memory.SharedMemory, Tuple[int, ...]]] = deque()
+        slotBytes: Optional[int] = None
+
+        def finish() -> List[Frame]:
+            future, shm, shape = inflight.popleft()
+            future.result()
+            out = list(np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy())
+            free.append(shm)
+            return out
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                startIdx = 0
+                for shape, fill in fillers:
+                    nbytes = int(np.prod(shape))
+                    if slotBytes is None:
+                        slotBytes = nbytes
+                    if nbytes > slotBytes:
+                        raise ValueError("chunks must not grow beyond the first chunk's size")
+                    if not free and len(slots) < 2 * self.workers:
+                        slots.append(shared_memory.SharedMemory(create=True, size=slotBytes))
+                        free.append(slots[-1])
+                    while not free:
+                        yield finish()
+                    shm = free.popleft()
+                    view = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+                    n = fill(view)
+                    del view
+                    if n == 0:
+                        free.append(shm)
+                        continue
+                    shape = (n, *shape[1:])
+                    stop = startIdx + n
+                    payload = self.slicer(startIdx, stop)
+                    inflight.append((pool.submit(_renderShared, shm.name, shape, startIdx, self.factory, payload), shm, shape))
+                    startIdx = stop
+                while inflight:
+                    yield finish()
+        finally:
+            for shm in slots:
+                shm.close()
+                shm.unlink()
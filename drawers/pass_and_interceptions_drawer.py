@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Sequence, Tuple
+import sys
+from typing import List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
+from .utils import blend_rect
+
+sys.path.append("../")
+from team_stats import CumulativeTeamStats  # noqa: E402
+
 Frame = np.ndarray
 
 
@@ -22,46 +28,43 @@ class PassInterceptionDrawer:
         self.overlayAlpha = overlayAlpha
 
     def getStats(self, passes: Sequence[int], interceptions: Sequence[int]) -> Tuple[int, int, int, int]:
-        t1p = t2p = t1i = t2i = 0
-        for p, inter in zip(passes, interceptions):
-            if p == 1:
-                t1p += 1
-            elif p == 2:
-                t2p += 1
-            if inter == 1:
-                t1i += 1
-            elif inter == 2:
-                t2i += 1
-        return t1p, t2p, t1i, t2i
+        """Team 1 / team 2 pass and interception totals over the given frames."""
+        stats = CumulativeTeamStats(passes, interceptions)
+        if not len(stats):
+            return 0, 0, 0, 0
+        s = stats.statsAt(len(stats) - 1)
+        return s["team1Passes"], s["team2Passes"], s["team1Interceptions"], s["team2Interceptions"]
 
     def drawFrames(
         self,
         videoFrames: Sequence[Frame],
-        passes: Sequence[int],
-        interceptions: Sequence[int],
+        passes: Sequence[int] = (),
+        interceptions: Sequence[int] = (),
+        *,
+        startIdx: int = 0,
+        stats: Optional[CumulativeTeamStats] = None,
     ) -> List[Frame]:
+        """Draw a chunk of frames; pass the video's ``stats`` once built to keep chunked drawing linear."""
+        if stats is None:
+            stats = CumulativeTeamStats(passes, interceptions)
         out: List[Frame] = []
-        for idx, frame in enumerate(videoFrames):
-            if idx == 0:
-                out.append(frame.copy())
-                continue
+        for idx, frame in enumerate(videoFrames, start=startIdx):
             f = frame.copy()
-            self._drawFrame(f, idx, passes, interceptions)
+            self.drawFrame(f, idx, stats)
             out.append(f)
         return out
 
-    def _drawFrame(self, frame: Frame, idx: int, passes: Sequence[int], interceptions: Sequence[int]) -> None:
+    def drawFrame(self, frame: Frame, idx: int, stats: CumulativeTeamStats) -> None:
+        if idx == 0:
+            return
         h, w = frame.shape[:2]
         rx1, ry1 = int(w * 0.16), int(h * 0.75)
         rx2, ry2 = int(w * 0.55), int(h * 0.90)
         tx = int(w * 0.19)
         ty1, ty2 = int(h * 0.80), int(h * 0.88)
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (rx1, ry1), (rx2, ry2), (255, 255, 255), -1)
-        cv2.addWeighted(overlay, self.overlayAlpha, frame, 1 - self.overlayAlpha, 0, frame)
-        p_until = passes[: idx + 1]
-        i_until = interceptions[: idx + 1]
-        t1p, t2p, t1i, t2i = self.getStats(p_until, i_until)
+        blend_rect(frame, (rx1, ry1), (rx2, ry2), (255, 255, 255), self.overlayAlpha)
+        t1p, t2p = stats.passesAt(idx)
+        t1i, t2i = stats.interceptionsAt(idx)
         cv2.putText(
             frame,
             f"Team 1 - Passes: {t1p} Interceptions: {t1i}",
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import sys
 from typing import Any, Dict, List, Sequence, Tuple
 
 import numpy as np
 
 from .utils import draw_ellipse, draw_traingle
 
+sys.path.append("../")
+from track_store import trackBoxes  # noqa: E402
+
 Frame = np.ndarray
 PlayerInfo = Dict[str, Any]
 TracksFrame = Dict[int, PlayerInfo]
@@ -28,18 +32,29 @@ class PlayerTracksDrawer:
         tracks: Sequence[TracksFrame],
         playerAssignment: Sequence[Dict[int, int]],
         ballAquisition: Sequence[int],
+        *,
+        startIdx: int = 0,
     ) -> List[Frame]:
         output: List[Frame] = []
-        for idx, frame in enumerate(videoFrames):
+        for idx, frame in enumerate(videoFrames, start=startIdx):
             f = frame.copy()
-            pDict = tracks[idx]
-            assignment = playerAssignment[idx]
-            ballPid = ballAquisition[idx]
-            for pid, player in pDict.items():
-                teamId = assignment.get(pid, self.defaultTeamId)
-                color = self.team1Color if teamId == 1 else self.team2Color
-                f = draw_ellipse(f, player["bbox"], color, pid)
-                if pid == ballPid:
-                    f = draw_traingle(f, player["bbox"], (0, 0, 255))
+            self.drawFrame(f, idx, tracks, playerAssignment, ballAquisition)
             output.append(f)
         return output
+
+    def drawFrame(
+        self,
+        frame: Frame,
+        idx: int,
+        tracks: Sequence[TracksFrame],
+        playerAssignment: Sequence[Dict[int, int]],
+        ballAquisition: Sequence[int],
+    ) -> None:
+        assignment = playerAssignment[idx]
+        ballPid = ballAquisition[idx]
+        for pid, bbox in trackBoxes(tracks[idx]):
+            teamId = assignment.get(pid, self.defaultTeamId)
+            color = self.team1Color if teamId == 1 else self.team2Color
+            draw_ellipse(frame, bbox, color, pid)
+            if pid == ballPid:
+                draw_traingle(frame, bbox, (0, 0, 255))
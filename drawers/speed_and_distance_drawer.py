@@ -1,16 +1,52 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Sequence, Tuple
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
+sys.path.append("../")
+from track_store import trackBoxes  # noqa: E402
+
 Frame = np.ndarray
 TracksFrame = Dict[int, Dict[str, Any]]
 DistanceFrame = Dict[int, float]
 SpeedFrame = Dict[int, float]
 
 
+class RunningDistances:
+    """Cumulative distance per player, queryable at any frame index."""
+
+    def __init__(self, playerDistances: Sequence[DistanceFrame]) -> None:
+        frames: Dict[int, List[int]] = {}
+        values: Dict[int, List[float]] = {}
+        for idx, distances in enumerate(playerDistances):
+            for pid, d in distances.items():
+                frames.setdefault(pid, []).append(idx)
+                values.setdefault(pid, []).append(d)
+        self._frames = {pid: np.asarray(f) for pid, f in frames.items()}
+        self._totals = {pid: np.cumsum(v) for pid, v in values.items()}
+
+    def window(self, start: int, stop: int) -> "RunningDistances":
+        """Only what :meth:`get` needs for frames ``start..stop-1``."""
+        out = RunningDistances([])
+        for pid, frames in self._frames.items():
+            lo = max(int(np.searchsorted(frames, start, side="right")) - 1, 0)
+            hi = int(np.searchsorted(frames, stop, side="left"))
+            if hi > lo:
+                out._frames[pid] = frames[lo:hi]
+                out._totals[pid] = self._totals[pid][lo:hi]
+        return out
+
+    def get(self, pid: int, idx: int) -> Optional[float]:
+        frames = self._frames.get(pid)
+        if frames is None:
+            return None
+        pos = int(np.searchsorted(frames, idx, side="right")) - 1
+        return float(self._totals[pid][pos]) if pos >= 0 else None
+
+
 class SpeedAndDistanceDrawer:
     def __init__(
         self,
@@ -28,39 +64,47 @@ class SpeedAndDistanceDrawer:
         playerTracks: Sequence[TracksFrame],
         playerDistances: Sequence[DistanceFrame],
         playerSpeeds: Sequence[SpeedFrame],
+        *,
+        startIdx: int = 0,
     ) -> List[Frame]:
         out: List[Frame] = []
-        totalDistances: Dict[int, float] = {}
-        for frame, tracks, distances, speeds in zip(
-            videoFrames, playerTracks, playerDistances, playerSpeeds
-        ):
+        totals = RunningDistances(playerDistances[: startIdx + len(videoFrames)])
+        for idx, frame in enumerate(videoFrames, start=startIdx):
             f = frame.copy()
-            for pid, d in distances.items():
-                totalDistances[pid] = totalDistances.get(pid, 0.0) + d
-            for pid, info in tracks.items():
-                x1, y1, x2, y2 = info["bbox"]
-                px, py = int((x1 + x2) / 2), int(y2) + 40
-                spd = speeds.get(pid)
-                dist = totalDistances.get(pid)
-                if spd is not None:
-                    cv2.putText(
-                        f,
-                        f"{spd:.2f} km/h",
-                        (px, py),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        self.fontScale,
-                        self.fontColor,
-                        self.fontThickness,
-                    )
-                if dist is not None:
-                    cv2.putText(
-                        f,
-                        f"{dist:.2f} m",
-                        (px, py + 20),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        self.fontScale,
-                        self.fontColor,
-                        self.fontThickness,
-                    )
+            self.drawFrame(f, idx, playerTracks, totals, playerSpeeds)
             out.append(f)
-        return out
\ No newline at end of file
+        return out
+
+    def drawFrame(
+        self,
+        frame: Frame,
+        idx: int,
+        playerTracks: Sequence[TracksFrame],
+        totals: RunningDistances,
+        playerSpeeds: Sequence[SpeedFrame],
+    ) -> None:
+        speeds = playerSpeeds[idx]
+        for pid, (x1, y1, x2, y2) in trackBoxes(playerTracks[idx]):
+            px, py = int((x1 + x2) / 2), int(y2) + 40
+            spd = speeds.get(pid)
+            dist = totals.get(pid, idx)
+            if spd is not None:
+                cv2.putText(
+                    frame,
+                    f"{spd:.2f} km/h",
+                    (px, py),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    self.fontScale,
+                    self.fontColor,
+                    self.fontThickness,
+                )
+            if dist is not None:
+                cv2.putText(
+                    frame,
+                    f"{dist:.2f} m",
+                    (px, py + 20),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    self.fontScale,
+                    self.fontColor,
+                    self.fontThickness,
+                )
@@ -1,7 +1,13 @@
+import sys
 
 import cv2
 import numpy as np
-from typing import List, Sequence, Dict, Any
+from typing import List, Optional, Sequence, Dict, Any
+
+from .utils import blend_rect
+
+sys.path.append("../")
+from team_stats import CumulativeTeamStats, teamControlArray  # noqa: E402
 
 Frame = np.ndarray
 AssignmentFrame = Dict[int, int]
@@ -11,38 +17,30 @@ class TeamBallControlDrawer:
     def __init__(self) -> None:
         pass
 
-    def _teamControlArray(
+    def teamControlArray(
         self,
         playerAssignment: Sequence[AssignmentFrame],
         ballAquisition: Sequence[int],
     ) -> np.ndarray:
-        control: List[int] = []
-        for assign, pid in zip(playerAssignment, ballAquisition):
-            if pid == -1 or pid not in assign:
-                control.append(-1)
-            else:
-                control.append(1 if assign[pid] == 1 else 2)
-        return np.array(control)
+        return teamControlArray(playerAssignment, ballAquisition)
 
-    def _drawFrame(
+    def drawFrame(
         self,
         frame: Frame,
         idx: int,
-        control: np.ndarray,
+        stats: CumulativeTeamStats,
         fontScale: float = 0.7,
         thickness: int = 2,
     ) -> Frame:
+        if idx == 0:
+            return frame
         h, w = frame.shape[:2]
         rx1, ry1 = int(w * 0.60), int(h * 0.75)
         rx2, ry2 = int(w * 0.99), int(h * 0.90)
         tx = int(w * 0.63)
         ty1, ty2 = int(h * 0.80), int(h * 0.88)
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (rx1, ry1), (rx2, ry2), (255, 255, 255), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
-        seq = control[: idx + 1]
-        t1 = (seq == 1).sum() / len(seq) if len(seq) else 0.0
-        t2 = (seq == 2).sum() / len(seq) if len(seq) else 0.0
+        blend_rect(frame, (rx1, ry1), (rx2, ry2), (255, 255, 255), 0.8)
+        t1, t2 = stats.controlAt(idx)
         cv2.putText(
             frame,
             f"Team 1 Ball Control: {t1 * 100:.2f}%",
@@ -66,14 +64,17 @@ class TeamBallControlDrawer:
     def draw(
         self,
         videoFrames: Sequence[Frame],
-        playerAssignment: Sequence[AssignmentFrame],
-        ballAquisition: Sequence[int],
+        playerAssignment: Sequence[AssignmentFrame] = (),
+        ballAquisition: Sequence[int] = (),
+        *,
+        startIdx: int = 0,
+        stats: Optional[CumulativeTeamStats] = None,
     ) -> List[Frame]:
-        control = self._teamControlArray(playerAssignment, ballAquisition)
+        """Draw a chunk of frames; pass the video's ``stats`` once built to keep chunked drawing linear."""
+        if stats is None:
+            stop = startIdx + len(videoFrames)
+            stats = CumulativeTeamStats(control=self.teamControlArray(playerAssignment[:stop], ballAquisition[:stop]))
         out: List[Frame] = []
-        for idx, frame in enumerate(videoFrames):
-            if idx == 0:
-                out.append(frame.copy())
-                continue
-            out.append(self._drawFrame(frame.copy(), idx, control))
+        for idx, frame in enumerate(videoFrames, start=startIdx):
+            out.append(self.drawFrame(frame.copy(), idx, stats))
         return out
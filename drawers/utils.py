@@ -1,4 +1,4 @@
-mport cv2 
+import cv2 
 import numpy as np
 import sys 
 sys.path.append('../')
@@ -63,4 +63,21 @@ def draw_ellipse(frame,bbox,color,track_id=None):
             2
         )
 
-    return frame
\ No newline at end of file
+    return frame
+
+def blend_rect(frame, pt1, pt2, color, alpha):
+    """Blend a filled rectangle into ``frame`` in place.
+
+    Equivalent to drawing the rectangle on a full-frame copy and calling
+    ``cv2.addWeighted``, but only the rectangle's ROI is touched.
+    """
+    h, w = frame.shape[:2]
+    x1, y1 = max(int(pt1[0]), 0), max(int(pt1[1]), 0)
+    x2, y2 = min(int(pt2[0]) + 1, w), min(int(pt2[1]) + 1, h)
+    if x2 <= x1 or y2 <= y1:
+        return frame
+    roi = frame[y1:y2, x1:x2]
+    patch = np.empty_like(roi)
+    patch[:] = color
+    cv2.addWeighted(patch, alpha, roi, 1 - alpha, 0, roi)
+    return frame
@@ -0,0 +1 @@
+from .scheduler import InferenceScheduler, ScheduledChunk, ChunkStage, prefetch
\ No newline at end of file
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+folder = Path(__file__).parent.resolve()
+sys.path.append(os.path.join(folder, "../"))
+from utils import read_video_chunks, VideoReader  # type: ignore
+
+Frame = np.ndarray
+ChunkStage = Callable[[Sequence[Frame]], List[Any]]
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class ScheduledChunk(NamedTuple):
+    startIdx: int
+    frames: List[Frame]
+    outputs: Dict[str, List[Any]]
+
+
+def prefetch(items: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """Iterate ``items`` on a background thread, keeping up to ``depth`` ready.
+
+    Exceptions raised by the producer are re-raised in the consumer.
+    """
+    if depth <= 0:
+        yield from items
+        return
+    buf: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry: Tuple[Any, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                buf.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as exc:  # forwarded to the consumer
+            put((_DONE, exc))
+
+    worker = threading.Thread(target=produce, name="prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item, exc = buf.get()
+            if item is _DONE:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+        worker.join(timeout=1.0)
+
+
+class InferenceScheduler:
+    """Decode a video once and fan each chunk out to several model stages.
+
+    ``stages`` maps a name to a callable taking a chunk of frames and
+    returning one output per frame (e.g. ``PlayerTracker.trackFrames``).
+    Decoding runs on its own thread, ``prefetchDepth`` chunks ahead; stages run on
+    ``workers`` single-threaded executors (stage ``i`` on executor
+    ``i % workers``). Every executor is FIFO, so each stage sees the chunks
+    in order and stateful trackers behave exactly as in a sequential loop.
+    Up to ``inflight`` chunks are submitted before the oldest is collected,
+    which overlaps the caller's per-chunk work with inference as well.
+    """
+
+    def __init__(
+        self,
+        stages: Mapping[str, ChunkStage],
+        *,
+        chunkSize: int = 64,
+        workers: int = 3,
+        prefetchDepth: int = 2,
+        inflight: int = 2,
+    ) -> None:
+        self.stages: Dict[str, ChunkStage] = dict(stages)
+        self.chunkSize = chunkSize
+        self.workers = max(1, min(workers, len(self.stages) or 1))
+        self.prefetchDepth = prefetchDepth
+        self.inflight = max(1, inflight)
+
+    def run(self, video: Union[str, VideoReader]) -> Iterator[ScheduledChunk]:
+        """Yield every chunk of a video path or :class:`VideoReader` with all stage outputs, in order."""
+        if isinstance(video, VideoReader):
+            return self.runChunks(video.chunks(self.chunkSize))
+        return self.runChunks(read_video_chunks(video, self.chunkSize))
+
+    def runChunks(self, chunks: Iterable[List[Frame]]) -> Iterator[ScheduledChunk]:
+        executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"infer{i}") for i in range(self.workers)]
+        pending: Deque[Tuple[int, List[Frame], Dict[str, Future]]] = deque()
+        try:
+            startIdx = 0
+            for chunk in prefetch(chunks, self.prefetchDepth):
+                futures = {
+                    name: executors[i % self.workers].submit(stage, chunk)
+                    for i, (name, stage) in enumerate(self.stages.items())
+                }
+                pending.append((startIdx, chunk, futures))
+                startIdx += len(chunk)
+                if len(pending) >= self.inflight:
+                    yield self._collect(*pending.popleft())
+            while pending:
+                yield self._collect(*pending.popleft())
+        finally:
+            for _, _, futures in pending:
+                for fut in futures.values():
+                    fut.cancel()
+            for ex in executors:
+                ex.shutdown(wait=True)
+
+    @staticmethod
+    def _collect(startIdx: int, chunk: List[Frame], futures: Dict[str, Future]) -> ScheduledChunk:
+        outputs = {name: fut.result() for name, fut in futures.items()}
+        for name, out in outputs.items():
+            if len(out) != len(chunk):
+                raise RuntimeError(f"stage {name!r} returned {len(out)} outputs for {len(chunk)} frames")
+        return ScheduledChunk(startIdx, chunk, outputs)
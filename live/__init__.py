@@ -0,0 +1,3 @@
+from .source import LiveSource, CapturedFrame, parseSource
+from .latency import LatencyStats
+from .live_analyzer import LiveAnalyzer, LiveSeries, LiveDistances, OPTIONAL_STAGES
\ No newline at end of file
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+class LatencyStats:
+    """Capture-to-output latencies of a live run, in seconds."""
+
+    def __init__(self, percentiles: Sequence[float] = (50, 90, 99)) -> None:
+        self.percentiles = tuple(percentiles)
+        self.samples: List[float] = []
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def summary(self) -> Dict[str, float]:
+        """``pNN`` / ``mean`` / ``max`` latencies in milliseconds (empty before any sample)."""
+        if not self.samples:
+            return {}
+        ms = np.asarray(self.samples) * 1000.0
+        out = {f"p{p:g}": float(v) for p, v in zip(self.percentiles, np.percentile(ms, self.percentiles))}
+        out["mean"] = float(ms.mean())
+        out["max"] = float(ms.max())
+        return out
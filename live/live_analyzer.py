@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, TypeVar, Union, overload
+
+import numpy as np
+
+from .latency import LatencyStats
+from .source import CapturedFrame, LiveSource
+
+folder = Path(__file__).parent.resolve()
+sys.path.append(os.path.join(folder, "../"))
+from utils import AsyncVideoWriter, WriterStats  # type: ignore  # noqa: E402
+from track_store import KeypointFrames, keypointsToArray, NUM_COURT_KEYPOINTS  # type: ignore  # noqa: E402
+from ball_aquisition import BallAquisitionDetector  # type: ignore  # noqa: E402
+from pass_and_interception_detector import PossessionEventExtractor, PASS, INTERCEPTION  # type: ignore  # noqa: E402
+from speed_and_distance_calculator import SpeedAndDistanceCalculator  # type: ignore  # noqa: E402
+from team_stats import RunningTeamStats  # type: ignore  # noqa: E402
+from drawers import (  # type: ignore  # noqa: E402
+    PlayerTracksDrawer,
+    BallTracksDrawer,
+    CourtKeypointDrawer,
+    TeamBallControlDrawer,
+    FrameNumberDrawer,
+    PassInterceptionDrawer,
+    TacticalViewDrawer,
+    SpeedAndDistanceDrawer,
+    FrameCompositor,
+    OverlayLayer,
+)
+
+Frame = np.ndarray
+T = TypeVar("T")
+
+#: Detection stages that may be skipped, in the order they are given up.
+OPTIONAL_STAGES = ("keypoints", "teams", "ball")
+
+
+class LiveSeries(Sequence[T]):
+    """The current frame's value behind the whole-video sequence interface.
+
+    Drawers index their data with the frame index; a live run only holds
+    the frame being drawn, so ``series[idx]`` returns it and ``len`` is
+    ``idx + 1``.
+    """
+
+    def __init__(self, value: T) -> None:
+        self.idx = -1
+        self.value = value
+
+    def set(self, idx: int, value: T) -> None:
+        self.idx, self.value = idx, value
+
+    def __len__(self) -> int:
+        return self.idx + 1
+
+    @overload
+    def __getitem__(self, idx: int) -> T: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice) or idx not in (self.idx, -1):
+            raise IndexError("a live series only holds the current frame")
+        return self.value
+
+
+class LiveDistances:
+    """``RunningDistances`` interface over the calculator's running totals."""
+
+    def __init__(self, totals: Dict[int, float]) -> None:
+        self.totals = totals
+
+    def get(self, pid: int, idx: int) -> Optional[float]:
+        return self.totals.get(pid)
+
+
+class LiveAnalyzer:
+    """Frame-by-frame analysis of a live feed within a latency budget.
+
+    Each frame runs player tracking, then (budget permitting) ball
+    detection, team assignment of new tracks and court keypoints, followed
+    by the online possession, event, tactical-view and speed stages and the
+    usual overlays. The cost of every stage is tracked with an exponential
+    moving average; when a frame's remaining budget cannot cover the
+    optional stages they are skipped in :data:`OPTIONAL_STAGES` order and
+    their last output is reused. Frames already older than the budget are
+    dropped when a newer one is waiting, and the source itself only keeps
+    the newest frames, so latency cannot build up.
+    """
+
+    def __init__(
+        self,
+        playerTracker: Any,
+        ballTracker: Any,
+        keypointDetector: Any,
+        teamAssigner: Any,
+        tvc: Any,
+        *,
+        fps: float,
+        latencyBudget: float = 0.2,
+        keypointInterval: int = 1,
+        costSmoothing: float = 0.2,
+    ) -> None:
+        self.playerTracker = playerTracker
+        self.ballTracker = ballTracker
+        self.keypointDetector = keypointDetector
+        self.teamAssigner = teamAssigner
+        self.tvc = tvc
+        self.fps = fps
+        self.latencyBudget = latencyBudget
+        self.keypointInterval = max(1, keypointInterval)
+        self.costSmoothing = costSmoothing
+        self.baDetector = BallAquisitionDetector()
+        self.extractor = PossessionEventExtractor()
+        self.sdc = SpeedAndDistanceCalculator(tvc.width, tvc.height, tvc.actualWidthM, tvc.actualHeightM, fps=fps)
+        self.reset()
+
+    def reset(self) -> None:
+        self.ballTracker.resetOnline()
+        self.baDetector.resetOnline()
+        self.extractor.reset()
+        self.sdc.reset_online()
+        self.tvc.liveTracker = None
+        self.teamStats = RunningTeamStats()
+        self.latency = LatencyStats()
+        self.stageCost: Dict[str, float] = {}
+        self.skipped: Dict[str, int] = {name: 0 for name in OPTIONAL_STAGES}
+        self.processed = 0
+        self.stale = 0
+        self._ball: Dict[int, Any] = {}
+        self._keypoints = np.zeros((NUM_COURT_KEYPOINTS, 2), dtype=np.float32)
+        self._lastKeypointIdx = -(1 << 30)
+        self._series: Dict[str, LiveSeries] = {
+            "playerTracks": LiveSeries({}),
+            "ballTracks": LiveSeries({}),
+            "courtKeypoints": LiveSeries(None),
+            "playerAssignment": LiveSeries({}),
+            "ballAquisition": LiveSeries(-1),
+            "tacticalPos": LiveSeries({}),
+            "speeds": LiveSeries({}),
+        }
+        self.compositor = self._buildCompositor()
+
+    def _buildCompositor(self) -> FrameCompositor:
+        s = self._series
+        tvc = self.tvc
+        return FrameCompositor(
+            [
+                OverlayLayer(PlayerTracksDrawer(), s["playerTracks"], s["playerAssignment"], s["ballAquisition"]),
+                OverlayLayer(BallTracksDrawer(), s["ballTracks"]),
+                OverlayLayer(CourtKeypointDrawer(), s["courtKeypoints"]),
+                OverlayLayer(FrameNumberDrawer()),
+                OverlayLayer(TeamBallControlDrawer(), self.teamStats),
+                OverlayLayer(PassInterceptionDrawer(), self.teamStats),
+                OverlayLayer(
+                    SpeedAndDistanceDrawer(),
+                    s["playerTracks"],
+                    LiveDistances(self.sdc.total_distance),
+                    s["speeds"],
+                ),
+                OverlayLayer(
+                    TacticalViewDrawer(),
+                    tvc.courtImagePath,
+                    tvc.width,
+                    tvc.height,
+                    tvc.keyPoints,
+                    s["tacticalPos"],
+                    s["playerAssignment"],
+                    s["ballAquisition"],
+                ),
+            ]
+        )
+
+    # ────────────────────────────────────────────────────────────────
+    # Budget
+    # ────────────────────────────────────────────────────────────────
+    def _timed(self, name: str, fn: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        out = fn()
+        cost = time.perf_counter() - start
+        prev = self.stageCost.get(name)
+        self.stageCost[name] = cost if prev is None else prev + self.costSmoothing * (cost - prev)
+        return out
+
+    def _plan(self, idx: int, remaining: float) -> Dict[str, bool]:
+        """Which optional stages fit into ``remaining`` seconds for frame ``idx``."""
+        wanted = {
+            "ball": True,
+            "teams": True,
+            "keypoints": idx - self._lastKeypointIdx >= self.keypointInterval,
+        }
+        cost = self.stageCost.get
+        need = sum(cost(n, 0.0) for n in ("players", "analytics", "render"))
+        need += sum(cost(n, 0.0) for n, w in wanted.items() if w)
+        for name in OPTIONAL_STAGES:
+            if need <= remaining:
+                break
+            if wanted[name]:
+                wanted[name] = False
+                need -= cost(name, 0.0)
+                self.skipped[name] += 1
+        return wanted
+
+    # ────────────────────────────────────────────────────────────────
+    # Per frame
+    # ────────────────────────────────────────────────────────────────
+    def processFrame(self, idx: int, frame: Frame, captured: Optional[float] = None) -> Frame:
+        """Analyse and annotate frame ``idx`` in place; ``captured`` is its arrival time."""
+        lateness = 0.0 if captured is None else time.perf_counter() - captured
+        plan = self._plan(idx, self.latencyBudget - lateness)
+
+        tracks = self._timed("players", lambda: self.playerTracker.trackFrames([frame])[0])
+        if plan["ball"]:
+            raw = self._timed("ball", lambda: self.ballTracker.trackFrames([frame])[0])
+            self._ball = self.ballTracker.filterFrame(idx, raw)
+        if plan["teams"]:
+            assignment = self._timed(
+                "teams", lambda: self.teamAssigner.assignFrames([frame], [tracks], startIdx=idx)[0]
+            )
+        else:
+            decided = self.teamAssigner.playerTeam
+            assignment = {pid: decided[pid] for pid in tracks if pid in decided}
+        if plan["keypoints"]:
+            detected = self._timed("keypoints", lambda: self.keypointDetector.detectFrames([frame])[0])
+            self._keypoints = keypointsToArray([detected])[0]
+            self._lastKeypointIdx = idx
+        self._timed("analytics", lambda: self._analyse(idx, frame, tracks, assignment))
+        self._timed("render", lambda: self.compositor.renderFrame(frame, idx))
+        self.processed += 1
+        return frame
+
+    def _analyse(self, idx: int, frame: Frame, tracks: Dict[int, Any], assignment: Dict[int, int]) -> None:
+        holder = self.baDetector.feedFrame(tracks, self._ball)
+        events = self.extractor.feed(idx, holder, assignment)
+        passTeam = next((ev.team for ev in events if ev.kind == PASS), -1)
+        interceptionTeam = next((ev.team for ev in events if ev.kind == INTERCEPTION), -1)
+        control = -1 if holder == -1 or holder not in assignment else (1 if assignment[holder] == 1 else 2)
+        self.teamStats.update(idx, control, passTeam, interceptionTeam)
+
+        kp = self._keypoints[None]
+        validated = np.where(self.tvc.keypointOutlierMask(kp)[..., None], np.float32(0), kp)
+        keypoints = KeypointFrames(validated, (frame.shape[1], frame.shape[0]))[0]
+        positions = self.tvc.transformPlayersFrame(idx, validated[0], tracks)
+        _, speeds = self.sdc.update_frame(idx, positions)
+
+        s = self._series
+        s["playerTracks"].set(idx, tracks)
+        s["ballTracks"].set(idx, self._ball)
+        s["courtKeypoints"].set(idx, keypoints)
+        s["playerAssignment"].set(idx, assignment)
+        s["ballAquisition"].set(idx, holder)
+        s["tacticalPos"].set(idx, positions)
+        s["speeds"].set(idx, speeds)
+
+    # ────────────────────────────────────────────────────────────────
+    # Stream
+    # ────────────────────────────────────────────────────────────────
+    def stream(self, source: LiveSource, *, maxFrames: Optional[int] = None) -> Iterator[Frame]:
+        """Yield annotated frames; the latency of each is recorded when the consumer asks for the next.
+
+        With the asynchronous writer that is once the frame has been queued
+        for encoding.
+        """
+        for item in source:
+            if maxFrames is not None and self.processed >= maxFrames:
+                break
+            if self._isStale(item, source):
+                self.stale += 1
+                continue
+            yield self.processFrame(item.idx, item.frame, item.captured)
+            self.latency.record(time.perf_counter() - item.captured)
+        self.extractor.finish()
+        self.teamAssigner.finish()
+
+    def _isStale(self, item: CapturedFrame, source: LiveSource) -> bool:
+        return time.perf_counter() - item.captured > self.latencyBudget and source.pending > 0
+
+    def run(
+        self,
+        source: LiveSource,
+        outputPath: str,
+        *,
+        maxFrames: Optional[int] = None,
+        **writerOptions: Any,
+    ) -> Dict[str, Any]:
+        """Analyse ``source`` until it ends (or Ctrl-C), writing annotated frames to ``outputPath``.
+
+        ``writerOptions`` go to :class:`AsyncVideoWriter` (``codec``, ``scale``, ...).
+        """
+        started = time.perf_counter()
+        writer = AsyncVideoWriter(outputPath, source.fps, **writerOptions)
+        try:
+            for frame in self.stream(source, maxFrames=maxFrames):
+                writer.write(frame)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            source.close()
+            writer.close()
+        return self.report(source, time.perf_counter() - started, writer.stats)
+
+    def report(self, source: LiveSource, elapsed: float, writerStats: Optional[WriterStats] = None) -> Dict[str, Any]:
+        return {
+            "read": source.read,
+            "processed": self.processed,
+            "droppedBySource": source.dropped,
+            "droppedStale": self.stale,
+            "skipped": dict(self.skipped),
+            "processingFps": self.processed / elapsed if elapsed > 0 else 0.0,
+            "stageCostMs": {name: cost * 1000.0 for name, cost in self.stageCost.items()},
+            "latencyMs": self.latency.summary(),
+            "events": len(self.extractor.events),
+            "encodeFps": writerStats.encodeFps if writerStats is not None else 0.0,
+        }
+
+    @staticmethod
+    def formatReport(report: Dict[str, Any]) -> str:
+        latency = "  ".join(f"{k}={v:.1f}ms" for k, v in report["latencyMs"].items()) or "no frames"
+        skipped = ", ".join(f"{k}={v}" for k, v in report["skipped"].items())
+        return (
+            f"live: {report['processed']}/{report['read']} frames processed at {report['processingFps']:.1f} fps "
+            f"(dropped {report['droppedBySource']} by source, {report['droppedStale']} stale; skipped {skipped})\n"
+            f"latency {latency}  encode {report['encodeFps']:.1f} fps"
+        )
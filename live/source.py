@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterator, NamedTuple, Optional, Union
+
+import cv2
+import numpy as np
+
+Frame = np.ndarray
+SourceSpec = Union[int, str]
+
+
+class CapturedFrame(NamedTuple):
+    idx: int  #: index in the source, counting frames dropped before processing
+    captured: float  #: ``time.perf_counter()`` when the frame became available
+    frame: Frame
+
+
+def parseSource(source: SourceSpec) -> SourceSpec:
+    """Device index for all-digit strings (``"0"`` is the first webcam), else unchanged."""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+class LiveSource:
+    """Read a capture device, stream URL or file on a background thread.
+
+    Only the newest ``bufferSize`` frames are kept: when the consumer falls
+    behind, older frames are dropped (counted in :attr:`dropped`) instead of
+    queueing up latency. With ``realtime`` every frame is released at its
+    presentation time, so a local file replays like a live feed; by default
+    files are replayed in real time and devices / URLs are read as fast as
+    they deliver.
+    """
+
+    def __init__(
+        self,
+        source: SourceSpec,
+        *,
+        realtime: Optional[bool] = None,
+        bufferSize: int = 1,
+        defaultFps: float = 30.0,
+    ) -> None:
+        self.source = parseSource(source)
+        isFile = isinstance(self.source, str) and os.path.isfile(self.source)
+        self.realtime = isFile if realtime is None else realtime
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video source {source!r}.")
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps > 0 else defaultFps  # streams often report 0 or -1
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.read = 0
+        self.dropped = 0
+        self._buf: Deque[CapturedFrame] = deque(maxlen=max(1, bufferSize))
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "LiveSource":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._capture, name="live-capture", daemon=True)
+            self._thread.start()
+        return self
+
+    def _capture(self) -> None:
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                if self.realtime:
+                    delay = start + self.read / self.fps - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                ok, frame = self.cap.read()
+                if not ok:
+                    break
+                with self._cond:
+                    if len(self._buf) == self._buf.maxlen:
+                        self.dropped += 1
+                    self._buf.append(CapturedFrame(self.read, time.perf_counter(), frame))
+                    self._cond.notify()
+                self.read += 1
+        except BaseException as exc:  # forwarded to the consumer
+            self._error = exc
+        finally:
+            # Released here, never while this thread may still be inside read().
+            self.cap.release()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """Frames captured and waiting to be consumed."""
+        return len(self._buf)
+
+    def __iter__(self) -> Iterator[CapturedFrame]:
+        self.start()
+        try:
+            while True:
+                with self._cond:
+                    while not self._buf and not self._done:
+                        self._cond.wait(0.1)
+                    if not self._buf:
+                        break
+                    item = self._buf.popleft()
+                yield item
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop capturing; once started, the capture thread releases the device when its read returns."""
+        self._stop.set()
+        if self._thread is None:
+            self.cap.release()
+        elif self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
-from typing import Any, List
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from utils import read_video, save_video
+from utils import (
+    AsyncVideoWriter,
+    CONTAINER_CODECS,
+    get_video_properties,
+    StageCache,
+    VideoProperties,
+    WriterStats,
+    PROFILER,
+    profile_span,
+)
+from inference import InferenceScheduler
+from live import LiveSource, LiveAnalyzer
+from track_store import tracksToColumns, keypointsToArray, KeypointFrames, TrackStore
 from trackers import PlayerTracker, BallTracker
-from team_assigner import TeamAssigner
+from team_assigner import TeamAssigner, TEAM_BACKENDS
 from court_keypoint_detector import CourtKeypointDetector
 from ball_aquisition import BallAquisitionDetector
-from pass_and_interception_detector import PassAndInterceptionDetector
+from pass_and_interception_detector import PassAndInterceptionDetector, PASS, INTERCEPTION
 from tactical_view_converter import TacticalViewConverter
 from speed_and_distance_calculator import SpeedAndDistanceCalculator
+from team_stats import CumulativeTeamStats
+from analytics_export import AnalyticsExporter, TABLE_FORMATS, checkFormats
 from drawers import (
     PlayerTracksDrawer,
     BallTracksDrawer,
@@ -21,96 +37,492 @@ from drawers import (
     PassInterceptionDrawer,
     TacticalViewDrawer,
     SpeedAndDistanceDrawer,
+    RunningDistances,
+    FrameCompositor,
+    OverlayLayer,
+    ParallelRenderer,
+    FrameWindow,
 )
 from configs import (
-    STUBS_DEFAULT_PATH,
     PLAYER_DETECTOR_PATH,
     BALL_DETECTOR_PATH,
     COURT_KEYPOINT_DETECTOR_PATH,
     OUTPUT_VIDEO_PATH,
+    CHUNK_SIZE,
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_WORKERS,
+    RENDER_WORKERS,
+    LIVE_LATENCY_BUDGET_MS,
+    PROFILE_REPORT_PATH,
+    EXPORT_DIR,
+    EXPORT_FORMATS,
 )
 
+def addPipelineArgs(p: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Options shared by ``main.py`` and the batch runner."""
+    p.add_argument("--cache_dir", type=str, default=CACHE_DIR)
+    p.add_argument(
+        "--cache_max_mb",
+        type=int,
+        default=CACHE_MAX_BYTES >> 20,
+        help="least recently used stage outputs are evicted beyond this size",
+    )
+    p.add_argument(
+        "--chunk_size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="frames decoded, analysed and drawn at a time (<= 0 loads the whole video)",
+    )
+    p.add_argument(
+        "--batch_size",
+        type=int,
+        default=INFERENCE_BATCH_SIZE,
+        help="frames per model forward pass (player, ball and court-keypoint models)",
+    )
+    p.add_argument(
+        "--imgsz",
+        type=int,
+        default=None,
+        help="model input size; smaller is faster on CPU (default: each model's training size)",
+    )
+    p.add_argument(
+        "--inference_workers",
+        type=int,
+        default=INFERENCE_WORKERS,
+        help="threads running the detection models concurrently (each model stays on one thread)",
+    )
+    p.add_argument(
+        "--render_workers",
+        "--render-workers",
+        dest="render_workers",
+        type=int,
+        default=RENDER_WORKERS,
+        help="processes drawing overlays on chunks in parallel (<= 1 draws in-process)",
+    )
+    p.add_argument(
+        "--codec",
+        type=str,
+        default=None,
+        help="fourcc of the output video (default: chosen from the output extension, one of %s)"
+        % ", ".join(sorted(CONTAINER_CODECS)),
+    )
+    p.add_argument(
+        "--output_scale",
+        type=float,
+        default=1.0,
+        help="resize the output video by this factor (e.g. 0.5 for half resolution)",
+    )
+    p.add_argument(
+        "--team_backend",
+        choices=TEAM_BACKENDS,
+        default="clip",
+        help="jersey classifier: fashion-CLIP prompts or fast colour clustering",
+    )
+    p.add_argument(
+        "--export",
+        nargs="?",
+        const=EXPORT_DIR,
+        default=None,
+        metavar="DIR",
+        help="write possession, event, player motion and tactical position tables to DIR/<video name>/ "
+        "(default: %s)" % EXPORT_DIR,
+    )
+    p.add_argument(
+        "--export_format",
+        nargs="+",
+        choices=TABLE_FORMATS,
+        default=EXPORT_FORMATS,
+        help="table formats to export; parquet needs pyarrow",
+    )
+    p.add_argument(
+        "--no-render",
+        "--no_render",
+        dest="no_render",
+        action="store_true",
+        help="skip the overlays and the video encode, only export the analytics (implies --export)",
+    )
+    return p
+
+
+def checkExportArgs(p: argparse.ArgumentParser, a: argparse.Namespace) -> None:
+    """Reject ``--export_format parquet`` up front when pyarrow is missing."""
+    if a.export or a.no_render:
+        try:
+            checkFormats(a.export_format)
+        except ImportError as exc:
+            p.error(str(exc))
+
 
 def parseArgs() -> argparse.Namespace:
     p = argparse.ArgumentParser()
-    p.add_argument("input_video", type=str)
+    p.add_argument("input_video", type=str, help="video file; with --live also a device index or stream URL")
     p.add_argument("--output_video", type=str, default=OUTPUT_VIDEO_PATH)
-    p.add_argument("--stub_path", type=str, default=STUBS_DEFAULT_PATH)
-    return p.parse_args()
+    addPipelineArgs(p)
+    p.add_argument(
+        "--live",
+        action="store_true",
+        help="analyse frame by frame as the video arrives (files are replayed in real time)",
+    )
+    p.add_argument(
+        "--latency_budget_ms",
+        type=float,
+        default=LIVE_LATENCY_BUDGET_MS,
+        help="live mode: capture-to-output budget; stale frames are dropped and stages skipped beyond it",
+    )
+    p.add_argument(
+        "--keypoint_interval",
+        type=int,
+        default=1,
+        help="live mode: detect court keypoints every N frames",
+    )
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_REPORT_PATH,
+        default=None,
+        metavar="REPORT_JSON",
+        help="time every stage and write a JSON report plus a CSV next to it (default: %s)" % PROFILE_REPORT_PATH,
+    )
+    a = p.parse_args()
+    if a.live and (a.export or a.no_render):
+        p.error("--export and --no-render apply to recorded videos, not --live")
+    checkExportArgs(p, a)
+    return a
+
+
+def stageCodecs(props: VideoProperties) -> Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+    """``(encode, decode)`` between each stage's in-memory form and its cache entry.
+
+    Tracks are cached as columnar structured arrays and keypoints as one
+    ``(frames, 18, 2)`` tensor; both are loaded memory-mapped, tracks into
+    a :class:`TrackStore` and keypoints behind the ``.xy`` interface the
+    drawers use.
+    """
+    n = props.frameCount
+    size = (props.width, props.height)
+    tracks = (tracksToColumns, lambda cols: TrackStore.fromColumns(cols, n))
+    return {
+        "playerTracks": tracks,
+        "ballTracks": tracks,
+        "courtKeypoints": (keypointsToArray, lambda xy: KeypointFrames(xy, size)),
+        "playerAssignment": (list, list),
+    }
+
+
+class DetectionModels(NamedTuple):
+    playerTracker: PlayerTracker
+    ballTracker: BallTracker
+    kpDetector: CourtKeypointDetector
+    teamAssigner: TeamAssigner
+
+
+def buildModels(a: argparse.Namespace) -> DetectionModels:
+    """The detection stages; weights load on first use and stay loaded for later videos."""
+    modelOpts = {"batchSize": a.batch_size, "imgsz": a.imgsz}
+    return DetectionModels(
+        PlayerTracker(PLAYER_DETECTOR_PATH, **modelOpts),
+        BallTracker(BALL_DETECTOR_PATH, **modelOpts),
+        CourtKeypointDetector(COURT_KEYPOINT_DETECTOR_PATH, **modelOpts),
+        TeamAssigner(backend=a.team_backend),
+    )
+
+
+#: Cache stage holding the number of frames a full decode of the video yields.
+FRAME_COUNT_STAGE = "frame_count"
+
+
+def runDetection(
+    a: argparse.Namespace,
+    props: VideoProperties,
+    cache: StageCache,
+    models: Optional[DetectionModels] = None,
+) -> Dict[str, Any]:
+    """Run the frame-consuming stages over one streaming decode of the video.
+
+    Stages with a valid cache entry are skipped; the video is only decoded
+    when at least one stage has to run, and each decoded chunk is shared by
+    every model through the :class:`InferenceScheduler`. Pass ``models``
+    to reuse already loaded models across videos.
+
+    ``CAP_PROP_FRAME_COUNT`` is only an estimate (often wrong for variable
+    frame rate files), so the stores and cache checks are sized by the
+    number of frames actually decoded, cached alongside the stage outputs
+    and returned as ``"frameCount"``.
+    """
+    countKey = cache.makeKey(FRAME_COUNT_STAGE, inputs=[a.input_video])
+    frameCount = cache.load(FRAME_COUNT_STAGE, countKey)
+    playerTracker, ballTracker, kpDetector, teamAssigner = models or buildModels(a)
+    tracksKey = playerTracker.cacheKey(cache, a.input_video)
+    stages = {
+        "playerTracks": (playerTracker.cacheStage, tracksKey),
+        "ballTracks": (ballTracker.cacheStage, ballTracker.cacheKey(cache, a.input_video)),
+        "courtKeypoints": (kpDetector.cacheStage, kpDetector.cacheKey(cache, a.input_video)),
+        "playerAssignment": (teamAssigner.cacheStage, teamAssigner.cacheKey(cache, a.input_video, tracksKey)),
+    }
+    results: Dict[str, Any] = {}
+    if frameCount is not None:
+        codecs = stageCodecs(props._replace(frameCount=frameCount))
+        for name, (stage, key) in stages.items():
+            cached = cache.load(stage, key)
+            if cached is None:
+                continue
+            if name.endswith("Tracks"):
+                valid = len(cached) == 0 or int(cached["frame"][-1]) < frameCount
+            else:
+                valid = len(cached) == frameCount
+            if valid:
+                results[name] = codecs[name][1](cached)
+    missing = [name for name in stages if name not in results]
+    if not missing:
+        results["frameCount"] = frameCount
+        return results
+    for name in missing:
+        results[name] = []
+    playerTracker.resetTracking()
+
+    models = {
+        "playerTracks": PROFILER.profiled("playerTracks", frameArg=0)(playerTracker.trackFrames),
+        "ballTracks": PROFILER.profiled("ballTracks", frameArg=0)(ballTracker.trackFrames),
+        "courtKeypoints": PROFILER.profiled("courtKeypoints", frameArg=0)(kpDetector.detectFrames),
+    }
+    scheduler = InferenceScheduler(
+        {name: stage for name, stage in models.items() if name in missing},
+        chunkSize=a.chunk_size,
+        workers=a.inference_workers,
+    )
+    frameCount = 0
+    for startIdx, chunk, outputs in scheduler.run(a.input_video):
+        frameCount = startIdx + len(chunk)
+        for name, out in outputs.items():
+            results[name].extend(out)
+        if "playerAssignment" in missing:
+            with profile_span("playerAssignment", frames=len(chunk)):
+                teamAssigner.assignFrames(
+                    chunk, results["playerTracks"][startIdx : startIdx + len(chunk)], startIdx=startIdx
+                )
+    if "playerAssignment" in missing:
+        # Label every frame of a track with its final team, whichever chunk it was decided in.
+        with profile_span("playerAssignment"):
+            teamAssigner.finish()
+            results["playerAssignment"] = teamAssigner.teamsFor(results["playerTracks"])
+
+    cache.store(FRAME_COUNT_STAGE, countKey, frameCount)
+    codecs = stageCodecs(props._replace(frameCount=frameCount))
+    for name in missing:
+        encode, decode = codecs[name]
+        encoded = encode(results[name])
+        cache.store(*stages[name], encoded)
+        if name != "playerAssignment":
+            results[name] = decode(encoded)
+    results["frameCount"] = frameCount
+    return results
+
+
+def buildCompositor(data: Dict[str, Any]) -> FrameCompositor:
+    stats: CumulativeTeamStats = data["teamStats"]
+    return FrameCompositor(
+        [
+            OverlayLayer(
+                PlayerTracksDrawer(), data["playerTracks"], data["playerAssignment"], data["ballAquisition"]
+            ),
+            OverlayLayer(BallTracksDrawer(), data["ballTracks"]),
+            OverlayLayer(CourtKeypointDrawer(), data["courtKeypoints"]),
+            OverlayLayer(FrameNumberDrawer()),
+            OverlayLayer(TeamBallControlDrawer(), stats),
+            OverlayLayer(PassInterceptionDrawer(), stats),
+            OverlayLayer(
+                SpeedAndDistanceDrawer(),
+                data["playerTracks"],
+                data["runningDistances"],
+                data["speeds"],
+            ),
+            OverlayLayer(
+                TacticalViewDrawer(),
+                *data["court"],
+                data["tacticalPos"],
+                data["playerAssignment"],
+                data["ballAquisition"],
+            ),
+        ]
+    )
+
+
+PER_FRAME_ANNOTATIONS = (
+    "playerTracks",
+    "ballTracks",
+    "courtKeypoints",
+    "playerAssignment",
+    "ballAquisition",
+    "tacticalPos",
+    "speeds",
+)
+
+
+def chunkAnnotations(data: Dict[str, Any], start: int, stop: int) -> Dict[str, Any]:
+    """What :func:`buildCompositor` needs to draw frames ``start..stop-1``."""
+    out: Dict[str, Any] = {name: FrameWindow(data[name][start:stop], start) for name in PER_FRAME_ANNOTATIONS}
+    out["teamStats"] = data["teamStats"].window(start, stop)
+    out["runningDistances"] = data["runningDistances"].window(start, stop)
+    out["court"] = data["court"]
+    return out
+
+
+def renderChunks(a: argparse.Namespace, data: Dict[str, Any]) -> Iterator[List[Any]]:
+    renderer = ParallelRenderer(
+        buildCompositor,
+        functools.partial(chunkAnnotations, data),
+        workers=a.render_workers,
+    )
+    return renderer.renderVideo(a.input_video, a.chunk_size)
+
+
+def runLive(a: argparse.Namespace) -> None:
+    source = LiveSource(a.input_video)
+    modelOpts = {"batchSize": 1, "imgsz": a.imgsz}
+    analyzer = LiveAnalyzer(
+        PlayerTracker(PLAYER_DETECTOR_PATH, **modelOpts),
+        BallTracker(BALL_DETECTOR_PATH, **modelOpts),
+        CourtKeypointDetector(COURT_KEYPOINT_DETECTOR_PATH, **modelOpts),
+        TeamAssigner(backend=a.team_backend),
+        TacticalViewConverter("./images/basketball_court.png"),
+        fps=source.fps,
+        latencyBudget=a.latency_budget_ms / 1000.0,
+        keypointInterval=a.keypoint_interval,
+    )
+    report = analyzer.run(source, a.output_video, codec=a.codec, scale=a.output_scale)
+    print(LiveAnalyzer.formatReport(report))
+
+
+#: Cache stage names of the detection stages, mapped to their profiler stages.
+CACHE_PROFILE_STAGES = {
+    PlayerTracker.cacheStage: "playerTracks",
+    BallTracker.cacheStage: "ballTracks",
+    CourtKeypointDetector.cacheStage: "courtKeypoints",
+    TeamAssigner.cacheStage: "playerAssignment",
+}
+
+
+def writeProfile(path: str) -> None:
+    PROFILER.writeJson(path)
+    PROFILER.writeCsv(os.path.splitext(path)[0] + ".csv")
+    print(PROFILER.summary())
+
+
+def runAnalytics(data: Dict[str, Any], props: VideoProperties) -> Dict[str, Any]:
+    """Derive possession, events, team stats, tactical positions and speeds from the detections, in ``data``."""
+    playerTracks = data["playerTracks"]
+    nFrames = len(playerTracks)
+    with profile_span("cleanBallPositions", frames=nFrames):
+        data["ballTracks"] = BallTracker(BALL_DETECTOR_PATH).cleanBallPositions(data["ballTracks"])
+    ballTracks = data["ballTracks"]
+    playerAssignment = data["playerAssignment"]
+    with profile_span("ballAquisition", frames=nFrames):
+        ballAquisition = BallAquisitionDetector().detectBallPossession(playerTracks, ballTracks)
+    data["ballAquisition"] = ballAquisition
+    with profile_span("passesAndInterceptions", frames=nFrames):
+        piDetector = PassAndInterceptionDetector()
+        data["events"] = piDetector.detectEvents(ballAquisition, playerAssignment)
+        data["passes"] = piDetector.extractor.dense(data["events"], PASS, len(ballAquisition))
+        data["interceptions"] = piDetector.extractor.dense(data["events"], INTERCEPTION, len(ballAquisition))
+    with profile_span("teamStats", frames=nFrames):
+        data["teamStats"] = CumulativeTeamStats.fromPossession(
+            data["passes"], data["interceptions"], playerAssignment, ballAquisition
+        )
+    tvc = TacticalViewConverter("./images/basketball_court.png")
+    data["court"] = (tvc.courtImagePath, tvc.width, tvc.height, tvc.keyPoints)
+    data["courtMeters"] = (tvc.actualWidthM, tvc.actualHeightM)
+    with profile_span("validateKeypoints", frames=nFrames):
+        data["courtKeypoints"] = tvc.validateKeypoints(data["courtKeypoints"])
+    with profile_span("tacticalView", frames=nFrames):
+        data["tacticalPos"] = tvc.transformPlayersArray(data["courtKeypoints"], playerTracks)
+    with profile_span("speedAndDistance", frames=nFrames):
+        sdc = SpeedAndDistanceCalculator(
+            tvc.width,
+            tvc.height,
+            tvc.actualWidthM,
+            tvc.actualHeightM,
+            fps=props.fps,
+        )
+        data["distances"] = sdc.calculate_distance(data["tacticalPos"])
+        data["speeds"] = sdc.calculate_speed(data["distances"])
+        data["runningDistances"] = RunningDistances(data["distances"])
+    return data
+
+
+def renderOutput(a: argparse.Namespace, data: Dict[str, Any], props: VideoProperties) -> WriterStats:
+    with AsyncVideoWriter(a.output_video, props.fps, codec=a.codec, scale=a.output_scale) as writer:
+        with profile_span("render") as span:
+            for chunk in renderChunks(a, data):
+                writer.writeAll(chunk)
+                span.frames += len(chunk)
+    PROFILER.add("writer", writer.stats.encodeSeconds, frames=writer.stats.frames)
+    return writer.stats
+
+
+def exportDir(a: argparse.Namespace) -> Optional[str]:
+    """Folder the analytics tables of ``a.input_video`` go to, or ``None`` when not exporting."""
+    root = a.export or (EXPORT_DIR if a.no_render else None)
+    if root is None:
+        return None
+    return os.path.join(root, os.path.splitext(os.path.basename(a.input_video))[0])
+
+
+def processVideo(
+    a: argparse.Namespace,
+    models: Optional[DetectionModels] = None,
+    *,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Detect, analyse and render ``a.input_video`` into ``a.output_video``; returns throughput stats.
+
+    With ``a.export`` the analytics are also written as tables; with
+    ``a.no_render`` nothing is drawn or encoded.
+    """
+    start = time.perf_counter()
+    outDir = exportDir(a)
+    exporter = AnalyticsExporter(outDir, a.export_format) if outDir else None  # fails early without pyarrow
+    props = get_video_properties(a.input_video)
+    cache = StageCache(a.cache_dir, maxBytes=a.cache_max_mb << 20)
+    with profile_span("detection") as span:
+        data: Dict[str, Any] = runDetection(a, props, cache, models)
+        props = props._replace(frameCount=data["frameCount"])
+        span.frames = props.frameCount
+    PROFILER.addCacheStats(cache.stats, CACHE_PROFILE_STAGES)
+    runAnalytics(data, props)
+    if exporter is not None:
+        with profile_span("export", frames=props.frameCount):
+            exporter.export(data, props.fps, a.chunk_size)
+    writerStats = None if a.no_render else renderOutput(a, data, props)
+    seconds = time.perf_counter() - start
+    if verbose:
+        if writerStats is not None:
+            print(writerStats.summary())
+        if exporter is not None:
+            print(exporter.summary())
+        print(cache.summary())
+    return {
+        "frames": props.frameCount,
+        "seconds": seconds,
+        "fps": props.frameCount / seconds if seconds > 0 else 0.0,
+        "cacheHits": sum(counts["hits"] for counts in cache.stats.values()),
+        "cacheMisses": sum(counts["misses"] for counts in cache.stats.values()),
+        "encodeFps": writerStats.encodeFps if writerStats is not None else 0.0,
+        "exportDir": outDir,
+    }
 
 
 def main() -> None:
     a = parseArgs()
-    frames = read_video(a.input_video)
-    playerTracker = PlayerTracker(PLAYER_DETECTOR_PATH)
-    ballTracker = BallTracker(BALL_DETECTOR_PATH)
-    kpDetector = CourtKeypointDetector(COURT_KEYPOINT_DETECTOR_PATH)
-    playerTracks = playerTracker.objectTracks(
-        frames,
-        readFromStub=True,
-        stubPath=os.path.join(a.stub_path, "player_track_stubs.pkl"),
-    )
-    ballTracks = ballTracker.objectTracks(
-        frames,
-        readFromStub=True,
-        stubPath=os.path.join(a.stub_path, "ball_track_stubs.pkl"),
-    )
-    kpPerFrame = kpDetector.getCourtKeypoints(
-        frames,
-        readFromStub=True,
-        stubPath=os.path.join(a.stub_path, "court_key_points_stub.pkl"),
-    )
-    ballTracks = ballTracker.removeWrongDetections(ballTracks)
-    ballTracks = ballTracker.interpolateBallPositions(ballTracks)
-    teamAssigner = TeamAssigner()
-    playerAssignment = teamAssigner.assignTeams(
-        frames,
-        playerTracks,
-        readFromStub=True,
-        stubPath=os.path.join(a.stub_path, "player_assignment_stub.pkl"),
-    )
-    baDetector = BallAquisitionDetector()
-    ballAquisition = baDetector.detectBallPossession(playerTracks, ballTracks)
-    piDetector = PassAndInterceptionDetector()
-    passes = piDetector.detectPasses(ballAquisition, playerAssignment)
-    interceptions = piDetector.detectInterceptions(ballAquisition, playerAssignment)
-    tvc = TacticalViewConverter("./images/basketball_court.png")
-    kpPerFrame = tvc.validateKeypoints(kpPerFrame)
-    tacticalPos = tvc.transformPlayers(kpPerFrame, playerTracks)
-    sdc = SpeedAndDistanceCalculator(
-        tvc.width,
-        tvc.height,
-        tvc.actualWidthM,
-        tvc.actualHeightM,
-    )
-    distances = sdc.calculate_distance(tacticalPos)
-    speeds = sdc.calculate_speed(distances)
-    pDrawer = PlayerTracksDrawer()
-    bDrawer = BallTracksDrawer()
-    kpDrawer = CourtKeypointDrawer()
-    tbDrawer = TeamBallControlDrawer()
-    fnDrawer = FrameNumberDrawer()
-    piDrawer = PassInterceptionDrawer()
-    tvDrawer = TacticalViewDrawer()
-    sdDrawer = SpeedAndDistanceDrawer()
-    outFrames: List[Any] = pDrawer.draw(frames, playerTracks, playerAssignment, ballAquisition)
-    outFrames = bDrawer.draw(outFrames, ballTracks)
-    outFrames = kpDrawer.draw(outFrames, kpPerFrame)
-    outFrames = fnDrawer.drawNumbers(outFrames)
-    outFrames = tbDrawer.draw(outFrames, playerAssignment, ballAquisition)
-    outFrames = piDrawer.draw(outFrames, passes, interceptions)
-    outFrames = sdDrawer.drawMetrics(outFrames, playerTracks, distances, speeds)
-    outFrames = tvDrawer.draw(
-        outFrames,
-        tvc.courtImagePath,
-        tvc.width,
-        tvc.height,
-        tvc.keyPoints,
-        tacticalPos,
-        playerAssignment,
-        ballAquisition,
-    )
-    save_video(outFrames, a.output_video)
+    PROFILER.enabled = a.profile is not None
+    if a.live:
+        with profile_span("live"):
+            runLive(a)
+    else:
+        processVideo(a)
+    if a.profile:
+        writeProfile(a.profile)
 
 
 if __name__ == "__main__":
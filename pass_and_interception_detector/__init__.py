@@ -1 +1,11 @@
-from .pass_and_interception_detector import PassAndInterceptionDetector
\ No newline at end of file
+from .pass_and_interception_detector import PassAndInterceptionDetector
+from .event_extractor import (
+    PossessionEvent,
+    PossessionEventExtractor,
+    EVENT_KINDS,
+    POSSESSION_START,
+    POSSESSION_END,
+    PASS,
+    INTERCEPTION,
+    TURNOVER,
+)
\ No newline at end of file
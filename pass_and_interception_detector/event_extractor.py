@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+AssignmentFrame = Dict[int, int]
+
+POSSESSION_START = "possession_start"
+POSSESSION_END = "possession_end"
+PASS = "pass"
+INTERCEPTION = "interception"
+TURNOVER = "turnover"
+EVENT_KINDS = (POSSESSION_START, POSSESSION_END, PASS, INTERCEPTION, TURNOVER)
+
+
+class PossessionEvent(NamedTuple):
+    """One typed possession event.
+
+    ``team`` is the team credited with the event: the passing team for a
+    pass, the intercepting team for an interception, the team losing the
+    ball for a turnover and the holder's team for possession start/end
+    (``-1`` when unknown). A possession start has only ``toPlayer`` and an
+    end only ``fromPlayer`` (the other is ``-1``).
+    """
+
+    kind: str
+    frame: int
+    fromPlayer: int
+    toPlayer: int
+    team: int
+
+
+class PossessionEventExtractor:
+    """Turn a per-frame ball holder sequence into typed events in one pass.
+
+    Consecutive frames with the same holder form a possession segment. When
+    a segment starts with a different holder than the last segment (frames
+    without a holder in between are skipped), the change is a pass if both
+    holders are on the same known team, else an interception for the new
+    team plus a turnover for the old one, matching
+    ``PassAndInterceptionDetector``. Use :meth:`extract` for a whole video
+    or :meth:`feed` frame by frame for live input.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[PossessionEvent] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.events = []
+        self._holder = -1  # holder of the open segment
+        self._lastFrame = -1  # last frame fed
+        self._lastTeam = -1  # team of the open segment's holder at ``_lastFrame``
+        self._prevHolder = -1  # holder of the last closed segment
+        self._prevTeam = -1  # its team at the segment's last frame
+
+    # ────────────────────────────────────────────────────────────────
+    # Incremental
+    # ────────────────────────────────────────────────────────────────
+    def feed(self, frameIdx: int, holder: int, teams: Optional[AssignmentFrame] = None) -> List[PossessionEvent]:
+        """Add one frame's holder (``-1`` for nobody); return the events it completes.
+
+        ``teams`` is that frame's ``{player_id: team}`` assignment.
+        """
+        new: List[PossessionEvent] = []
+        if holder != self._holder:
+            if self._holder != -1:
+                new.append(PossessionEvent(POSSESSION_END, self._lastFrame, self._holder, -1, self._lastTeam))
+                self._prevHolder, self._prevTeam = self._holder, self._lastTeam
+            if holder != -1:
+                team = (teams or {}).get(holder, -1)
+                new.extend(self._transition(frameIdx, holder, team))
+                new.append(PossessionEvent(POSSESSION_START, frameIdx, -1, holder, team))
+            self._holder = holder
+        if holder != -1:
+            self._lastTeam = (teams or {}).get(holder, -1)
+        self._lastFrame = frameIdx
+        self.events.extend(new)
+        return new
+
+    def finish(self) -> List[PossessionEvent]:
+        """Close the open possession segment, if any."""
+        if self._holder == -1:
+            return []
+        end = PossessionEvent(POSSESSION_END, self._lastFrame, self._holder, -1, self._lastTeam)
+        self._prevHolder, self._prevTeam = self._holder, self._lastTeam
+        self._holder = -1
+        self.events.append(end)
+        return [end]
+
+    def _transition(self, frameIdx: int, holder: int, team: int) -> List[PossessionEvent]:
+        prevHolder, prevTeam = self._prevHolder, self._prevTeam
+        if prevHolder == -1 or prevHolder == holder or prevTeam == -1:
+            return []
+        if prevTeam == team:
+            return [PossessionEvent(PASS, frameIdx, prevHolder, holder, team)]
+        if team == -1:
+            return []
+        return [
+            PossessionEvent(INTERCEPTION, frameIdx, prevHolder, holder, team),
+            PossessionEvent(TURNOVER, frameIdx, prevHolder, holder, prevTeam),
+        ]
+
+    # ────────────────────────────────────────────────────────────────
+    # Batch
+    # ────────────────────────────────────────────────────────────────
+    def extract(
+        self,
+        ballAcquisition: Sequence[int],
+        playerAssignment: Sequence[AssignmentFrame],
+    ) -> List[PossessionEvent]:
+        """Events of a whole video, visiting each run-length segment once."""
+        self.reset()
+        holders = np.asarray(ballAcquisition, dtype=np.int64).reshape(-1)
+        if holders.size == 0:
+            return []
+        starts = np.flatnonzero(np.concatenate(([True], holders[1:] != holders[:-1])))
+        ends = np.append(starts[1:] - 1, len(holders) - 1)
+        for start, end, holder in zip(starts.tolist(), ends.tolist(), holders[starts].tolist()):
+            if holder == -1:
+                self.feed(start, -1)
+                continue
+            self.feed(start, holder, playerAssignment[start])
+            if end != start:
+                self.feed(end, holder, playerAssignment[end])
+        self.finish()
+        return list(self.events)
+
+    @staticmethod
+    def dense(events: Iterable[PossessionEvent], kind: str, nFrames: int) -> np.ndarray:
+        """Per-frame team of ``kind`` events, ``-1`` on frames without one."""
+        out = np.full(nFrames, -1, dtype=np.int64)
+        for ev in events:
+            if ev.kind == kind and 0 <= ev.frame < nFrames:
+                out[ev.frame] = ev.team
+        return out
@@ -1,48 +1,40 @@
 from typing import Dict, List, Sequence
 
+from .event_extractor import INTERCEPTION, PASS, PossessionEvent, PossessionEventExtractor
+
 AssignmentFrame = Dict[int, int]
 
 
 class PassAndInterceptionDetector:
+    """Dense per-frame pass / interception lists on top of the event extractor.
+
+    :meth:`detectPasses` and :meth:`detectInterceptions` each extract the
+    events; to get both from one pass call :meth:`detectEvents` once and
+    use ``extractor.dense(events, PASS / INTERCEPTION, nFrames)``.
+    """
+
     def __init__(self) -> None:
-        pass
+        self.extractor = PossessionEventExtractor()
+
+    def detectEvents(
+        self,
+        ballAcquisition: Sequence[int],
+        playerAssignment: Sequence[AssignmentFrame],
+    ) -> List[PossessionEvent]:
+        return self.extractor.extract(ballAcquisition, playerAssignment)
 
     def detectPasses(
         self,
         ballAcquisition: Sequence[int],
         playerAssignment: Sequence[AssignmentFrame],
     ) -> List[int]:
-        passes = [-1] * len(ballAcquisition)
-        prevHolder = -1
-        prevFrame = -1
-        for idx in range(1, len(ballAcquisition)):
-            if ballAcquisition[idx - 1] != -1:
-                prevHolder = ballAcquisition[idx - 1]
-                prevFrame = idx - 1
-            currHolder = ballAcquisition[idx]
-            if prevHolder != -1 and currHolder != -1 and prevHolder != currHolder:
-                prevTeam = playerAssignment[prevFrame].get(prevHolder, -1)
-                currTeam = playerAssignment[idx].get(currHolder, -1)
-                if prevTeam == currTeam and prevTeam != -1:
-                    passes[idx] = prevTeam
-        return passes
+        events = self.detectEvents(ballAcquisition, playerAssignment)
+        return self.extractor.dense(events, PASS, len(ballAcquisition)).tolist()
 
     def detectInterceptions(
         self,
         ballAcquisition: Sequence[int],
         playerAssignment: Sequence[AssignmentFrame],
     ) -> List[int]:
-        interceptions = [-1] * len(ballAcquisition)
-        prevHolder = -1
-        prevFrame = -1
-        for idx in range(1, len(ballAcquisition)):
-            if ballAcquisition[idx - 1] != -1:
-                prevHolder = ballAcquisition[idx - 1]
-                prevFrame = idx - 1
-            currHolder = ballAcquisition[idx]
-            if prevHolder != -1 and currHolder != -1 and prevHolder != currHolder:
-                prevTeam = playerAssignment[prevFrame].get(prevHolder, -1)
-                currTeam = playerAssignment[idx].get(currHolder, -1)
-                if prevTeam != currTeam and prevTeam != -1 and currTeam != -1:
-                    interceptions[idx] = currTeam
-        return interceptions
+        events = self.detectEvents(ballAcquisition, playerAssignment)
+        return self.extractor.dense(events, INTERCEPTION, len(ballAcquisition)).tolist()
@@ -1 +1 @@
-from .speed_and_distance_calculator import SpeedAndDistanceCalculator
\ No newline at end of file
+from .speed_and_distance_calculator import SpeedAndDistanceCalculator, PlayerTrackArrays
\ No newline at end of file
@@ -1,13 +1,56 @@
 from __future__ import annotations
 
-import os
-import sys
-import pathlib
-from typing import List, Dict, Tuple
+from collections import deque
+from typing import Deque, List, Dict, NamedTuple, Optional, Sequence, Tuple
 
-folder_path = pathlib.Path(__file__).parent.resolve()
-sys.path.append(os.path.join(folder_path, "../"))
-from utils import measure_distance  # type: ignore
+import numpy as np
+
+
+class PlayerTrackArrays(NamedTuple):
+    """Per-player samples as contiguous arrays sorted by (player_id, frame).
+
+    ``order`` maps each sorted row back to its position in the row-major
+    (frame, then dict order) flattening of the source per-frame dicts.
+    """
+
+    player_ids: np.ndarray
+    frames: np.ndarray
+    values: np.ndarray
+    order: np.ndarray
+
+    @classmethod
+    def from_frame_dicts(cls, frame_dicts: Sequence[Dict[int, object]], width: int = 1) -> "PlayerTrackArrays":
+        counts = [len(d) for d in frame_dicts]
+        frames = np.repeat(np.arange(len(frame_dicts), dtype=np.int64), counts)
+        player_ids = np.fromiter((pid for d in frame_dicts for pid in d), dtype=np.int64, count=len(frames))
+        values = np.array([v for d in frame_dicts for v in d.values()], dtype=np.float64).reshape(len(frames), width)
+        order = np.lexsort((frames, player_ids))
+        return cls(player_ids[order], frames[order], values[order], order)
+
+    @classmethod
+    def from_rows(cls, frames: np.ndarray, player_ids: np.ndarray, values: np.ndarray) -> "PlayerTrackArrays":
+        """From frame-major rows (e.g. :class:`TacticalPositions` columns), whose order ``order`` refers to."""
+        frames = np.asarray(frames, dtype=np.int64)
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+        order = np.lexsort((frames, player_ids))
+        return cls(player_ids[order], frames[order], values[order], order)
+
+    def to_frame_dicts(self, row_values: np.ndarray, valid: np.ndarray, n_frames: int) -> List[Dict[int, float]]:
+        out_values = np.empty(len(row_values), dtype=np.float64)
+        out_values[self.order] = row_values
+        out_valid = np.empty(len(valid), dtype=bool)
+        out_valid[self.order] = valid
+        out_pids = np.empty(len(self.player_ids), dtype=np.int64)
+        out_pids[self.order] = self.player_ids
+        out_frames = np.empty(len(self.frames), dtype=np.int64)
+        out_frames[self.order] = self.frames
+        output: List[Dict[int, float]] = [{} for _ in range(n_frames)]
+        for frame, pid, value in zip(
+            out_frames[out_valid].tolist(), out_pids[out_valid].tolist(), out_values[out_valid].tolist()
+        ):
+            output[frame][pid] = value
+        return output
 
 
 class SpeedAndDistanceCalculator:
@@ -17,64 +60,145 @@ class SpeedAndDistanceCalculator:
         height_in_pixels: int,
         width_in_meters: float,
         height_in_meters: float,
+        fps: float,
+        speed_window: int = 15,
+        min_speed_frames: int = 5,
     ) -> None:
         self.width_in_pixels = width_in_pixels
         self.height_in_pixels = height_in_pixels
         self.width_in_meters = width_in_meters
         self.height_in_meters = height_in_meters
+        self.fps = fps
+        self.speed_window = speed_window
+        self.min_speed_frames = min_speed_frames
+        self.reset_online()
 
     def calculate_distance(self, tactical_player_positions: List[Dict[int, Tuple[float, float]]]):
-        previous_players_position: Dict[int, Tuple[float, float]] = {}
-        output_distances: List[Dict[int, float]] = []
-        for frame_positions in tactical_player_positions:
-            output_distances.append({})
-            for pid, curr_pos in frame_positions.items():
-                if pid in previous_players_position:
-                    prev_pos = previous_players_position[pid]
-                    meter_dist = self._meter_distance(prev_pos, curr_pos)
-                    output_distances[-1][pid] = meter_dist
-                previous_players_position[pid] = curr_pos
-        return output_distances
-
-    def _meter_distance(
+        """Per-frame metres moved; also accepts ``TacticalPositions`` rows."""
+        if hasattr(tactical_player_positions, "frameOffsets"):
+            tracks = PlayerTrackArrays.from_rows(
+                tactical_player_positions.frame - tactical_player_positions.startFrame,
+                tactical_player_positions.playerId,
+                tactical_player_positions.positions,
+            )
+        else:
+            tracks = PlayerTrackArrays.from_frame_dicts(tactical_player_positions, width=2)
+        distances, valid = self.distance_array(tracks)
+        return tracks.to_frame_dicts(distances, valid, len(tactical_player_positions))
+
+    def distance_array(self, tracks: PlayerTrackArrays) -> Tuple[np.ndarray, np.ndarray]:
+        """Metres moved since each player's previous sample, row-aligned with ``tracks``.
+
+        The first sample of every player has no previous position and is
+        flagged invalid in the returned mask.
+        """
+        mx = tracks.values[:, 0] * self.width_in_meters / self.width_in_pixels
+        my = tracks.values[:, 1] * self.height_in_meters / self.height_in_pixels
+        distances = np.zeros(len(mx), dtype=np.float64)
+        valid = np.zeros(len(mx), dtype=bool)
+        if len(mx) > 1:
+            valid[1:] = tracks.player_ids[1:] == tracks.player_ids[:-1]
+            dx = mx[1:] - mx[:-1]
+            dy = my[1:] - my[:-1]
+            distances[1:] = np.sqrt(dx ** 2 + dy ** 2) * 0.4
+        distances[~valid] = 0.0
+        return distances, valid
+
+    def reset_online(self) -> None:
+        """Clear the per-player state kept by :meth:`update_frame`."""
+        self._last_position: Dict[int, Tuple[float, float]] = {}
+        self._windows: Dict[int, Deque[Tuple[int, float]]] = {}
+        self.total_distance: Dict[int, float] = {}
+
+    def update_frame(
         self,
-        prev_pixel_pos: Tuple[float, float],
-        curr_pixel_pos: Tuple[float, float],
-    ) -> float:
-        px, py = prev_pixel_pos
-        cx, cy = curr_pixel_pos
-        prev_mx = px * self.width_in_meters / self.width_in_pixels
-        prev_my = py * self.height_in_meters / self.height_in_pixels
-        curr_mx = cx * self.width_in_meters / self.width_in_pixels
-        curr_my = cy * self.height_in_meters / self.height_in_pixels
-        meter_dist = measure_distance((curr_mx, curr_my), (prev_mx, prev_my))
-        return meter_dist * 0.4
+        frame_idx: int,
+        positions: Dict[int, Sequence[float]],
+    ) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """Online distance and speed for one frame of tactical positions.
+
+        Returns this frame's ``(distances, speeds)`` dicts and keeps the
+        running totals in :attr:`total_distance`. Frames must arrive in
+        order but may be skipped: the window still spans ``speed_window``
+        frame indices and, as in :meth:`speed_array`, its duration is the
+        number of counted steps at ``fps``. The values match
+        :meth:`calculate_distance` / :meth:`calculate_speed` exactly
+        (``benchmarks/bench_speed.py`` checks this).
+        """
+        distances: Dict[int, float] = {}
+        speeds: Dict[int, float] = {}
+        for pid, (x, y) in positions.items():
+            mx = x * self.width_in_meters / self.width_in_pixels
+            my = y * self.height_in_meters / self.height_in_pixels
+            prev = self._last_position.get(pid)
+            self._last_position[pid] = (mx, my)
+            if prev is None:
+                continue  # the first sample has no step, as in ``distance_array``
+            dx, dy = mx - prev[0], my - prev[1]
+            dist = float(np.sqrt(dx * dx + dy * dy) * 0.4)
+            distances[pid] = dist
+            self.total_distance[pid] = self.total_distance.get(pid, 0.0) + dist
+
+            window = self._windows.setdefault(pid, deque())
+            window.append((frame_idx, dist))
+            while window[0][0] < frame_idx - (self.speed_window - 1):
+                window.popleft()
+            present = len(window) - 1
+            if present >= self.min_speed_frames:
+                total = 0.0
+                for _, d in list(window)[1:]:
+                    total += d
+                hours = present / self.fps / 3600.0
+                speeds[pid] = (total / 1000.0) / hours
+            else:
+                speeds[pid] = 0.0
+        return distances, speeds
 
     def calculate_speed(
         self,
         distances: List[Dict[int, float]],
-        fps: float = 30,
+        fps: Optional[float] = None,
     ) -> List[Dict[int, float]]:
-        speeds: List[Dict[int, float]] = []
-        window = 5
-        for idx in range(len(distances)):
-            speeds.append({})
-            for pid in distances[idx].keys():
-                start = max(0, idx - (window * 3) + 1)
-                total_dist = 0.0
-                frames_present = 0
-                last_idx = None
-                for i in range(start, idx + 1):
-                    if pid in distances[i]:
-                        if last_idx is not None:
-                            total_dist += distances[i][pid]
-                            frames_present += 1
-                        last_idx = i
-                if frames_present >= window:
-                    time_sec = frames_present / fps
-                    hours = time_sec / 3600.0
-                    speed_kmh = (total_dist / 1000.0) / hours if hours > 0 else 0.0
-                    speeds[idx][pid] = speed_kmh
-                else:
-                    speeds[idx][pid] = 0.0
+        tracks = PlayerTrackArrays.from_frame_dicts(distances)
+        speeds = self.speed_array(tracks.player_ids, tracks.frames, tracks.values[:, 0], fps)
+        return tracks.to_frame_dicts(speeds, np.ones(len(speeds), dtype=bool), len(distances))
+
+    def speed_array(
+        self,
+        player_ids: np.ndarray,
+        frames: np.ndarray,
+        distances: np.ndarray,
+        fps: Optional[float] = None,
+    ) -> np.ndarray:
+        """Windowed km/h for per-step distances sorted by (player_id, frame).
+
+        For each sample the window covers the last ``speed_window`` frames;
+        the oldest sample in the window only anchors it and its distance is
+        not counted. The duration is the number of counted steps at ``fps``.
+        Fewer than ``min_speed_frames`` counted steps give 0.
+        """
+        fps = self.fps if fps is None else fps
+        n = len(distances)
+        if n == 0:
+            return np.zeros(0, dtype=np.float64)
+        window = self.speed_window
+        # Collapse (player, frame) into one sorted key so each player's window
+        # start is a single searchsorted over the whole array.
+        rank = np.zeros(n, dtype=np.int64)
+        np.cumsum(player_ids[1:] != player_ids[:-1], out=rank[1:])
+        stride = int(frames.max()) + window + 1
+        keys = rank * stride + frames
+        rows = np.arange(n)
+        first = np.searchsorted(keys, keys - (window - 1), side="left")
+        present = rows - first
+        # Sum the counted steps oldest-first, one shifted slice per window
+        # offset, so results match a sequential per-window loop exactly.
+        total = np.zeros(n, dtype=np.float64)
+        for k in range(1, window):
+            j = first + k
+            total += np.where(j <= rows, distances[np.minimum(j, rows)], 0.0)
+        speeds = np.zeros(n, dtype=np.float64)
+        moving = present >= self.min_speed_frames
+        hours = present[moving] / fps / 3600.0
+        speeds[moving] = (total[moving] / 1000.0) / hours
         return speeds
@@ -0,0 +1,3 @@
+from .tactical_view_converter import TacticalViewConverter
+from .tactical_positions import TacticalPositions
+from .homography import Homography, HomographyTracker, projectPoints
\ No newline at end of file
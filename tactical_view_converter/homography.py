@@ -1,6 +1,8 @@
+from __future__ import annotations
+
 import numpy as np
 import cv2
-from typing import Any
+from typing import Any, Tuple
 
 
 class Homography:
@@ -24,3 +26,137 @@ class Homography:
         pts_f = pts.reshape(-1, 1, 2).astype(np.float32)
         res = cv2.perspectiveTransform(pts_f, self.m)
         return res.reshape(-1, 2).astype(np.float32)
+
+
+def projectPoints(m: np.ndarray, pts: np.ndarray) -> np.ndarray:
+    """Batched ``cv2.perspectiveTransform``.
+
+    ``m`` is ``(..., 3, 3)`` and ``pts`` ``(..., P, 2)`` with matching
+    leading dimensions, so one call projects every player of every frame
+    with its own frame's matrix. The arithmetic mirrors OpenCV's (double
+    precision, reciprocal of ``w``, zero when ``|w|`` is below float
+    epsilon), so results are bit-identical to the per-point path.
+    """
+    m = np.asarray(m, dtype=np.float64)[..., None, :, :]  # broadcast over points
+    p = np.asarray(pts, dtype=np.float32).astype(np.float64)
+    x, y = p[..., 0], p[..., 1]
+    w = x * m[..., 2, 0] + y * m[..., 2, 1] + m[..., 2, 2]
+    ok = np.abs(w) > np.finfo(np.float32).eps
+    inv = np.divide(1.0, w, out=np.zeros_like(w), where=ok)
+    out = np.empty(p.shape, dtype=np.float32)
+    out[..., 0] = np.where(ok, (x * m[..., 0, 0] + y * m[..., 0, 1] + m[..., 0, 2]) * inv, 0.0)
+    out[..., 1] = np.where(ok, (x * m[..., 1, 0] + y * m[..., 1, 1] + m[..., 1, 2]) * inv, 0.0)
+    return out
+
+
+class HomographyTracker:
+    """Temporal homography estimate for a slowly moving broadcast camera.
+
+    A new matrix is estimated when the keypoints shared with the last
+    estimate have drifted by more than ``driftPx`` (median, image pixels),
+    fewer than ``minShared`` of them are still visible, or the current
+    keypoints reproject under the propagated matrix with a median error
+    above ``reprojPx`` court pixels; otherwise the previous matrix is
+    reused. Fresh estimates are blended into the running matrix with an
+    exponential moving average of weight ``smoothing`` (``1.0`` disables
+    smoothing) only while the keypoint set is unchanged, the last estimate
+    is at most ``resetGap`` frames old and both the previous and the
+    blended matrix fit the current keypoints within ``reprojPx``.
+    ``driftPx < 0`` re-estimates every frame.
+    """
+
+    NONE, RECOMPUTED, REUSED, FAILED = 0, 1, 2, 3
+
+    def __init__(
+        self,
+        target: np.ndarray,
+        *,
+        driftPx: float = 1.5,
+        smoothing: float = 0.5,
+        minShared: int = 4,
+        resetGap: int = 15,
+        reprojPx: float = 1.0,
+    ) -> None:
+        self.target = np.asarray(target, dtype=np.float32)
+        self.driftPx = driftPx
+        self.smoothing = smoothing
+        self.minShared = minShared
+        self.resetGap = resetGap
+        self.reprojPx = reprojPx
+        self.reset()
+
+    def reset(self) -> None:
+        self.m: np.ndarray | None = None
+        self._anchor: np.ndarray | None = None
+        self._anchorMask: np.ndarray | None = None
+        self._lastIdx = -(1 << 30)
+        self.counts = {"recomputed": 0, "reused": 0, "failed": 0, "missing": 0}
+
+    def _drifted(self, keypoints: np.ndarray, mask: np.ndarray) -> bool:
+        if self.m is None or self.driftPx < 0:
+            return True
+        shared = mask & self._anchorMask
+        if shared.sum() < self.minShared:
+            return True
+        d = keypoints[shared] - self._anchor[shared]
+        moved = sorted((d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]).tolist())
+        return moved[len(moved) // 2] > self.driftPx * self.driftPx
+
+    def _fits(self, m: np.ndarray, keypoints: np.ndarray, mask: np.ndarray) -> bool:
+        """Whether ``m`` maps every keypoint of the frame onto the court within ``reprojPx``."""
+        err = projectPoints(m, keypoints[mask]) - self.target[mask]
+        return float(np.hypot(err[:, 0], err[:, 1]).max()) <= self.reprojPx
+
+    def update(self, idx: int, keypoints: np.ndarray, mask: np.ndarray | None = None) -> int:
+        """Advance to frame ``idx`` with its ``(K, 2)`` keypoints; return the frame status.
+
+        After a ``RECOMPUTED`` or ``REUSED`` status :attr:`m` is the frame's matrix.
+        """
+        if mask is None:
+            mask = (keypoints[:, 0] > 0) & (keypoints[:, 1] > 0)
+        if mask.sum() < 4:
+            self.counts["missing"] += 1
+            return self.NONE
+        if not self._drifted(keypoints, mask) and self._fits(self.m, keypoints, mask):
+            self._lastIdx = idx
+            self.counts["reused"] += 1
+            return self.REUSED
+        previous = self.m
+        try:
+            fresh = Homography(keypoints[mask], self.target[mask]).m
+        except Exception:
+            self.counts["failed"] += 1
+            return self.FAILED
+        self.m = fresh
+        if (
+            previous is not None
+            and self.smoothing < 1.0
+            and idx - self._lastIdx <= self.resetGap
+            and np.array_equal(mask, self._anchorMask)
+            and self._fits(previous, keypoints, mask)
+        ):
+            blended = self.smoothing * fresh / fresh[2, 2] + (1.0 - self.smoothing) * previous / previous[2, 2]
+            blended /= blended[2, 2]
+            if self._fits(blended, keypoints, mask):
+                self.m = blended
+        self._anchor, self._anchorMask = keypoints.copy(), mask
+        self._lastIdx = idx
+        self.counts["recomputed"] += 1
+        return self.RECOMPUTED
+
+    def track(self, keypoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run over a ``(frames, K, 2)`` array.
+
+        Returns ``(matrices, hasMatrix, status)``: ``(frames, 3, 3)``
+        matrices, the mask of frames that have one and the per-frame status
+        codes (``NONE``/``RECOMPUTED``/``REUSED``/``FAILED``).
+        """
+        mats = np.zeros((len(keypoints), 3, 3), dtype=np.float64)
+        status = np.zeros(len(keypoints), dtype=np.int8)
+        detected = (keypoints[..., 0] > 0) & (keypoints[..., 1] > 0)
+        for idx in range(len(keypoints)):
+            status[idx] = self.update(idx, keypoints[idx], detected[idx])
+            if status[idx] in (self.RECOMPUTED, self.REUSED):
+                mats[idx] = self.m
+        hasH = (status == self.RECOMPUTED) | (status == self.REUSED)
+        return mats, hasH, status
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Union, overload
+
+import numpy as np
+
+PositionsFrame = Dict[int, List[float]]
+
+
+class TacticalPositions(Sequence[PositionsFrame]):
+    """Tactical-view player positions of a video as frame-sorted rows.
+
+    Only projected, in-court samples are stored: ``frame`` (absolute frame
+    numbers), ``playerId`` and ``positions`` (``(rows, 2)`` float32), sorted
+    by frame and then player id, plus a per-frame offset index like
+    :class:`TrackStore`, so memory grows with detections rather than with
+    frames x every track id ever seen. Indexing yields the legacy
+    ``{player_id: [x, y]}`` dict for one frame and slicing a window over
+    views of the same rows.
+    """
+
+    def __init__(
+        self,
+        frame: np.ndarray,
+        playerId: np.ndarray,
+        positions: np.ndarray,
+        *,
+        nFrames: int,
+        startFrame: int = 0,
+    ) -> None:
+        frame = np.asarray(frame, dtype=np.int32)
+        playerId = np.asarray(playerId, dtype=np.int32)
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        order = np.lexsort((playerId, frame))
+        self.frame = np.ascontiguousarray(frame[order])
+        self.playerId = np.ascontiguousarray(playerId[order])
+        self.positions = np.ascontiguousarray(positions[order])
+        self.startFrame = startFrame
+        self.frameOffsets = np.searchsorted(self.frame, np.arange(startFrame, startFrame + nFrames + 1))
+
+    def __len__(self) -> int:
+        return len(self.frameOffsets) - 1
+
+    def frameRows(self, idx: int) -> slice:
+        """Rows of frame ``idx`` (relative to :attr:`startFrame`)."""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("tactical frame index out of range")
+        return slice(int(self.frameOffsets[idx]), int(self.frameOffsets[idx + 1]))
+
+    @overload
+    def __getitem__(self, idx: int) -> PositionsFrame: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> "TacticalPositions": ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                raise ValueError("TacticalPositions slices must be contiguous")
+            return self._window(start, max(start, stop))
+        rows = self.frameRows(idx)
+        return dict(zip(self.playerId[rows].tolist(), self.positions[rows].tolist()))
+
+    def _window(self, start: int, stop: int) -> "TacticalPositions":
+        lo, hi = int(self.frameOffsets[start]), int(self.frameOffsets[stop])
+        out = TacticalPositions.__new__(TacticalPositions)
+        out.frame = self.frame[lo:hi]
+        out.playerId = self.playerId[lo:hi]
+        out.positions = self.positions[lo:hi]
+        out.startFrame = self.startFrame + start
+        out.frameOffsets = self.frameOffsets[start : stop + 1] - lo
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in (self.frame, self.playerId, self.positions, self.frameOffsets))
+
+    def toFrameDicts(self, order: Optional[Sequence[Dict[int, object]]] = None) -> List[PositionsFrame]:
+        """Per-frame dicts; keys follow ``order``'s per-frame key order if given."""
+        if order is None:
+            return [self[idx] for idx in range(len(self))]
+        out: List[PositionsFrame] = []
+        for idx, keys in enumerate(order):
+            frame = self[idx]
+            out.append({pid: frame[pid] for pid in keys if pid in frame})
+        return out
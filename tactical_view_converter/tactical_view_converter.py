@@ -1,17 +1,17 @@
 import os
 import sys
-from copy import deepcopy
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
-from .homography import Homography
+from .homography import HomographyTracker, projectPoints
+from .tactical_positions import TacticalPositions
 
 folder = Path(__file__).parent.resolve()
 sys.path.append(os.path.join(folder, "../"))
-from utils import get_foot_position, measure_distance  # type: ignore
+from track_store import KeypointFrames, TrackStore, keypointsToArray  # type: ignore
 
 BBox = Tuple[int, int, int, int]
 TrackFrame = Dict[int, Dict[str, BBox]]
@@ -19,8 +19,33 @@ KeypointsFrame = Any  # whatever Ultralytics keypoints structure is
 
 
 class TacticalViewConverter:
-    def __init__(self, courtImagePath: str | Path) -> None:
+    """Project player foot positions onto the tactical court image.
+
+    Image-to-court homographies come from a :class:`HomographyTracker`:
+    they are re-estimated when the court keypoints drift by more than
+    ``homographyDriftPx`` or no longer reproject within
+    ``homographyReprojPx`` court pixels, and smoothed over time with weight
+    ``homographySmoothing`` (``-1`` / ``1.0`` give the old per-frame
+    estimate). Per-frame outcomes are kept in :attr:`homographyStatus`.
+    """
+
+    def __init__(
+        self,
+        courtImagePath: str | Path,
+        *,
+        homographyDriftPx: float = 1.5,
+        homographySmoothing: float = 0.5,
+        homographyReprojPx: float = 1.0,
+        projectBlock: int = 4096,
+    ) -> None:
         self.courtImagePath = str(courtImagePath)
+        self.homographyDriftPx = homographyDriftPx
+        self.homographySmoothing = homographySmoothing
+        self.homographyReprojPx = homographyReprojPx
+        self.projectBlock = projectBlock
+        self.homographyStats: Dict[str, int] = {}
+        self.homographyStatus = np.zeros(0, dtype=np.int8)
+        self.liveTracker: Optional[HomographyTracker] = None
         self.width, self.height = 300, 161
         self.actualWidthM, self.actualHeightM = 28.0, 15.0
         h, w = self.height, self.width
@@ -46,55 +71,205 @@ class TacticalViewConverter:
             (int((aw - 5.79) / aw * w), int(10 / ah * h)),
         ]
 
-    def validateKeypoints(self, frames: Sequence[KeypointsFrame]):
-        kpList = deepcopy(frames)
-        for idx, fkp in enumerate(kpList):
-            kps = fkp.xy.tolist()[0]
-            detected = [i for i, p in enumerate(kps) if p[0] > 0 and p[1] > 0]
-            if len(detected) < 3:
-                continue
-            invalid: List[int] = []
-            for i in detected:
-                others = [j for j in detected if j != i and j not in invalid]
-                if len(others) < 2:
-                    continue
-                j, k = others[:2]
-                dij = measure_distance(kps[i], kps[j])
-                dik = measure_distance(kps[i], kps[k])
-                tij = measure_distance(self.keyPoints[i], self.keyPoints[j])
-                tik = measure_distance(self.keyPoints[i], self.keyPoints[k])
-                if tik == 0 or dik == 0 or tij == 0:
+    def validateKeypoints(
+        self,
+        frames: Sequence[KeypointsFrame] | np.ndarray,
+        *,
+        method: str = "ratio",
+        ransacThresholdPx: float = 5.0,
+    ) -> KeypointFrames:
+        """Zero out court keypoints inconsistent with the reference court layout.
+
+        Returns a :class:`KeypointFrames` over one ``(frames, 18, 2)`` array;
+        the input objects are not copied or modified. See
+        :meth:`keypointOutlierMask` for the tests.
+        """
+        xy = self._keypointArray(frames)
+        outliers = self.keypointOutlierMask(xy, method=method, ransacThresholdPx=ransacThresholdPx)
+        validated = np.where(outliers[..., None], np.float32(0), xy)
+        return KeypointFrames(validated, self._imageSize(frames))
+
+    def keypointOutlierMask(
+        self,
+        keypoints: np.ndarray,
+        *,
+        method: str = "ratio",
+        ransacThresholdPx: float = 5.0,
+    ) -> np.ndarray:
+        """``(frames, 18)`` mask of detected keypoints judged to be outliers.
+
+        ``"ratio"`` compares, for each keypoint ``i``, the distance ratio to
+        the first two other still-valid keypoints against the same ratio on
+        the reference court (error above 0.8 rejects ``i``). Keypoints are
+        visited in index order for all frames at once, so the result matches
+        the sequential per-frame test exactly.
+
+        ``"ransac"`` fits a RANSAC homography per frame and rejects keypoints
+        projecting more than ``ransacThresholdPx`` court pixels away; frames
+        with fewer than four keypoints fall back to the ratio test.
+        """
+        if method not in ("ratio", "ransac"):
+            raise ValueError(f"Unknown keypoint validation method {method!r}, expected 'ratio' or 'ransac'.")
+        kp = np.asarray(keypoints, dtype=np.float32)
+        detected = (kp[..., 0] > 0) & (kp[..., 1] > 0)
+        invalid = self._ratioOutliers(kp.astype(np.float64), detected)
+        if method == "ransac":
+            target = np.array(self.keyPoints, dtype=np.float32)
+            for idx in np.flatnonzero(detected.sum(axis=1) >= 4).tolist():
+                mask = detected[idx]
+                _, inliers = cv2.findHomography(kp[idx][mask], target[mask], cv2.RANSAC, ransacThresholdPx)
+                if inliers is None:
                     continue
-                err = abs(dij / dik - tij / tik)
-                if err > 0.8:
-                    fkp.xy[0][i] *= 0
-                    fkp.xyn[0][i] *= 0
-                    invalid.append(i)
-        return kpList
+                row = np.zeros(len(mask), dtype=bool)
+                row[np.flatnonzero(mask)] = inliers.ravel() == 0
+                invalid[idx] = row
+        return invalid
+
+    def _ratioOutliers(self, kp: np.ndarray, detected: np.ndarray) -> np.ndarray:
+        ref = np.array(self.keyPoints, dtype=np.float64)
+        refDist = ((ref[:, None, 0] - ref[None, :, 0]) ** 2 + (ref[:, None, 1] - ref[None, :, 1]) ** 2) ** 0.5
+        nFrames, nPoints = detected.shape
+        invalid = np.zeros_like(detected)
+        for i in range(nPoints):
+            # Candidates are detected, not yet rejected, and not ``i`` itself.
+            cand = detected & ~invalid
+            cand[:, i] = False
+            rows = np.flatnonzero(detected[:, i] & (cand.sum(axis=1) >= 2))
+            if rows.size == 0:
+                continue
+            cand = cand[rows]
+            j = cand.argmax(axis=1)
+            cand[np.arange(len(rows)), j] = False
+            k = cand.argmax(axis=1)
+            pi, pj, pk = kp[rows, i], kp[rows, j], kp[rows, k]
+            dij = ((pi[:, 0] - pj[:, 0]) ** 2 + (pi[:, 1] - pj[:, 1]) ** 2) ** 0.5
+            dik = ((pi[:, 0] - pk[:, 0]) ** 2 + (pi[:, 1] - pk[:, 1]) ** 2) ** 0.5
+            tij, tik = refDist[i, j], refDist[i, k]
+            usable = (tik != 0) & (dik != 0) & (tij != 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                err = np.abs(dij / dik - tij / tik)
+            invalid[rows[usable & (err > 0.8)], i] = True
+        return invalid
 
     def transformPlayers(
         self,
         keypoints: Sequence[KeypointsFrame],
         tracks: Sequence[TrackFrame],
     ) -> List[Dict[int, List[float]]]:
-        out: List[Dict[int, List[float]]] = []
-        for fkp, tr in zip(keypoints, tracks):
-            tact: Dict[int, List[float]] = {}
-            kps = fkp.xy.tolist()[0]
-            valid = [i for i, p in enumerate(kps) if p[0] > 0 and p[1] > 0]
-            if len(valid) < 4:
-                out.append(tact)
-                continue
-            src = np.array([kps[i] for i in valid], dtype=np.float32)
-            tgt = np.array([self.keyPoints[i] for i in valid], dtype=np.float32)
-            try:
-                H = Homography(src, tgt)
-                for pid, data in tr.items():
-                    foot = np.array([get_foot_position(data["bbox"])], dtype=np.float32)
-                    tp = H.transformPoints(foot)[0]
-                    if 0 <= tp[0] <= self.width and 0 <= tp[1] <= self.height:
-                        tact[pid] = tp.tolist()
-            except Exception:
-                pass
-            out.append(tact)
-        return out
+        """Per-frame ``{player_id: [x, y]}`` dicts, keyed in each frame's track order."""
+        n = min(len(keypoints), len(tracks))
+        return self.transformPlayersArray(keypoints[:n], tracks[:n]).toFrameDicts(order=tracks[:n])
+
+    def transformPlayersArray(
+        self,
+        keypoints: Sequence[KeypointsFrame] | np.ndarray,
+        tracks: Sequence[TrackFrame] | np.ndarray,
+    ) -> TacticalPositions:
+        """Project every player of every frame in one batched pass.
+
+        ``keypoints`` may be Ultralytics keypoints, a :class:`KeypointFrames`
+        or a ``(frames, 18, 2)`` array; ``tracks`` per-frame dicts or
+        columnar track rows. Positions are truncated to whole pixels first,
+        like :func:`get_foot_position`. Only players projected inside the
+        court are kept.
+        """
+        kp = self._keypointArray(keypoints)
+        frames, playerIds, feet = self._footRows(tracks, len(kp))
+        mats, hasH = self.frameHomographies(kp)
+        keep = np.zeros(len(frames), dtype=bool)
+        positions = np.zeros(feet.shape, dtype=np.float32)
+        for start in range(0, len(frames), self.projectBlock):
+            block = slice(start, start + self.projectBlock)
+            pos = projectPoints(mats[frames[block]], feet[block, None])[:, 0]
+            x, y = pos[:, 0], pos[:, 1]
+            inside = (0 <= x) & (x <= self.width) & (0 <= y) & (y <= self.height)
+            positions[block] = pos
+            keep[block] = hasH[frames[block]] & inside
+        return TacticalPositions(frames[keep], playerIds[keep], positions[keep], nFrames=len(kp))
+
+    def transformPlayersFrame(
+        self,
+        idx: int,
+        keypoints: np.ndarray,
+        tracks: TrackFrame,
+    ) -> Dict[int, List[float]]:
+        """Online :meth:`transformPlayersArray` for frame ``idx`` of a live stream.
+
+        ``keypoints`` is the frame's validated ``(18, 2)`` array. The
+        homography tracker persists in :attr:`liveTracker` between calls
+        (``None`` it to start a new stream); returns ``{player_id: [x, y]}``
+        for players projected inside the court.
+        """
+        if self.liveTracker is None:
+            self.liveTracker = self._newHomographyTracker()
+        kp = np.asarray(keypoints, dtype=np.float32).reshape(-1, 2)
+        status = self.liveTracker.update(idx, kp)
+        if status not in (HomographyTracker.RECOMPUTED, HomographyTracker.REUSED) or not tracks:
+            return {}
+        _, playerIds, feet = self._footRows([tracks], 1)
+        pos = projectPoints(self.liveTracker.m, feet)
+        x, y = pos[:, 0], pos[:, 1]
+        inside = (0 <= x) & (x <= self.width) & (0 <= y) & (y <= self.height)
+        return dict(zip(playerIds[inside].tolist(), pos[inside].tolist()))
+
+    def _newHomographyTracker(self) -> HomographyTracker:
+        return HomographyTracker(
+            np.array(self.keyPoints, dtype=np.float32),
+            driftPx=self.homographyDriftPx,
+            smoothing=self.homographySmoothing,
+            reprojPx=self.homographyReprojPx,
+        )
+
+    def frameHomographies(self, keypoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``(frames, 3, 3)`` image-to-court matrices and the mask of frames that have one."""
+        tracker = self._newHomographyTracker()
+        mats, hasH, self.homographyStatus = tracker.track(keypoints)
+        self.homographyStats = dict(tracker.counts)
+        return mats, hasH
+
+    @staticmethod
+    def _imageSize(frames: Sequence[KeypointsFrame] | np.ndarray) -> Optional[Tuple[int, int]]:
+        """``(width, height)`` of the source frames: a :class:`KeypointFrames`' size or Ultralytics' ``orig_shape``."""
+        if isinstance(frames, KeypointFrames):
+            return frames.imageSize
+        if isinstance(frames, np.ndarray):
+            return None
+        for kp in frames:
+            shape = getattr(kp, "orig_shape", None)
+            if shape is not None:
+                return int(shape[1]), int(shape[0])
+        return None
+
+    @staticmethod
+    def _keypointArray(keypoints: Sequence[KeypointsFrame] | np.ndarray) -> np.ndarray:
+        if isinstance(keypoints, KeypointFrames):
+            return np.asarray(keypoints.xy, dtype=np.float32)
+        if isinstance(keypoints, np.ndarray):
+            return keypoints.astype(np.float32, copy=False)
+        return keypointsToArray(keypoints)
+
+    @staticmethod
+    def _footRows(
+        tracks: Sequence[TrackFrame] | TrackStore | np.ndarray, nFrames: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Frame, player id and ``(rows, 2)`` foot point of every detection, sorted by frame then id."""
+        if isinstance(tracks, TrackStore):
+            frames = tracks.frame.astype(np.int64) - tracks.startFrame
+            pids = tracks.trackId.astype(np.int64)
+            boxes = tracks.boxes.astype(np.float64)
+        elif isinstance(tracks, np.ndarray):
+            frames = tracks["frame"].astype(np.int64)
+            pids = tracks["track_id"].astype(np.int64)
+            boxes = np.stack([tracks[c] for c in ("x1", "y1", "x2", "y2")], axis=1).astype(np.float64)
+        else:
+            counts = [len(t) for t in tracks]
+            frames = np.repeat(np.arange(len(tracks), dtype=np.int64), counts)
+            pids = np.fromiter((pid for t in tracks for pid in t), dtype=np.int64, count=len(frames))
+            boxes = np.array([d["bbox"] for t in tracks for d in t.values()], dtype=np.float64).reshape(-1, 4)
+        keep = frames < nFrames
+        order = np.lexsort((pids[keep], frames[keep]))
+        frames, pids, boxes = frames[keep][order], pids[keep][order], boxes[keep][order]
+        feet = np.empty((len(frames), 2), dtype=np.float32)
+        feet[:, 0] = np.trunc((boxes[:, 0] + boxes[:, 2]) / 2)
+        feet[:, 1] = np.trunc(boxes[:, 3])
+        return frames, pids, feet
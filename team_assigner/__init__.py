@@ -1 +1 @@
-from .team_assigner import TeamAssigner
\ No newline at end of file
+from .team_assigner import TeamAssigner, TeamBackend, TEAM_BACKENDS
\ No newline at end of file
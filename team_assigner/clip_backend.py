@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+
+
+class ClipTeamBackend:
+    """Zero-shot jersey classification with fashion-CLIP text prompts.
+
+    torch and transformers are imported on the first :meth:`classify`, so
+    building the backend (e.g. to compute a cache key) stays cheap.
+    """
+
+    needsFit = False
+
+    def __init__(
+        self,
+        team1Class: str = "white shirt",
+        team2Class: str = "dark blue shirt",
+        *,
+        batchSize: int = 32,
+        modelName: str = "patrickjohncyh/fashion-clip",
+    ) -> None:
+        self.team1Class = team1Class
+        self.team2Class = team2Class
+        self.batchSize = batchSize
+        self.modelName = modelName
+        self.model: CLIPModel | None = None
+        self.processor: CLIPProcessor | None = None
+        self._textEmbeds: torch.Tensor | None = None
+
+    def _loadModel(self) -> None:
+        import torch
+        from transformers import CLIPModel, CLIPProcessor
+
+        if self.model is None or self.processor is None:
+            self.model = CLIPModel.from_pretrained(self.modelName)
+            self.processor = CLIPProcessor.from_pretrained(self.modelName)
+            self.model.eval()
+        if self._textEmbeds is None:
+            classes = [self.team1Class, self.team2Class]
+            with torch.no_grad():
+                inp = self.processor(text=classes, return_tensors="pt", padding=True)
+                emb = self.model.get_text_features(**inp)
+            self._textEmbeds = emb / emb.norm(dim=-1, keepdim=True)
+
+    def cacheParams(self) -> Dict[str, Any]:
+        """Settings that change the teams it assigns (part of the stage cache key)."""
+        return {"classes": [self.team1Class, self.team2Class], "modelName": self.modelName}
+
+    def fit(self, crops: Sequence[np.ndarray]) -> None:
+        pass
+
+    def classify(self, crops: Sequence[np.ndarray]) -> List[int]:
+        """Return team 1/2 for every RGB crop, batching the CLIP image encoder."""
+        import torch
+        from PIL import Image
+
+        self._loadModel()
+        teams: List[int] = []
+        with torch.no_grad():
+            for i in range(0, len(crops), self.batchSize):
+                images = [Image.fromarray(c) for c in crops[i : i + self.batchSize]]
+                inp = self.processor(images=images, return_tensors="pt")
+                emb = self.model.get_image_features(**inp)
+                emb = emb / emb.norm(dim=-1, keepdim=True)
+                best = (emb @ self._textEmbeds.T).argmax(dim=1)
+                teams.extend(int(b) + 1 for b in best)
+        return teams
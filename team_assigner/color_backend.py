@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import cv2
+import numpy as np
+
+COLOR_SPACES = {
+    "hsv": (cv2.COLOR_RGB2HSV, [0, 180, 0, 256, 0, 256]),
+    "lab": (cv2.COLOR_RGB2LAB, [0, 256, 0, 256, 0, 256]),
+}
+
+
+class ColorTeamBackend:
+    """Jersey-colour clustering: torso histograms + 2-means, nearest centroid.
+
+    ``fit`` clusters torso colour histograms into two groups; the cluster
+    with the brighter torsos is labelled ``brighterTeam``. No model weights
+    are needed and classification is a handful of NumPy operations per crop.
+    """
+
+    needsFit = True
+
+    def __init__(
+        self,
+        *,
+        colorSpace: str = "hsv",
+        bins: Sequence[int] = (8, 4, 4),
+        brighterTeam: int = 1,
+        iterations: int = 20,
+    ) -> None:
+        if colorSpace not in COLOR_SPACES:
+            raise ValueError(f"Unknown colour space {colorSpace!r}, expected one of {sorted(COLOR_SPACES)}.")
+        self.colorSpace = colorSpace
+        self.bins = list(bins)
+        self.brighterTeam = brighterTeam
+        self.iterations = iterations
+        self.centroids: np.ndarray | None = None
+        self.clusterTeams = np.array([1, 2])
+
+    def cacheParams(self) -> Dict[str, Any]:
+        """Settings that change the teams it assigns (part of the stage cache key)."""
+        return {
+            "colorSpace": self.colorSpace,
+            "bins": self.bins,
+            "brighterTeam": self.brighterTeam,
+            "iterations": self.iterations,
+        }
+
+    @staticmethod
+    def _torso(crop: np.ndarray) -> np.ndarray:
+        h, w = crop.shape[:2]
+        torso = crop[int(h * 0.15) : int(h * 0.5), int(w * 0.25) : int(w * 0.75)]
+        return torso if torso.size else crop
+
+    def features(self, crops: Sequence[np.ndarray]) -> np.ndarray:
+        code, ranges = COLOR_SPACES[self.colorSpace]
+        feats = np.empty((len(crops), int(np.prod(self.bins))), dtype=np.float32)
+        for i, crop in enumerate(crops):
+            conv = cv2.cvtColor(np.ascontiguousarray(self._torso(crop)), code)
+            hist = cv2.calcHist([conv], [0, 1, 2], None, self.bins, ranges).ravel()
+            feats[i] = hist / max(hist.sum(), 1.0)
+        return feats
+
+    @staticmethod
+    def _brightness(crops: Sequence[np.ndarray]) -> np.ndarray:
+        return np.array([ColorTeamBackend._torso(c).mean() for c in crops], dtype=np.float32)
+
+    def fit(self, crops: Sequence[np.ndarray]) -> None:
+        if len(crops) < 2:
+            return
+        feats = self.features(crops)
+        brightness = self._brightness(crops)
+        # Deterministic init: darkest torso, then the sample farthest from it.
+        c0 = feats[int(brightness.argmin())]
+        c1 = feats[int(((feats - c0) ** 2).sum(axis=1).argmax())]
+        centroids = np.stack([c0, c1])
+        labels = np.zeros(len(feats), dtype=np.int64)
+        for _ in range(self.iterations):
+            labels = self._nearest(feats, centroids)
+            updated = np.stack(
+                [feats[labels == k].mean(axis=0) if (labels == k).any() else centroids[k] for k in range(2)]
+            )
+            if np.allclose(updated, centroids):
+                break
+            centroids = updated
+        self.centroids = centroids
+        meanBrightness = [brightness[labels == k].mean() if (labels == k).any() else -1.0 for k in range(2)]
+        other = 2 if self.brighterTeam == 1 else 1
+        brighter = int(np.argmax(meanBrightness))
+        self.clusterTeams = np.array([other, other])
+        self.clusterTeams[brighter] = self.brighterTeam
+
+    @staticmethod
+    def _nearest(feats: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        return ((feats[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+
+    def classify(self, crops: Sequence[np.ndarray]) -> List[int]:
+        if not len(crops):
+            return []
+        if self.centroids is None:
+            self.fit(crops)
+        if self.centroids is None:
+            return [self.brighterTeam] * len(crops)
+        return self.clusterTeams[self._nearest(self.features(crops), self.centroids)].tolist()
@@ -1,49 +1,185 @@
 from __future__ import annotations
 
+import inspect
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Optional, Protocol, Sequence
 
 import cv2
-from PIL import Image
-from transformers import CLIPModel, CLIPProcessor
+import numpy as np
 
 folder = Path(__file__).parent.resolve()
 sys.path.append(os.path.join(folder, "../"))
-from utils import read_stub, save_stub  # type: ignore
+from utils import read_stub, save_stub, StageCache  # type: ignore
+
+TEAM_BACKENDS = ("clip", "color")
+
+
+class TeamBackend(Protocol):
+    """What :class:`TeamAssigner` needs from a backend.
+
+    A backend may also define ``cacheParams() -> dict`` with the settings
+    that change its output; they become part of the stage cache key.
+    """
+
+    needsFit: bool
+
+    def fit(self, crops: Sequence[np.ndarray]) -> None: ...
+
+    def classify(self, crops: Sequence[np.ndarray]) -> List[int]: ...
 
 
 class TeamAssigner:
-    def __init__(self, team1Class: str = "white shirt", team2Class: str = "dark blue shirt") -> None:
+    """Classify each player track into team 1 or 2 from its jersey.
+
+    A track is classified once: ``samplesPerTrack`` crops taken at least
+    ``sampleStride`` frames apart are collected, across chunks if need be,
+    classified in one batch by the backend and the team is decided by
+    majority vote. Tracks that end with fewer crops are decided from what
+    they have by :meth:`finish`.
+
+    ``backend`` is ``"clip"`` (fashion-CLIP zero-shot prompts), ``"color"``
+    (torso colour clustering fitted on the first ``fitFrames`` frames) or any
+    object implementing :class:`TeamBackend`.
+    """
+
+    cacheStage = "player_assignment"
+
+    def __init__(
+        self,
+        team1Class: str = "white shirt",
+        team2Class: str = "dark blue shirt",
+        *,
+        backend: str | TeamBackend = "clip",
+        batchSize: int = 32,
+        samplesPerTrack: int = 3,
+        sampleStride: int = 10,
+        fitFrames: int = 50,
+    ) -> None:
         self.playerTeam: Dict[int, int] = {}
         self.team1Class = team1Class
         self.team2Class = team2Class
-        self.model: CLIPModel | None = None
-        self.processor: CLIPProcessor | None = None
+        self.samplesPerTrack = samplesPerTrack
+        self.sampleStride = sampleStride
+        self.fitFrames = fitFrames
+        self.backend = self._makeBackend(backend, batchSize) if isinstance(backend, str) else backend
+        self._reset()
+
+    def _makeBackend(self, name: str, batchSize: int) -> TeamBackend:
+        if name == "clip":
+            from .clip_backend import ClipTeamBackend
 
-    def _loadModel(self) -> None:
-        if self.model is None or self.processor is None:
-            self.model = CLIPModel.from_pretrained("patrickjohncyh/fashion-clip")
-            self.processor = CLIPProcessor.from_pretrained("patrickjohncyh/fashion-clip")
+            return ClipTeamBackend(self.team1Class, self.team2Class, batchSize=batchSize)
+        if name == "color":
+            from .color_backend import ColorTeamBackend
 
-    def _playerColor(self, frame: Any, bbox: Sequence[float]) -> str:
+            return ColorTeamBackend()
+        raise ValueError(f"Unknown team backend {name!r}, expected one of {TEAM_BACKENDS}.")
+
+    def cacheKey(self, cache: StageCache, videoPath: str, tracksKey: str) -> str:
+        """Key for this video's assignment; ``tracksKey`` is the player-tracks cache key.
+
+        The backend's ``cacheParams()`` settings are part of the key.
+        Backends without a source file (defined in a notebook or via
+        ``exec``) are keyed by their qualified name instead of their code.
+        """
+        backendType = type(self.backend)
+        try:
+            backendSource = inspect.getsourcefile(backendType)
+        except TypeError:  # built-in or C-extension class
+            backendSource = None
+        code = [__file__] if backendSource is None else [__file__, backendSource]
+        params = {
+            "backend": backendType.__name__,
+            "backendParams": self.backend.cacheParams() if hasattr(self.backend, "cacheParams") else {},
+            "samplesPerTrack": self.samplesPerTrack,
+            "sampleStride": self.sampleStride,
+            "fitFrames": self.fitFrames,
+        }
+        if backendSource is None:
+            params["backendQualname"] = f"{backendType.__module__}.{backendType.__qualname__}"
+        return cache.makeKey(
+            self.cacheStage,
+            inputs=[videoPath],
+            params=params,
+            code=code,
+            upstream=[tracksKey],
+        )
+
+    @staticmethod
+    def _crop(frame: Any, bbox: Sequence[float]) -> np.ndarray | None:
         x1, y1, x2, y2 = map(int, bbox)
-        crop = frame[y1:y2, x1:x2]
-        rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(rgb)
-        classes = [self.team1Class, self.team2Class]
-        inp = self.processor(text=classes, images=img, return_tensors="pt", padding=True)
-        logits = self.model(**inp).logits_per_image
-        return classes[int(logits.softmax(dim=1).argmax())]
-
-    def _teamForPlayer(self, frame: Any, bbox: Sequence[float], pid: int) -> int:
-        if pid in self.playerTeam:
-            return self.playerTeam[pid]
-        color = self._playerColor(frame, bbox)
-        team = 1 if color == self.team1Class else 2
-        self.playerTeam[pid] = team
-        return team
+        crop = frame[max(y1, 0) : y2, max(x1, 0) : x2]
+        if crop.size == 0:
+            return None
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+    def _reset(self) -> None:
+        self.playerTeam.clear()
+        self._samples: Dict[int, List[np.ndarray]] = {}
+        self._lastSampled: Dict[int, int] = {}
+        self._fitCrops: List[np.ndarray] = []
+        self._fitted = not self.backend.needsFit
+
+    def _collectSamples(
+        self,
+        videoFrames: Sequence[Any],
+        playerTracks: Sequence[Dict[int, Dict[str, Any]]],
+        startIdx: int,
+    ) -> None:
+        for offset, tracks in enumerate(playerTracks):
+            idx = startIdx + offset
+            collectFit = not self._fitted and idx < self.fitFrames and idx % self.sampleStride == 0
+            for pid, info in tracks.items():
+                if collectFit:
+                    crop = self._crop(videoFrames[offset], info["bbox"])
+                    if crop is not None:
+                        self._fitCrops.append(crop)
+                if pid in self.playerTeam:
+                    continue
+                pidSamples = self._samples.setdefault(pid, [])
+                if len(pidSamples) >= self.samplesPerTrack:
+                    continue
+                last = self._lastSampled.get(pid)
+                if last is not None and idx - last < self.sampleStride:
+                    continue
+                crop = self._crop(videoFrames[offset], info["bbox"])
+                if crop is not None:
+                    pidSamples.append(crop)
+                    self._lastSampled[pid] = idx
+
+    def _fit(self) -> None:
+        if len(self._fitCrops) >= 2:
+            self.backend.fit(self._fitCrops)
+            self._fitted = True
+            self._fitCrops = []
+
+    def _decideTeams(self, final: bool = False) -> None:
+        """Vote on every pending track with ``samplesPerTrack`` crops, or on all of them when ``final``."""
+        if not self._fitted:
+            return
+        ready = {
+            pid: crops
+            for pid, crops in self._samples.items()
+            if crops and (final or len(crops) >= self.samplesPerTrack)
+        }
+        if not ready:
+            return
+        owners = [pid for pid, crops in ready.items() for _ in crops]
+        crops = [c for pidCrops in ready.values() for c in pidCrops]
+        votes: Dict[int, List[int]] = {}
+        for pid, team in zip(owners, self.backend.classify(crops)):
+            votes.setdefault(pid, []).append(team)
+        for pid, teams in votes.items():
+            t1, t2 = teams.count(1), teams.count(2)
+            self.playerTeam[pid] = 1 if t1 > t2 else 2 if t2 > t1 else teams[0]
+            del self._samples[pid]
+            self._lastSampled.pop(pid, None)
+
+    def teamsFor(self, playerTracks: Sequence[Dict[int, Any]]) -> List[Dict[int, int]]:
+        """Per-frame ``{player_id: team}`` of the tracks decided so far."""
+        return [{pid: self.playerTeam[pid] for pid in tracks if pid in self.playerTeam} for tracks in playerTracks]
 
     def assignTeams(
         self,
@@ -52,18 +188,48 @@ class TeamAssigner:
         *,
         readFromStub: bool = False,
         stubPath: str | None = None,
+        cache: Optional[StageCache] = None,
+        videoPath: Optional[str] = None,
+        tracksKey: Optional[str] = None,
     ) -> List[Dict[int, int]]:
-        cached = read_stub(readFromStub, stubPath)
+        key = self.cacheKey(cache, videoPath, tracksKey) if cache is not None and videoPath and tracksKey else None
+        cached = cache.load(self.cacheStage, key) if key else read_stub(readFromStub, stubPath)
         if cached is not None and len(cached) == len(videoFrames):
             return cached
-        self._loadModel()
-        res: List[Dict[int, int]] = []
-        for idx, tracks in enumerate(playerTracks):
-            if idx % 50 == 0:
-                self.playerTeam.clear()
-            frameRes: Dict[int, int] = {}
-            for pid, info in tracks.items():
-                frameRes[pid] = self._teamForPlayer(videoFrames[idx], info["bbox"], pid)
-            res.append(frameRes)
-        save_stub(stubPath, res)
+        self.assignFrames(videoFrames, playerTracks)
+        self.finish()
+        res = self.teamsFor(playerTracks)
+        if key:
+            cache.store(self.cacheStage, key, res)
+        else:
+            save_stub(stubPath, res)
         return res
+
+    def assignFrames(
+        self,
+        videoFrames: Sequence[Any],
+        playerTracks: Sequence[Dict[int, Dict[str, Any]]],
+        *,
+        startIdx: int = 0,
+    ) -> List[Dict[int, int]]:
+        """Assign teams for one chunk whose first frame is ``startIdx`` in the video.
+
+        Crops and decisions carry over between chunks, so the teams do not
+        depend on the chunk size; ``startIdx == 0`` starts a new video. A
+        track is only decided once it has ``samplesPerTrack`` crops (or at
+        :meth:`finish`) and is left out of the frames before that.
+        """
+        if startIdx == 0:
+            self._reset()
+        self._collectSamples(videoFrames, playerTracks, startIdx)
+        if not self._fitted and startIdx + len(playerTracks) >= self.fitFrames:
+            self._fit()
+        self._decideTeams()
+        return self.teamsFor(playerTracks)
+
+    def finish(self) -> Dict[int, int]:
+        """Decide every still pending track at the end of the video or stream; returns all teams."""
+        if not self._fitted:
+            self._fit()
+        self._decideTeams(final=True)
+        return dict(self.playerTeam)
@@ -0,0 +1 @@
+from .cumulative_team_stats import CumulativeTeamStats, RunningTeamStats, teamControlArray
\ No newline at end of file
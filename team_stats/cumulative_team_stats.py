@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+AssignmentFrame = Dict[int, int]
+
+
+def teamControlArray(
+    playerAssignment: Sequence[AssignmentFrame],
+    ballAquisition: Sequence[int],
+) -> np.ndarray:
+    """Per-frame team in control of the ball: 1, 2 or -1 when nobody has it."""
+    control: List[int] = []
+    for assign, pid in zip(playerAssignment, ballAquisition):
+        if pid == -1 or pid not in assign:
+            control.append(-1)
+        else:
+            control.append(1 if assign[pid] == 1 else 2)
+    return np.array(control, dtype=np.int64)
+
+
+class CumulativeTeamStats:
+    """Running per-team totals for passes, interceptions and ball control.
+
+    Each statistic is stored as an ``(nFrames, 2)`` prefix-sum array whose row
+    ``idx`` holds the team 1 / team 2 counts over frames ``0..idx``
+    inclusive, so any frame's totals are an O(1) lookup. Statistics that are
+    not supplied count zero on every frame.
+    """
+
+    def __init__(
+        self,
+        passes: Sequence[int] = (),
+        interceptions: Sequence[int] = (),
+        control: Sequence[int] = (),
+    ) -> None:
+        self.passCounts = self._prefixCounts(passes)
+        self.interceptionCounts = self._prefixCounts(interceptions)
+        self.controlCounts = self._prefixCounts(control)
+        nFrames = max(len(self.passCounts), len(self.interceptionCounts), len(self.controlCounts))
+        for name in ("passCounts", "interceptionCounts", "controlCounts"):
+            if not len(getattr(self, name)):
+                setattr(self, name, np.zeros((nFrames, 2), dtype=np.int64))
+        self.offset = 0  # video frame index of row 0 (see :meth:`window`)
+
+    @classmethod
+    def fromPossession(
+        cls,
+        passes: Sequence[int],
+        interceptions: Sequence[int],
+        playerAssignment: Sequence[AssignmentFrame],
+        ballAquisition: Sequence[int],
+    ) -> "CumulativeTeamStats":
+        return cls(passes, interceptions, teamControlArray(playerAssignment, ballAquisition))
+
+    @staticmethod
+    def _prefixCounts(events: Sequence[int]) -> np.ndarray:
+        arr = np.asarray(events, dtype=np.int64).reshape(-1)
+        return np.stack([np.cumsum(arr == 1), np.cumsum(arr == 2)], axis=1)
+
+    def window(self, start: int, stop: int) -> "CumulativeTeamStats":
+        """The totals of frames ``start..stop-1`` only, still indexed by video frame."""
+        out = CumulativeTeamStats.__new__(CumulativeTeamStats)
+        rows = slice(start - self.offset, stop - self.offset)
+        out.passCounts = self.passCounts[rows]
+        out.interceptionCounts = self.interceptionCounts[rows]
+        out.controlCounts = self.controlCounts[rows]
+        out.offset = start
+        return out
+
+    def __len__(self) -> int:
+        return self.offset + max(len(self.passCounts), len(self.interceptionCounts), len(self.controlCounts))
+
+    def passesAt(self, idx: int) -> Tuple[int, int]:
+        t1, t2 = self.passCounts[idx - self.offset]
+        return int(t1), int(t2)
+
+    def interceptionsAt(self, idx: int) -> Tuple[int, int]:
+        t1, t2 = self.interceptionCounts[idx - self.offset]
+        return int(t1), int(t2)
+
+    def controlAt(self, idx: int) -> Tuple[float, float]:
+        """Fraction of frames ``0..idx`` each team controlled the ball."""
+        t1, t2 = self.controlCounts[idx - self.offset]
+        return float(t1) / (idx + 1), float(t2) / (idx + 1)
+
+    def frameAt(self, seconds: float, fps: float) -> int:
+        """Last frame index at or before ``seconds``, clamped to the video."""
+        return int(min(max(int(seconds * fps), 0), len(self) - 1))
+
+    def statsAt(self, idx: int) -> Dict[str, float]:
+        t1p, t2p = self.passesAt(idx)
+        t1i, t2i = self.interceptionsAt(idx)
+        t1c, t2c = self.controlAt(idx)
+        return {
+            "frame": idx,
+            "team1Passes": t1p,
+            "team2Passes": t2p,
+            "team1Interceptions": t1i,
+            "team2Interceptions": t2i,
+            "team1Control": t1c,
+            "team2Control": t2c,
+        }
+
+    def statsAtTime(self, seconds: float, fps: float) -> Dict[str, float]:
+        return self.statsAt(self.frameAt(seconds, fps))
+
+
+class RunningTeamStats:
+    """Online counterpart of :class:`CumulativeTeamStats` for live input.
+
+    Totals grow with :meth:`update`, one call per processed frame, and the
+    ``*At`` lookups return the current totals whatever the index, so the
+    stats drawers can render a live frame unchanged. Ball control is the
+    fraction of processed frames, which skips dropped frames.
+    """
+
+    def __init__(self) -> None:
+        self.passCounts = [0, 0]
+        self.interceptionCounts = [0, 0]
+        self.controlCounts = [0, 0]
+        self.frames = 0
+        self.lastFrame = -1
+
+    def update(self, idx: int, control: int = -1, passTeam: int = -1, interceptionTeam: int = -1) -> None:
+        """Add one frame: the team in control and the team of any pass or interception on it."""
+        for counts, team in (
+            (self.controlCounts, control),
+            (self.passCounts, passTeam),
+            (self.interceptionCounts, interceptionTeam),
+        ):
+            if team in (1, 2):
+                counts[team - 1] += 1
+        self.frames += 1
+        self.lastFrame = idx
+
+    def __len__(self) -> int:
+        return self.lastFrame + 1
+
+    def passesAt(self, idx: int) -> Tuple[int, int]:
+        return self.passCounts[0], self.passCounts[1]
+
+    def interceptionsAt(self, idx: int) -> Tuple[int, int]:
+        return self.interceptionCounts[0], self.interceptionCounts[1]
+
+    def controlAt(self, idx: int) -> Tuple[float, float]:
+        n = max(self.frames, 1)
+        return self.controlCounts[0] / n, self.controlCounts[1] / n
+
+    def statsAt(self, idx: int) -> Dict[str, float]:
+        t1c, t2c = self.controlAt(idx)
+        return {
+            "frame": idx,
+            "team1Passes": self.passCounts[0],
+            "team2Passes": self.passCounts[1],
+            "team1Interceptions": self.interceptionCounts[0],
+            "team2Interceptions": self.interceptionCounts[1],
+            "team1Control": t1c,
+            "team2Control": t2c,
+        }
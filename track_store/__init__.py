@@ -0,0 +1,10 @@
+from .columnar import (
+    TRACK_DTYPE,
+    NUM_COURT_KEYPOINTS,
+    tracksToColumns,
+    columnsToTracks,
+    frameRange,
+    keypointsToArray,
+    KeypointFrames,
+)
+from .track_store import STORE_COLUMNS, TrackStore, TrackFrameView, trackBoxes
\ No newline at end of file
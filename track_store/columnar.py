@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+# ────────────────────────────────────────────────────────────────
+# Column layouts
+# ────────────────────────────────────────────────────────────────
+TRACK_DTYPE = np.dtype(
+    [
+        ("frame", "<i4"),
+        ("track_id", "<i4"),
+        ("x1", "<f4"),
+        ("y1", "<f4"),
+        ("x2", "<f4"),
+        ("y2", "<f4"),
+        ("cls", "<i2"),
+        ("conf", "<f4"),
+    ]
+)
+NUM_COURT_KEYPOINTS = 18
+
+TrackFrame = Dict[int, Dict[str, Any]]
+
+
+# ────────────────────────────────────────────────────────────────
+# Tracks: List[Dict[id, {"bbox": [...]}]]  <->  structured array
+# ────────────────────────────────────────────────────────────────
+def tracksToColumns(tracks: Sequence[TrackFrame], cls: int = 0) -> np.ndarray:
+    """Flatten per-frame track dicts (or a ``TrackStore``) into a frame-sorted :data:`TRACK_DTYPE` array.
+
+    ``cls`` and ``conf`` are taken from the track info when present, else
+    ``cls`` (argument) and NaN.
+    """
+    from .track_store import TrackStore
+
+    if isinstance(tracks, TrackStore):
+        return tracks.toColumns(cls)
+    n = sum(len(frame) for frame in tracks)
+    cols = np.empty(n, dtype=TRACK_DTYPE)
+    row = 0
+    for idx, frame in enumerate(tracks):
+        for tid, info in frame.items():
+            x1, y1, x2, y2 = info["bbox"]
+            cols[row] = (idx, tid, x1, y1, x2, y2, info.get("cls", cls), info.get("conf", np.nan))
+            row += 1
+    return cols
+
+
+def columnsToTracks(columns: np.ndarray, nFrames: int, startFrame: int = 0) -> List[TrackFrame]:
+    """Rebuild the dict-per-frame layout consumed by the analytics and drawers.
+
+    ``columns`` must be sorted by frame; only rows for frames
+    ``startFrame .. startFrame + nFrames - 1`` are used.
+    """
+    out: List[TrackFrame] = [{} for _ in range(nFrames)]
+    rows = frameRange(columns, startFrame, startFrame + nFrames)
+    frames = (rows["frame"] - startFrame).tolist()
+    ids = rows["track_id"].tolist()
+    boxes = np.stack([rows["x1"], rows["y1"], rows["x2"], rows["y2"]], axis=1).tolist()
+    for frame, tid, bbox in zip(frames, ids, boxes):
+        out[frame][tid] = {"bbox": bbox}
+    return out
+
+
+def frameRange(columns: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Rows of frame-sorted ``columns`` with ``start <= frame < stop`` (a view, no copy)."""
+    frames = columns["frame"]
+    lo, hi = np.searchsorted(frames, [start, stop], side="left")
+    return columns[lo:hi]
+
+
+# ────────────────────────────────────────────────────────────────
+# Court keypoints: Ultralytics Keypoints  ->  (frames, 18, 2) tensor
+# ────────────────────────────────────────────────────────────────
+def keypointsToArray(keypoints: Sequence[Any], numKeypoints: int = NUM_COURT_KEYPOINTS) -> np.ndarray:
+    """Stack per-frame keypoint detections into a ``(frames, K, 2)`` float32 array.
+
+    Frames without a detection are all zeros, which downstream code already
+    treats as "keypoint not visible".
+    """
+    out = np.zeros((len(keypoints), numKeypoints, 2), dtype=np.float32)
+    for idx, kp in enumerate(keypoints):
+        if kp is None:
+            continue
+        xy = kp.xy if hasattr(kp, "xy") else kp
+        if hasattr(xy, "cpu"):
+            xy = xy.cpu().numpy()
+        xy = np.asarray(xy, dtype=np.float32).reshape(-1, numKeypoints, 2)
+        if len(xy):
+            out[idx] = xy[0]
+    return out
+
+
+class KeypointsFrameView:
+    """Per-frame stand-in for an Ultralytics ``Keypoints`` object.
+
+    ``xy`` is a ``(1, K, 2)`` view into the video-wide array, so in-place
+    edits land in the owning :class:`KeypointFrames`.
+    """
+
+    def __init__(self, xy: np.ndarray, imageSize: Optional[Tuple[int, int]] = None) -> None:
+        self.xy = xy
+        self.imageSize = imageSize
+
+    @property
+    def xyn(self) -> np.ndarray:
+        """``xy`` normalised by the image size (a fresh array)."""
+        if self.imageSize is None:
+            raise ValueError("xyn needs the image size; build KeypointFrames with imageSize=(width, height)")
+        w, h = self.imageSize
+        return self.xy / np.array([w, h], dtype=self.xy.dtype)
+
+
+class KeypointFrames(Sequence[KeypointsFrameView]):
+    """Sequence adapter over a ``(frames, K, 2)`` keypoint tensor.
+
+    Indexing yields :class:`KeypointsFrameView` objects so code written
+    against Ultralytics ``Keypoints`` keeps working; slicing yields another
+    ``KeypointFrames`` over a view of the same data.
+    """
+
+    def __init__(self, xy: np.ndarray, imageSize: Optional[Tuple[int, int]] = None) -> None:
+        self.xy = xy
+        self.imageSize = imageSize
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    @overload
+    def __getitem__(self, idx: int) -> KeypointsFrameView: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> "KeypointFrames": ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            return KeypointFrames(self.xy[idx], self.imageSize)
+        if idx < 0:
+            idx += len(self.xy)
+        if not 0 <= idx < len(self.xy):
+            raise IndexError("keypoint frame index out of range")
+        return KeypointsFrameView(self.xy[idx : idx + 1], self.imageSize)
+
+    def __iter__(self) -> Iterator[KeypointsFrameView]:
+        for idx in range(len(self.xy)):
+            yield KeypointsFrameView(self.xy[idx : idx + 1], self.imageSize)
+
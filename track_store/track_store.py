@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from .columnar import TRACK_DTYPE, TrackFrame, frameRange
+
+#: Column order of :class:`TrackStore`; ``team`` is 0 until teams are assigned.
+STORE_COLUMNS = ("frame", "track_id", "x1", "y1", "x2", "y2", "conf", "team")
+
+
+class TrackFrameView(Mapping[int, Dict[str, Any]]):
+    """Read-only ``{track_id: {"bbox": [x1, y1, x2, y2]}}`` view of one frame.
+
+    Boxes are built as Python floats on access, so consumers written for
+    the per-frame dicts see the same values; hot paths read :attr:`ids`
+    and :attr:`boxes` instead.
+    """
+
+    __slots__ = ("ids", "boxes", "_rows")
+
+    def __init__(self, ids: np.ndarray, boxes: np.ndarray) -> None:
+        self.ids = ids
+        self.boxes = boxes
+        self._rows: Optional[Dict[int, int]] = None
+
+    def __getitem__(self, trackId: int) -> Dict[str, Any]:
+        if self._rows is None:
+            self._rows = {tid: row for row, tid in enumerate(self.ids.tolist())}
+        return {"bbox": self.boxes[self._rows[trackId]].tolist()}
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def items(self) -> List[Tuple[int, Dict[str, Any]]]:  # type: ignore[override]
+        return [(tid, {"bbox": box}) for tid, box in zip(self.ids.tolist(), self.boxes.tolist())]
+
+    def values(self) -> List[Dict[str, Any]]:  # type: ignore[override]
+        return [{"bbox": box} for box in self.boxes.tolist()]
+
+
+def trackBoxes(frame: Mapping[int, Dict[str, Any]]) -> Iterable[Tuple[int, List[float]]]:
+    """``(track_id, bbox)`` pairs of one frame, from a :class:`TrackFrameView` or a plain dict."""
+    if isinstance(frame, TrackFrameView):
+        return zip(frame.ids.tolist(), frame.boxes.tolist())
+    return ((tid, info["bbox"]) for tid, info in frame.items())
+
+
+class TrackStore(Sequence[TrackFrameView]):
+    """Tracks of a video as contiguous NumPy columns, sorted by frame.
+
+    Columns are ``frame``, ``trackId``, ``boxes`` (``(rows, 4)``: x1, y1,
+    x2, y2), ``conf`` (NaN when unknown) and ``team`` (0 when unassigned).
+    A per-frame offset index gives every frame's rows as an O(1) slice and
+    a per-track index, built on first use, serves trajectory queries.
+
+    Indexing a frame returns a read-only :class:`TrackFrameView`, so the
+    store can stand in for the ``List[Dict[track_id, {"bbox": ...}]]``
+    layout; slicing returns a store over views of the same columns. Frame
+    numbers in :attr:`frame` are absolute, ``startFrame`` is the frame at
+    index 0.
+    """
+
+    def __init__(
+        self,
+        frame: np.ndarray,
+        trackId: np.ndarray,
+        boxes: np.ndarray,
+        conf: Optional[np.ndarray] = None,
+        team: Optional[np.ndarray] = None,
+        *,
+        nFrames: Optional[int] = None,
+        startFrame: int = 0,
+    ) -> None:
+        frame = np.asarray(frame, dtype=np.int32)
+        order = None if np.all(frame[1:] >= frame[:-1]) else np.argsort(frame, kind="stable")
+
+        def column(values: Any, dtype: Any, fill: Any) -> np.ndarray:
+            col = np.full(len(frame), fill, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+            return np.ascontiguousarray(col if order is None else col[order])
+
+        self.frame = column(frame, np.int32, 0)
+        self.trackId = column(trackId, np.int32, 0)
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        self.boxes = np.ascontiguousarray(boxes if order is None else boxes[order])
+        self.conf = column(conf, np.float32, np.nan)
+        self.team = column(team, np.int8, 0)
+        self.startFrame = startFrame
+        if nFrames is None:
+            nFrames = int(self.frame[-1]) - startFrame + 1 if len(self.frame) else 0
+        self.frameOffsets = np.searchsorted(self.frame, np.arange(startFrame, startFrame + nFrames + 1))
+        self._trackIndex: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # ────────────────────────────────────────────────────────────────
+    # Construction / conversion
+    # ────────────────────────────────────────────────────────────────
+    @classmethod
+    def fromTracks(
+        cls,
+        tracks: Sequence[TrackFrame],
+        assignment: Optional[Sequence[Mapping[int, int]]] = None,
+    ) -> "TrackStore":
+        """From per-frame dicts; ``conf`` is read from the track info when present."""
+        counts = [len(frame) for frame in tracks]
+        n = sum(counts)
+        frame = np.repeat(np.arange(len(tracks), dtype=np.int32), counts)
+        trackId = np.fromiter((tid for f in tracks for tid in f), dtype=np.int32, count=n)
+        boxes = np.array([info["bbox"] for f in tracks for info in f.values()], dtype=np.float64).reshape(-1, 4)
+        conf = np.fromiter((info.get("conf", np.nan) for f in tracks for info in f.values()), dtype=np.float32, count=n)
+        store = cls(frame, trackId, boxes, conf, nFrames=len(tracks))
+        if assignment is not None:
+            store.assignTeams(assignment)
+        return store
+
+    @classmethod
+    def fromColumns(cls, columns: np.ndarray, nFrames: int, startFrame: int = 0) -> "TrackStore":
+        """From frame-sorted :data:`TRACK_DTYPE` rows (e.g. a memory-mapped cache entry).
+
+        The columns are strided views of ``columns``, so opening a cache
+        entry or a frame range of it copies nothing; only ``team`` is new.
+        """
+        rows = frameRange(columns, startFrame, startFrame + nFrames)
+        store = cls.__new__(cls)
+        store.frame = rows["frame"]
+        store.trackId = rows["track_id"]
+        store.boxes = structured_to_unstructured(rows[["x1", "y1", "x2", "y2"]], copy=False)
+        store.conf = rows["conf"]
+        store.team = np.zeros(len(rows), dtype=np.int8)
+        store.startFrame = startFrame
+        store.frameOffsets = np.searchsorted(store.frame, np.arange(startFrame, startFrame + nFrames + 1))
+        store._trackIndex = None
+        return store
+
+    def toColumns(self, cls: int = 0) -> np.ndarray:
+        """:data:`TRACK_DTYPE` rows with frames counted from this store's index 0."""
+        out = np.empty(len(self.frame), dtype=TRACK_DTYPE)
+        out["frame"] = self.frame - self.startFrame
+        out["track_id"] = self.trackId
+        for i, name in enumerate(("x1", "y1", "x2", "y2")):
+            out[name] = self.boxes[:, i]
+        out["cls"] = cls
+        out["conf"] = self.conf
+        return out
+
+    def toTracks(self) -> List[TrackFrame]:
+        return [dict(view.items()) for view in self]
+
+    def assignTeams(self, assignment: Sequence[Mapping[int, int]]) -> None:
+        """Fill the ``team`` column from per-frame ``{track_id: team}`` dicts."""
+        for idx in range(min(len(self), len(assignment))):
+            teams = assignment[idx]
+            if not teams:
+                continue
+            rows = self.frameRows(idx)
+            self.team[rows] = [teams.get(tid, 0) for tid in self.trackId[rows].tolist()]
+
+    # ────────────────────────────────────────────────────────────────
+    # Frame access
+    # ────────────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self.frameOffsets) - 1
+
+    def frameRows(self, idx: int) -> slice:
+        """Rows of frame ``idx`` (relative to :attr:`startFrame`)."""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("frame index out of range")
+        return slice(int(self.frameOffsets[idx]), int(self.frameOffsets[idx + 1]))
+
+    def rowsOfFrames(self, frameIdx: np.ndarray) -> np.ndarray:
+        """Row indices of the given frames, frame-major in the order given."""
+        frameIdx = np.asarray(frameIdx, dtype=np.int64)
+        lo, hi = self.frameOffsets[frameIdx], self.frameOffsets[frameIdx + 1]
+        counts = hi - lo
+        if not len(counts):
+            return np.zeros(0, dtype=np.int64)
+        starts = np.repeat(lo - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return starts + np.arange(int(counts.sum()))
+
+    @overload
+    def __getitem__(self, idx: int) -> TrackFrameView: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> "TrackStore": ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                raise ValueError("TrackStore slices must be contiguous")
+            stop = max(start, stop)
+            return self._window(start, stop)
+        rows = self.frameRows(idx)
+        return TrackFrameView(self.trackId[rows], self.boxes[rows])
+
+    def _window(self, start: int, stop: int) -> "TrackStore":
+        lo, hi = int(self.frameOffsets[start]), int(self.frameOffsets[stop])
+        out = TrackStore.__new__(TrackStore)
+        out.frame = self.frame[lo:hi]
+        out.trackId = self.trackId[lo:hi]
+        out.boxes = self.boxes[lo:hi]
+        out.conf = self.conf[lo:hi]
+        out.team = self.team[lo:hi]
+        out.startFrame = self.startFrame + start
+        out.frameOffsets = self.frameOffsets[start : stop + 1] - lo
+        out._trackIndex = None
+        return out
+
+    # ────────────────────────────────────────────────────────────────
+    # Track access
+    # ────────────────────────────────────────────────────────────────
+    def _tracks(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._trackIndex is None:
+            order = np.argsort(self.trackId, kind="stable")  # rows stay in frame order within a track
+            ids, starts = np.unique(self.trackId[order], return_index=True)
+            offsets = np.append(starts, len(order))
+            self._trackIndex = (ids, offsets, order)
+        return self._trackIndex
+
+    @property
+    def trackIds(self) -> np.ndarray:
+        return self._tracks()[0]
+
+    def trackRows(self, trackId: int) -> np.ndarray:
+        """Rows of one track in frame order (empty if the id never appears)."""
+        ids, offsets, order = self._tracks()
+        pos = int(np.searchsorted(ids, trackId))
+        if pos == len(ids) or ids[pos] != trackId:
+            return order[:0]
+        return order[offsets[pos] : offsets[pos + 1]]
+
+    def trajectory(self, trackId: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Frame indices (relative to :attr:`startFrame`) and ``(n, 4)`` boxes of one track."""
+        rows = self.trackRows(trackId)
+        return self.frame[rows] - self.startFrame, self.boxes[rows]
+
+    @property
+    def nbytes(self) -> int:
+        cols = (self.frame, self.trackId, self.boxes, self.conf, self.team, self.frameOffsets)
+        return sum(c.nbytes for c in cols)
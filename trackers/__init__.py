@@ -1 +1,2 @@
-from .player_tracker import PlayerTracker
\ No newline at end of file
+from .player_tracker import PlayerTracker
+from .ball_tracker import BallTracker
\ No newline at end of file
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sys
+
+sys.path.append("../")
+from utils import read_stub, save_stub, iter_batches, StageCache  # type: ignore
+from track_store import tracksToColumns, columnsToTracks, TrackStore  # type: ignore
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+Frame = Any
+TrackFrame = Dict[int, Dict[str, List[float]]]
+
+BALL_ID = 1
+
+
+class BallTracker:
+    """Detect the ball, drop implausible jumps and interpolate the gaps.
+
+    Only the most confident "Ball" detection of each frame is kept, always
+    under track id ``1``. Post-processing works on a ``(frames, 4)`` bbox
+    array with NaN rows for missing detections.
+    """
+
+    cacheStage = "ball_tracks"
+
+    def __init__(
+        self,
+        modelPath: str,
+        *,
+        conf: float = 0.5,
+        batchSize: int = 20,
+        imgsz: Optional[int] = None,
+        maxJump: float = 25.0,
+    ) -> None:
+        self.modelPath = modelPath
+        self.conf = conf
+        self.batchSize = batchSize
+        self.imgsz = imgsz
+        self.maxJump = maxJump
+        self._model: Optional[YOLO] = None
+        self._lastAccepted: Optional[Tuple[int, float, float]] = None
+
+    @property
+    def model(self) -> YOLO:
+        if self._model is None:
+            from ultralytics import YOLO  # heavy; imported only when detecting
+
+            self._model = YOLO(self.modelPath)
+        return self._model
+
+    def cacheKey(self, cache: StageCache, videoPath: str) -> str:
+        return cache.makeKey(
+            self.cacheStage,
+            inputs=[videoPath, self.modelPath],
+            params={"conf": self.conf, "batch": self.batchSize, "imgsz": self.imgsz},
+            code=[__file__],
+        )
+
+    def _detectBatch(self, frames: Iterable[Frame]):
+        extra = {} if self.imgsz is None else {"imgsz": self.imgsz}
+        for frameBatch in iter_batches(frames, self.batchSize):
+            yield from self.model.predict(frameBatch, conf=self.conf, verbose=False, **extra)
+
+    def objectTracks(
+        self,
+        frames: Sequence[Frame],
+        *,
+        readFromStub: bool = False,
+        stubPath: str | None = None,
+        cache: Optional[StageCache] = None,
+        videoPath: Optional[str] = None,
+    ) -> List[TrackFrame]:
+        key = self.cacheKey(cache, videoPath) if cache is not None and videoPath else None
+        cached = cache.load(self.cacheStage, key) if key else read_stub(readFromStub, stubPath)
+        if key and cached is not None:
+            cached = columnsToTracks(cached, len(frames))
+        if cached is not None and len(cached) == len(frames):
+            return cached  # type: ignore[return-value]
+        out = self.trackFrames(frames)
+        if key:
+            cache.store(self.cacheStage, key, tracksToColumns(out))
+        else:
+            save_stub(stubPath, out)
+        return out
+
+    def trackFrames(self, frames: Iterable[Frame]) -> List[TrackFrame]:
+        """Detect one chunk of frames, keeping the most confident ball per frame."""
+        import supervision as sv
+
+        out: List[TrackFrame] = []
+        for det in self._detectBatch(frames):
+            names = {v: k for k, v in det.names.items()}
+            supDet = sv.Detections.from_ultralytics(det)
+            isBall = supDet.class_id == names["Ball"]
+            frameDict: TrackFrame = {}
+            if isBall.any():
+                conf = np.where(isBall, supDet.confidence, -np.inf)
+                frameDict[BALL_ID] = {"bbox": supDet.xyxy[int(np.argmax(conf))].tolist()}
+            out.append(frameDict)
+        return out
+
+    # ────────────────────────────────────────────────────────────────
+    # Post-processing
+    # ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def toArray(tracks: Sequence[TrackFrame]) -> np.ndarray:
+        """``(frames, 4)`` float64 bboxes, NaN where the ball was not detected."""
+        boxes = np.full((len(tracks), 4), np.nan)
+        if isinstance(tracks, TrackStore):
+            frames, trackBoxes = tracks.trajectory(BALL_ID)
+            boxes[frames] = trackBoxes
+            return boxes
+        for idx, frame in enumerate(tracks):
+            info = frame.get(BALL_ID)
+            if info and len(info.get("bbox", ())) == 4:
+                boxes[idx] = info["bbox"]
+        return boxes
+
+    @staticmethod
+    def fromArray(boxes: np.ndarray) -> List[TrackFrame]:
+        valid = ~np.isnan(boxes).any(axis=1)
+        if valid.all():
+            return [{BALL_ID: {"bbox": box}} for box in boxes.tolist()]
+        return [{BALL_ID: {"bbox": box}} if ok else {} for box, ok in zip(boxes.tolist(), valid.tolist())]
+
+    def filterJumps(self, boxes: np.ndarray) -> np.ndarray:
+        """Mask (NaN) detections whose top-left corner moved too far.
+
+        A detection is compared with the last accepted one and rejected when
+        it moved more than ``maxJump`` pixels per elapsed frame. Runs of
+        accepted detections are checked with one vectorized consecutive
+        difference; only rejections fall back to a windowed search for the
+        next detection close enough to the last accepted one.
+        """
+        rows = np.flatnonzero(~np.isnan(boxes).any(axis=1))
+        out = boxes.copy()
+        if len(rows) < 2:
+            return out
+        pos = boxes[rows, :2]
+        step = pos[1:] - pos[:-1]
+        dist = np.sqrt(step[:, 0] * step[:, 0] + step[:, 1] * step[:, 1])
+        fails = np.flatnonzero(dist > self.maxJump * np.diff(rows))
+        keep = np.ones(len(rows), dtype=bool)
+        n = len(rows)
+        r = 1  # rows[r-1] is the last accepted detection
+        while r < n:
+            # Consecutive mode: accept rows until the next failing step.
+            f = np.searchsorted(fails, r - 1)
+            if f == len(fails):
+                break
+            last = int(fails[f])
+            r = last + 1
+            # Catch-up mode: find the first later row close enough to ``last``.
+            window = 64
+            while r < n:
+                stop = min(n, r + window)
+                d = pos[r:stop] - pos[last]
+                ok = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]) <= self.maxJump * (rows[r:stop] - rows[last])
+                hit = int(np.argmax(ok)) if ok.any() else -1
+                if hit >= 0:
+                    keep[r : r + hit] = False
+                    r += hit + 1
+                    break
+                keep[r:stop] = False
+                r = stop
+                window *= 2
+        out[rows[~keep]] = np.nan
+        return out
+
+    @staticmethod
+    def interpolateBoxes(boxes: np.ndarray) -> np.ndarray:
+        """Linearly fill NaN rows, holding the first/last detection at the ends."""
+        valid = ~np.isnan(boxes).any(axis=1)
+        if not valid.any():
+            return boxes.copy()
+        frames = np.arange(len(boxes))
+        known = np.flatnonzero(valid)
+        out = np.empty_like(boxes)
+        for c in range(boxes.shape[1]):
+            out[:, c] = np.interp(frames, known, boxes[known, c])
+        return out
+
+    def resetOnline(self) -> None:
+        self._lastAccepted = None
+
+    def filterFrame(self, idx: int, frame: TrackFrame) -> TrackFrame:
+        """Online :meth:`filterJumps` for frame ``idx``; frames must arrive in order.
+
+        Frames may be skipped; the allowed jump grows with the elapsed frames
+        exactly as in the batch filter. Gaps are not interpolated.
+        """
+        info = frame.get(BALL_ID)
+        if not info or len(info.get("bbox", ())) != 4:
+            return {}
+        x, y = float(info["bbox"][0]), float(info["bbox"][1])
+        if self._lastAccepted is not None:
+            lastIdx, lx, ly = self._lastAccepted
+            dx, dy = x - lx, y - ly
+            if np.sqrt(dx * dx + dy * dy) > self.maxJump * (idx - lastIdx):
+                return {}
+        self._lastAccepted = (idx, x, y)
+        return frame
+
+    def removeWrongDetections(self, ballPositions: Sequence[TrackFrame]) -> List[TrackFrame]:
+        return self.fromArray(self.filterJumps(self.toArray(ballPositions)))
+
+    def interpolateBallPositions(self, ballPositions: Sequence[TrackFrame]) -> List[TrackFrame]:
+        return self.fromArray(self.interpolateBoxes(self.toArray(ballPositions)))
+
+    def cleanBallPositions(self, ballPositions: Sequence[TrackFrame]) -> List[TrackFrame]:
+        """``removeWrongDetections`` then ``interpolateBallPositions`` in one array pass."""
+        return self.fromArray(self.interpolateBoxes(self.filterJumps(self.toArray(ballPositions))))
@@ -1,26 +1,75 @@
-from typing import Any, Dict, List, Sequence
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
 
-import supervision as sv
-from ultralytics import YOLO
 import sys
 
 sys.path.append("../")
-from utils import read_stub, save_stub  # type: ignore
+from utils import read_stub, save_stub, iter_batches, StageCache  # type: ignore
+from track_store import tracksToColumns, columnsToTracks  # type: ignore
+
+if TYPE_CHECKING:
+    import supervision as sv
+    from ultralytics import YOLO
 
 Frame = Any
 TrackFrame = Dict[int, Dict[str, List[float]]]
 
 
 class PlayerTracker:
-    def __init__(self, modelPath: str) -> None:
-        self.model = YOLO(modelPath)
-        self.tracker = sv.ByteTrack()
+    cacheStage = "player_tracks"
+
+    def __init__(
+        self,
+        modelPath: str,
+        *,
+        conf: float = 0.5,
+        batchSize: int = 20,
+        imgsz: Optional[int] = None,
+    ) -> None:
+        self.modelPath = modelPath
+        self.conf = conf
+        self.batchSize = batchSize
+        self.imgsz = imgsz
+        self._model: Optional[YOLO] = None
+        self._tracker: Optional[sv.ByteTrack] = None
+
+    @property
+    def model(self) -> YOLO:
+        # ultralytics and supervision take seconds to import; only pay for
+        # them when frames actually have to be detected
+        if self._model is None:
+            from ultralytics import YOLO
+
+            self._model = YOLO(self.modelPath)
+        return self._model
+
+    def resetTracking(self) -> None:
+        """Forget track ids before the first chunk of a new video."""
+        self._tracker = None
 
-    def _detectBatch(self, frames: Sequence[Frame], conf: float = 0.5, batch: int = 20):
-        detected = []
-        for i in range(0, len(frames), batch):
-            detected.extend(self.model.predict(frames[i : i + batch], conf=conf))
-        return detected
+    @property
+    def tracker(self) -> sv.ByteTrack:
+        if self._tracker is None:
+            import supervision as sv
+
+            self._tracker = sv.ByteTrack()
+        return self._tracker
+
+    def cacheKey(self, cache: StageCache, videoPath: str) -> str:
+        return cache.makeKey(
+            self.cacheStage,
+            inputs=[videoPath, self.modelPath],
+            params={"conf": self.conf, "batch": self.batchSize, "imgsz": self.imgsz},
+            code=[__file__],
+        )
+
+    def _detectBatch(self, frames: Iterable[Frame], conf: Optional[float] = None, batch: Optional[int] = None):
+        conf = self.conf if conf is None else conf
+        batch = self.batchSize if batch is None else batch
+        extra = {} if self.imgsz is None else {"imgsz": self.imgsz}
+        for frameBatch in iter_batches(frames, batch):
+            yield from self.model.predict(frameBatch, conf=conf, verbose=False, **extra)
 
     def objectTracks(
         self,
@@ -28,10 +77,30 @@ class PlayerTracker:
         *,
         readFromStub: bool = False,
         stubPath: str | None = None,
+        cache: Optional[StageCache] = None,
+        videoPath: Optional[str] = None,
     ) -> List[TrackFrame]:
-        cached = read_stub(readFromStub, stubPath)
+        key = self.cacheKey(cache, videoPath) if cache is not None and videoPath else None
+        cached = cache.load(self.cacheStage, key) if key else read_stub(readFromStub, stubPath)
+        if key and cached is not None:
+            cached = columnsToTracks(cached, len(frames))
         if cached is not None and len(cached) == len(frames):
             return cached  # type: ignore[return-value]
+        out = self.trackFrames(frames)
+        if key:
+            cache.store(self.cacheStage, key, tracksToColumns(out))
+        else:
+            save_stub(stubPath, out)
+        return out
+
+    def trackFrames(self, frames: Iterable[Frame]) -> List[TrackFrame]:
+        """Detect and track one chunk of frames.
+
+        The ByteTrack state lives on the instance, so consecutive chunks of the
+        same video keep consistent track ids.
+        """
+        import supervision as sv
+
         detections = self._detectBatch(frames)
         out: List[TrackFrame] = []
         for det in detections:
@@ -44,5 +113,4 @@ class PlayerTracker:
                 if clsId == names["Player"]:
                     frameDict[trkId] = {"bbox": bbox}
             out.append(frameDict)
-        save_stub(stubPath, out)
         return out
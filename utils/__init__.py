@@ -1,3 +1,8 @@
-from .video_utils import read_video, save_video
+from .video_utils import read_video, save_video, read_video_chunks, save_video_chunks, get_video_properties, VideoProperties
+from .video_reader import VideoReader, iter_batches
+from .video_writer import AsyncVideoWriter, WriterStats, CONTAINER_CODECS, codec_for
 from .bbox_utils import get_center_of_bbox, get_bbox_width, measure_distance,measure_xy_distance,get_foot_position
-from .stubs_utils import save_stub,read_stub
\ No newline at end of file
+from .stub_utils import save_stub,read_stub
+
+from .stage_cache import StageCache, file_digest
+from .profiler import Profiler, PROFILER, profile_span, profiled, peak_rss_bytes
\ No newline at end of file
@@ -24,4 +24,26 @@ def xyDistance(p1: Point, p2: Point) -> Point:
 
 def footPosition(bbox: BBox) -> Point:
     x1, _, x2, y2 = bbox
-    return (x1 + x2) / 2, y2
\ No newline at end of file
+    return (x1 + x2) / 2, y2
+
+
+def get_center_of_bbox(bbox: BBox) -> Tuple[int, int]:
+    x1, y1, x2, y2 = bbox
+    return int((x1 + x2) / 2), int((y1 + y2) / 2)
+
+
+def get_bbox_width(bbox: BBox) -> float:
+    return bboxWidth(bbox)
+
+
+def measure_distance(p1: Point, p2: Point) -> float:
+    return distance(p1, p2)
+
+
+def measure_xy_distance(p1: Point, p2: Point) -> Point:
+    return xyDistance(p1, p2)
+
+
+def get_foot_position(bbox: BBox) -> Tuple[int, int]:
+    x1, _, x2, y2 = bbox
+    return int((x1 + x2) / 2), int(y2)
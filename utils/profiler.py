@@ -0,0 +1,245 @@
+import csv
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REPORT_FIELDS = (
+    "stage",
+    "calls",
+    "wallSeconds",
+    "cpuSeconds",
+    "frames",
+    "fps",
+    "peakRssMB",
+    "rssGrowthMB",
+    "cacheHits",
+    "cacheMisses",
+)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _NullSpan:
+    __slots__ = ()
+    frames = property(lambda self: 0, lambda self, value: None)
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed region; add to :attr:`frames` inside the block if the count is known late."""
+
+    __slots__ = ("profiler", "name", "frames", "_wall", "_cpu", "_rss")
+
+    def __init__(self, profiler: "Profiler", name: str, frames: int) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.frames = frames
+
+    def __enter__(self) -> "Span":
+        stack = self.profiler._stack()
+        stack.append(self.name)
+        self.name = "/".join(stack)
+        self._rss = peak_rss_bytes()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rss = peak_rss_bytes()
+        self.profiler._stack().pop()
+        self.profiler.add(self.name, wall, cpu, frames=self.frames, peakRss=rss, rssGrowth=rss - self._rss)
+
+
+class Profiler:
+    """Per-stage wall time, CPU time, peak RSS, throughput and cache hits.
+
+    Regions are timed with :meth:`span` (a context manager) or the
+    :meth:`profiled` decorator; nested spans are reported as
+    ``outer/inner``. Spans may run on any thread. CPU time and peak RSS are
+    process-wide: CPU time counts every thread during the span and peak RSS
+    is the process high-water mark when the span ended. A disabled profiler
+    hands out a shared no-op span, so instrumented code costs next to
+    nothing by default.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name: str) -> Dict[str, Any]:
+        rec = self.records.get(name)
+        if rec is None:
+            rec = self.records[name] = {
+                "calls": 0,
+                "wallSeconds": 0.0,
+                "cpuSeconds": 0.0,
+                "frames": 0,
+                "peakRss": 0,
+                "rssGrowth": 0,
+                "cacheHits": 0,
+                "cacheMisses": 0,
+            }
+        return rec
+
+    def span(self, name: str, *, frames: int = 0):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, frames)
+
+    def profiled(self, name: Optional[str] = None, *, frameArg: Optional[int] = None) -> Callable[[F], F]:
+        """Decorator timing every call; ``frameArg`` is the index of a positional argument whose ``len`` is the frame count."""
+
+        def wrap(fn: F) -> F:
+            stage = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def run(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                frames = len(args[frameArg]) if frameArg is not None else 0
+                with self.span(stage, frames=frames):
+                    return fn(*args, **kwargs)
+
+            return run  # type: ignore[return-value]
+
+        return wrap
+
+    def add(
+        self,
+        name: str,
+        wallSeconds: float,
+        cpuSeconds: float = 0.0,
+        *,
+        frames: int = 0,
+        peakRss: int = 0,
+        rssGrowth: int = 0,
+    ) -> None:
+        """Record an externally measured region (e.g. a writer thread's encode time)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            rec = self._record(name)
+            rec["calls"] += 1
+            rec["wallSeconds"] += wallSeconds
+            rec["cpuSeconds"] += cpuSeconds
+            rec["frames"] += frames
+            rec["peakRss"] = max(rec["peakRss"], peakRss)
+            rec["rssGrowth"] += max(rssGrowth, 0)
+
+    def addCacheStats(self, stats: Dict[str, Dict[str, int]], names: Optional[Dict[str, str]] = None) -> None:
+        """Attach ``StageCache.stats`` hits and misses to the matching stages.
+
+        ``names`` maps cache stage names to profiler stage names where they differ.
+        """
+        if not self.enabled:
+            return
+        names = names or {}
+        with self._lock:
+            for stage, counts in stats.items():
+                rec = self._record(names.get(stage, stage))
+                rec["cacheHits"] += counts.get("hits", 0)
+                rec["cacheMisses"] += counts.get("misses", 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = {}
+
+    # ────────────────────────────────────────────────────────────────
+    # Reports
+    # ────────────────────────────────────────────────────────────────
+    def report(self) -> List[Dict[str, Any]]:
+        """One row per stage with :data:`REPORT_FIELDS`, in first-seen order."""
+        rows: List[Dict[str, Any]] = []
+        with self._lock:
+            for stage, rec in self.records.items():
+                wall = rec["wallSeconds"]
+                rows.append(
+                    {
+                        "stage": stage,
+                        "calls": rec["calls"],
+                        "wallSeconds": wall,
+                        "cpuSeconds": rec["cpuSeconds"],
+                        "frames": rec["frames"],
+                        "fps": rec["frames"] / wall if rec["frames"] and wall > 0 else 0.0,
+                        "peakRssMB": rec["peakRss"] / (1 << 20),
+                        "rssGrowthMB": rec["rssGrowth"] / (1 << 20),
+                        "cacheHits": rec["cacheHits"],
+                        "cacheMisses": rec["cacheMisses"],
+                    }
+                )
+        return rows
+
+    def writeJson(self, path) -> None:
+        _ensure_dir(path)
+        with open(path, "w") as f:
+            json.dump({"stages": self.report()}, f, indent=2)
+
+    def writeCsv(self, path) -> None:
+        _ensure_dir(path)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.report())
+
+    def summary(self) -> str:
+        rows = self.report()
+        if not rows:
+            return "profile: no stages recorded"
+        lines = ["profile:", "  %-34s %6s %9s %9s %9s %9s %8s" % ("stage", "calls", "wall s", "cpu s", "fps", "peak MB", "cache")]
+        for r in rows:
+            cache = "%d/%d" % (r["cacheHits"], r["cacheHits"] + r["cacheMisses"]) if r["cacheHits"] or r["cacheMisses"] else "-"
+            fps = "%.1f" % r["fps"] if r["fps"] else "-"
+            lines.append(
+                "  %-34s %6d %9.3f %9.3f %9s %9.0f %8s"
+                % (r["stage"], r["calls"], r["wallSeconds"], r["cpuSeconds"], fps, r["peakRssMB"], cache)
+            )
+        return "\n".join(lines)
+
+
+def _ensure_dir(path) -> None:
+    dir_name = os.path.dirname(str(path))
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+
+
+#: Process-wide profiler used by the module-level hooks; disabled until enabled (``main.py --profile``).
+PROFILER = Profiler()
+
+
+def profile_span(name: str, *, frames: int = 0):
+    """``with profile_span("stage", frames=n):`` on the process-wide profiler."""
+    return PROFILER.span(name, frames=frames)
+
+
+def profiled(name: Optional[str] = None, *, frameArg: Optional[int] = None) -> Callable[[F], F]:
+    """Decorator form of :func:`profile_span` on the process-wide profiler."""
+    return PROFILER.profiled(name, frameArg=frameArg)
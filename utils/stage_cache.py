@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+CACHE_FORMAT_VERSION = 2
+_SAMPLE_BYTES = 1 << 20
+
+_digest_memo: Dict[tuple, str] = {}
+
+
+def file_digest(path, sample_bytes: int = _SAMPLE_BYTES) -> str:
+    """Content digest of a file, memoised per (path, size, mtime).
+
+    Files larger than three samples are hashed from their size plus the
+    head, middle and tail ``sample_bytes``; that is enough to tell videos
+    and weight files apart without reading gigabytes on every run.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns, sample_bytes)
+    if memo_key in _digest_memo:
+        return _digest_memo[memo_key]
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(st.st_size).encode())
+    with open(path, 'rb') as f:
+        if st.st_size <= 3 * sample_bytes:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        else:
+            for offset in (0, (st.st_size - sample_bytes) // 2, st.st_size - sample_bytes):
+                f.seek(offset)
+                h.update(f.read(sample_bytes))
+    _digest_memo[memo_key] = h.hexdigest()
+    return _digest_memo[memo_key]
+
+
+class StageCache:
+    """Content-addressed, size-bounded cache for expensive stage outputs.
+
+    Entries are keyed by a hash of the stage's inputs (video, model weights),
+    its parameters, the source files implementing it and the keys of the
+    upstream stages it consumed. Writes are atomic (temp file + rename) and
+    the least recently used entries are evicted once the cache grows past
+    ``maxBytes``. Hits, misses and stores are counted per stage.
+
+    NumPy arrays are stored as raw ``.npy`` files and loaded memory-mapped
+    (read-only, zero-copy); everything else is pickled.
+    """
+
+    def __init__(self, root, maxBytes: int = 2 << 30) -> None:
+        self.root = str(root)
+        self.maxBytes = maxBytes
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def makeKey(
+        self,
+        stage: str,
+        *,
+        inputs: Iterable[Optional[str]] = (),
+        params: Optional[Mapping[str, Any]] = None,
+        code: Iterable[str] = (),
+        upstream: Iterable[str] = (),
+    ) -> str:
+        payload = {
+            'format': CACHE_FORMAT_VERSION,
+            'stage': stage,
+            'inputs': [file_digest(p) if p and os.path.exists(p) else str(p) for p in inputs],
+            'params': dict(params or {}),
+            'code': [file_digest(p) for p in code],
+            'upstream': list(upstream),
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, stage: str, key: str, ext: str = '.pkl') -> str:
+        return os.path.join(self.root, stage, key + ext)
+
+    def _count(self, stage: str, field: str) -> None:
+        counts = self.stats.setdefault(stage, {'hits': 0, 'misses': 0, 'stores': 0})
+        counts[field] += 1
+
+    def load(self, stage: str, key: str) -> Any:
+        path = self._path(stage, key, '.npy')
+        try:
+            if os.path.exists(path):
+                value = np.load(path, mmap_mode='r', allow_pickle=False)
+            else:
+                path = self._path(stage, key)
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            self._count(stage, 'misses')
+            return None
+        os.utime(path)  # mark as recently used for LRU eviction
+        self._count(stage, 'hits')
+        return value
+
+    def store(self, stage: str, key: str, value: Any) -> None:
+        if isinstance(value, np.ndarray):
+            path = self._path(stage, key, '.npy')
+            self._atomicWrite(path, lambda f: np.save(f, np.ascontiguousarray(value), allow_pickle=False))
+        else:
+            path = self._path(stage, key)
+            self._atomicWrite(path, lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self._count(stage, 'stores')
+        self.evict(keep=(path,))
+
+    @staticmethod
+    def _atomicWrite(path: str, write: Callable[[Any], None]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def entries(self) -> Sequence[tuple]:
+        """``(mtime, size, path)`` for every cache entry, oldest first."""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, st.st_size, path))
+        return sorted(found)
+
+    def evict(self, keep: Sequence[str] = ()) -> int:
+        """Delete least recently used entries until under ``maxBytes``; return bytes freed."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total <= self.maxBytes:
+                break
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            freed += size
+        return freed
+
+    def summary(self) -> str:
+        lines = ['stage cache (%s):' % self.root]
+        for stage, counts in sorted(self.stats.items()):
+            lines.append('  %-18s hits=%d misses=%d stores=%d' % (stage, counts['hits'], counts['misses'], counts['stores']))
+        return '\n'.join(lines)
@@ -2,12 +2,14 @@ import os
 import pickle
 
 def save_stub(stub_path,object):
-    if not os.path.exists(os.path.dirname(stub_path)):
+    if stub_path is None:
+        return
+
+    if os.path.dirname(stub_path) and not os.path.exists(os.path.dirname(stub_path)):
         os.makedirs(os.path.dirname(stub_path))
 
-    if stub_path is not None:
-        with open(stub_path,'wb') as f:
-            pickle.dump(object,f)
+    with open(stub_path,'wb') as f:
+        pickle.dump(object,f)
 
 def read_stub(read_from_stub,stub_path):
     if read_from_stub and stub_path is not None and os.path.exists(stub_path):
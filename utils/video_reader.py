@@ -0,0 +1,181 @@
+import queue
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .video_utils import VideoProperties
+
+Frame = np.ndarray
+
+_END = object()
+
+
+def iter_batches(frames: Iterable[Frame], size: int) -> Iterator[List[Frame]]:
+    """Lists of up to ``size`` frames from any iterable (lists, readers, generators)."""
+    if isinstance(frames, (list, tuple)):
+        for i in range(0, len(frames), size):
+            yield list(frames[i : i + size])
+        return
+    batch: List[Frame] = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class VideoReader:
+    """Iterable video decoder with seeking, stride, resizing and prefetch.
+
+    Frames ``start, start + stride, ...`` before ``end`` (source frame
+    indices, or ``startTime`` / ``endTime`` in seconds) are decoded on a
+    background thread up to ``prefetch`` frames ahead (``0`` decodes on the
+    caller's thread). Skipped frames are only grabbed, not decoded, and
+    frames are resized to ``size`` ``(w, h)`` or by ``scale`` as they are
+    decoded. Every iteration starts a fresh decode of the range, so the
+    same reader can feed several consumers one after the other.
+
+    :attr:`fps` is the rate of the yielded frames (source fps divided by
+    the stride); ``len`` is the number of frames in the range according to
+    the container metadata.
+    """
+
+    def __init__(
+        self,
+        path,
+        *,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        startTime: Optional[float] = None,
+        endTime: Optional[float] = None,
+        stride: int = 1,
+        size: Optional[Tuple[int, int]] = None,
+        scale: float = 1.0,
+        prefetch: int = 32,
+    ) -> None:
+        if stride < 1:
+            raise ValueError(f"stride must be >= 1, got {stride}")
+        if start is not None and startTime is not None or end is not None and endTime is not None:
+            raise ValueError("give the range either in frames or in seconds, not both")
+        self.path = str(path)
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video {self.path!r}.")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.sourceFps = fps if fps > 0 else 24.0  # OpenCV reports 0 or -1 when the container has no rate
+        self.sourceWidth = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.sourceHeight = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.sourceFrameCount = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        if startTime is not None:
+            start = int(round(startTime * self.sourceFps))
+        if endTime is not None:
+            end = int(round(endTime * self.sourceFps))
+        self.start = max(0, start or 0)
+        self.end = self.sourceFrameCount if end is None else min(end, self.sourceFrameCount)
+        self.stride = stride
+        self.prefetch = prefetch
+        if size is None and scale != 1.0:
+            size = (max(1, int(round(self.sourceWidth * scale))), max(1, int(round(self.sourceHeight * scale))))
+        self.size = size
+
+    @property
+    def fps(self) -> float:
+        return self.sourceFps / self.stride
+
+    @property
+    def width(self) -> int:
+        return self.size[0] if self.size else self.sourceWidth
+
+    @property
+    def height(self) -> int:
+        return self.size[1] if self.size else self.sourceHeight
+
+    @property
+    def frameCount(self) -> int:
+        return len(self)
+
+    @property
+    def properties(self) -> VideoProperties:
+        return VideoProperties(fps=self.fps, width=self.width, height=self.height, frameCount=len(self))
+
+    def __len__(self) -> int:
+        return max(0, (self.end - self.start + self.stride - 1) // self.stride)
+
+    def sourceIndex(self, idx: int) -> int:
+        """Source frame index of the ``idx``-th yielded frame."""
+        return self.start + idx * self.stride
+
+    def _decode(self, stop: Optional[threading.Event] = None) -> Iterator[Frame]:
+        cap = cv2.VideoCapture(self.path)
+        try:
+            if self.start:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.start)
+            pos = self.start
+            while pos < self.end and (stop is None or not stop.is_set()):
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if self.size is not None and (frame.shape[1], frame.shape[0]) != self.size:
+                    frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+                yield frame
+                pos += self.stride
+                if pos >= self.end:
+                    break
+                for _ in range(self.stride - 1):
+                    if not cap.grab():
+                        return
+        finally:
+            cap.release()
+
+    def __iter__(self) -> Iterator[Frame]:
+        if self.prefetch <= 0:
+            yield from self._decode()
+            return
+        buf: "queue.Queue[object]" = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        error: List[BaseException] = []
+
+        def produce() -> None:
+            try:
+                for frame in self._decode(stop):
+                    while not stop.is_set():
+                        try:
+                            buf.put(frame, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+            except BaseException as exc:  # forwarded to the consumer
+                error.append(exc)
+            finally:
+                while not stop.is_set():
+                    try:
+                        buf.put(_END, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+        worker = threading.Thread(target=produce, name="video-reader", daemon=True)
+        worker.start()
+        try:
+            while True:
+                frame = buf.get()
+                if frame is _END:
+                    break
+                yield frame  # type: ignore[misc]
+            if error:
+                raise error[0]
+        finally:
+            stop.set()
+            worker.join(timeout=1.0)
+
+    def chunks(self, chunkSize: int = 64) -> Iterator[List[Frame]]:
+        """Frames in lists of at most ``chunkSize`` (``<= 0``: one list)."""
+        if chunkSize <= 0:
+            yield list(self)
+            return
+        yield from iter_batches(self, chunkSize)
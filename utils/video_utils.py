@@ -1,31 +1,86 @@
-import os 
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
 import cv2
+import numpy as np
 
-def read_video(video_path):
-    cap = cv2.VideoCapture(video_path)
-    frames = []
+from .video_writer import AsyncVideoWriter
+
+Frame = np.ndarray
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frames.append(frame)
 
+class VideoProperties(NamedTuple):
+    fps: float
+    width: int
+    height: int
+    frameCount: int
+
+
+def get_video_properties(video_path) -> VideoProperties:
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {str(video_path)!r}.")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    props = VideoProperties(
+        fps=fps if fps > 0 else 24.0,  # OpenCV reports 0 or -1 when the container has no rate
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        frameCount=max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0),
+    )
     cap.release()
+    return props
+
+
+def read_video_chunks(video_path, chunk_size: int = 64) -> Iterator[List[Frame]]:
+    """Yield decoded frames in lists of at most ``chunk_size``.
+
+    Only one chunk is alive at a time, so memory stays bounded by the chunk
+    size instead of the video length. ``chunk_size <= 0`` yields the whole
+    video as a single chunk.
+    """
+    cap = cv2.VideoCapture(video_path)
+    chunk: List[Frame] = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            chunk.append(frame)
+            if 0 < chunk_size <= len(chunk):
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        cap.release()
+
+
+def read_video(video_path):
+    frames = []
+    for chunk in read_video_chunks(video_path, chunk_size=0):
+        frames.extend(chunk)
     return frames
 
-def save_video(frames, output_path):
-    # make sure the output directory exists
-    dir_name = os.path.dirname(output_path)
-    if dir_name and not os.path.exists(dir_name):
-        os.makedirs(dir_name, exist_ok=True)
-
-    # set up the codec and VideoWriter
-    fourcc = cv2.VideoWriter_fourcc(*"XVID")
-    h, w = frames[0].shape[:2]
-    out = cv2.VideoWriter(output_path, fourcc, 24, (w, h))
-
-    # write all frames
-    for frame in frames:
-        out.write(frame)
-    out.release()
\ No newline at end of file
+
+def save_video_chunks(
+    chunks: Iterable[Sequence[Frame]],
+    output_path,
+    fps: float = 24,
+    *,
+    codec: Optional[str] = None,
+    scale: float = 1.0,
+    queue_size: int = 64,
+) -> int:
+    """Encode frames from an iterable of chunks and return the frame count.
+
+    Encoding runs on an :class:`AsyncVideoWriter` thread, so ``chunks`` may
+    be a generator that renders frames while earlier ones are encoded.
+    Pass the source video's fps; the codec defaults to the container's.
+    """
+    with AsyncVideoWriter(output_path, fps, codec=codec, scale=scale, queueSize=queue_size) as writer:
+        for chunk in chunks:
+            writer.writeAll(chunk)
+    return writer.stats.frames
+
+
+def save_video(frames, output_path, fps: float = 24, **options):
+    return save_video_chunks([frames], output_path, fps, **options)
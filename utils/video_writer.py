@@ -0,0 +1,180 @@
+import os
+import queue
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Frame = np.ndarray
+
+#: Default fourcc for each container extension.
+CONTAINER_CODECS = {
+    ".avi": "XVID",
+    ".mp4": "mp4v",
+    ".m4v": "mp4v",
+    ".mov": "mp4v",
+    ".mkv": "XVID",
+}
+
+_CLOSE = object()
+
+
+class WriterStats(NamedTuple):
+    frames: int
+    encodeSeconds: float  #: time spent resizing and encoding on the writer thread
+    wallSeconds: float  #: from the first frame queued to the writer closing
+    blockedSeconds: float  #: time producers waited on a full queue
+
+    @property
+    def encodeFps(self) -> float:
+        return self.frames / self.encodeSeconds if self.encodeSeconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return "video writer: %d frames, encode %.2fs (%.1f fps), wall %.2fs, producer blocked %.2fs" % (
+            self.frames,
+            self.encodeSeconds,
+            self.encodeFps,
+            self.wallSeconds,
+            self.blockedSeconds,
+        )
+
+
+def codec_for(output_path, codec: Optional[str] = None) -> str:
+    """``codec`` if given, else the default fourcc for the output container."""
+    if codec:
+        if len(codec) != 4:
+            raise ValueError(f"codec must be a four character code, got {codec!r}")
+        return codec
+    ext = os.path.splitext(str(output_path))[1].lower()
+    if ext not in CONTAINER_CODECS:
+        raise ValueError(f"Unknown video container {ext!r}, expected one of {sorted(CONTAINER_CODECS)} or an explicit codec.")
+    return CONTAINER_CODECS[ext]
+
+
+class AsyncVideoWriter:
+    """Encode frames on a background thread fed by a bounded queue.
+
+    ``write`` only enqueues the frame, so encoding overlaps whatever
+    produces the frames; when the queue holds ``queueSize`` frames the
+    producer blocks instead of buffering the whole video. The encoder is
+    opened from the first frame unless ``frameSize`` is given. Frames are
+    resized to ``outputSize`` (or by ``scale``) on the writer thread, and
+    the codec defaults to the container's (see :data:`CONTAINER_CODECS`).
+    Errors raised by the writer thread are re-raised by the next
+    ``write`` or by ``close``.
+    """
+
+    def __init__(
+        self,
+        output_path,
+        fps: float,
+        *,
+        codec: Optional[str] = None,
+        frameSize: Optional[Tuple[int, int]] = None,
+        outputSize: Optional[Tuple[int, int]] = None,
+        scale: float = 1.0,
+        queueSize: int = 64,
+    ) -> None:
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+        self.output_path = str(output_path)
+        self.fps = fps
+        self.codec = codec_for(output_path, codec)
+        self.frameSize = frameSize
+        self.outputSize = outputSize
+        self.scale = scale
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, queueSize))
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._error: Optional[BaseException] = None
+        self._frames = 0
+        self._encodeSeconds = 0.0
+        self._blockedSeconds = 0.0
+        self._started: Optional[float] = None
+        self._closed: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="video-writer", daemon=True)
+        self._thread.start()
+
+    def _targetSize(self, w: int, h: int) -> Tuple[int, int]:
+        if self.outputSize is not None:
+            return self.outputSize
+        if self.scale != 1.0:
+            return max(1, int(round(w * self.scale))), max(1, int(round(h * self.scale)))
+        return w, h
+
+    def _open(self, w: int, h: int) -> None:
+        dir_name = os.path.dirname(self.output_path)
+        if dir_name and not os.path.exists(dir_name):
+            os.makedirs(dir_name, exist_ok=True)
+        self.outputSize = self._targetSize(w, h)
+        self._writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.codec), self.fps, self.outputSize)
+        if not self._writer.isOpened():
+            raise IOError(f"Cannot open video writer for {self.output_path!r} with codec {self.codec!r}.")
+
+    def _run(self) -> None:
+        try:
+            if self.frameSize is not None:
+                self._open(*self.frameSize)
+            while True:
+                frame = self._queue.get()
+                if frame is _CLOSE:
+                    return
+                start = time.perf_counter()
+                if self._writer is None:
+                    h, w = frame.shape[:2]
+                    self._open(w, h)
+                if (frame.shape[1], frame.shape[0]) != self.outputSize:
+                    frame = cv2.resize(frame, self.outputSize, interpolation=cv2.INTER_AREA)
+                self._writer.write(frame)
+                self._encodeSeconds += time.perf_counter() - start
+                self._frames += 1
+        except BaseException as exc:  # forwarded to the producer
+            self._error = exc
+            # keep draining so a blocked producer wakes up and sees the error
+            while self._queue.get() is not _CLOSE:
+                pass
+        finally:
+            if self._writer is not None:
+                self._writer.release()
+
+    def write(self, frame: Frame) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._started is None:
+            self._started = time.perf_counter()
+        start = time.perf_counter()
+        self._queue.put(frame)
+        self._blockedSeconds += time.perf_counter() - start
+
+    def writeAll(self, frames: Iterable[Frame]) -> None:
+        for frame in frames:
+            self.write(frame)
+
+    def close(self) -> WriterStats:
+        """Flush the queue, release the encoder and return the throughput stats."""
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+            self._closed = time.perf_counter()
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    @property
+    def stats(self) -> WriterStats:
+        end = self._closed if self._closed is not None else time.perf_counter()
+        wall = end - self._started if self._started is not None else 0.0
+        return WriterStats(self._frames, self._encodeSeconds, wall, self._blockedSeconds)
+
+    def __enter__(self) -> "AsyncVideoWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if exc[0] is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except BaseException:
+                pass